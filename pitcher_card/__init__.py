@@ -0,0 +1,7 @@
+# MLB pitcher season cards.
+#
+# Importing the package has no side effects: nothing is downloaded, read from disk or
+# plotted until a function asks for it. Entry points:
+#   python -m pitcher_card.app      Dash web app
+#   mlb_pitcher_card.py             example notebook
+#   python -m pitcher_card.budget   cold-start time budget check
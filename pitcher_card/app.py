@@ -0,0 +1,212 @@
+# Dash web app: python -m pitcher_card.app
+import base64
+import threading
+
+from dash import Dash, ctx, html, dcc, no_update, Output, Input, State
+from flask import abort, make_response, request
+
+from .card import card_data_version, draw_dashboard
+from .card_cache import card_cache, card_cache_key
+from .header import card_asset_pixels, prewarm_logos
+from .images import card_image_route
+from .prerender import start_prerender_scheduler
+from .reference import init_reference_tables, pitcher_roster, sync_reference_tables
+from .render_queue import render_queue
+from .render import default_render_profile, encode_figure, encode_image, profile_dpi, render_profile
+from .store import load_pitcher_pitches
+from .tiles import card_tiles_enabled, tiled_dashboard
+
+stats = ['G', 'GS', 'IP', 'TBF', 'WHIP', 'ERA', 'FIP', 'K%', 'BB%', 'GB%']
+
+# Stored cards never change under their name, so browsers and proxies may keep them for a year
+card_image_max_age = 365 * 24 * 60 * 60
+
+# Season the card shows
+season = 2025
+
+def load_season_pitches(pitcher_id):
+    # Read the pitcher's season from the local store or the incremental pitch cache
+    df_pyb = load_pitcher_pitches(pitcher_id, f'{season}-03-15', f'{season}-10-01')
+    return df_pyb[df_pyb['game_type'] == 'R']  # Filter for regular season games
+
+# Your dashboard figure generation function
+def get_dashboard_image_name(pitcher_id, stats, profile=None):
+    # Pick up reference tables republished by another worker
+    sync_reference_tables()
+    df_pyb = load_season_pitches(pitcher_id)
+
+    # Serve the cached card while none of the data it was drawn from has changed
+    profile = render_profile(default_render_profile if profile is None else profile)
+    key = card_cache_key(pitcher_id, stats, season, profile)
+    version = card_data_version(pitcher_id, df_pyb, stats, season, dpi=profile_dpi(profile))
+    name = card_cache.get(key, version)
+    if name is None and card_tiles_enabled and profile.get('format') != 'svg':
+        # Compose the card from panel tiles, drawing only the panels whose data changed
+        image = tiled_dashboard(pitcher_id, df_pyb, stats, dpi=profile_dpi(profile))
+        name = card_cache.put(key, version, *encode_image(image, profile))
+    elif name is None:
+        # Render at the resolution the profile displays and encode in its format, before
+        # this thread's template draws another card
+        fig = draw_dashboard(pitcher_id, df_pyb, stats, dpi=profile_dpi(profile))
+        name = card_cache.put(key, version, *encode_figure(fig, profile))
+    return name
+
+def get_dashboard_image(pitcher_id, stats, profile=None):
+    # The card inlined as a data URI, for notebooks and other clients without the server
+    image, mime_type = card_cache.image(get_dashboard_image_name(pitcher_id, stats, profile))
+    encoded_image = base64.b64encode(image).decode("utf-8")
+    return f"data:{mime_type};base64,{encoded_image}"
+
+def card_image_response(name):
+    # A stored card with validators, answering 304 when the client's copy is current
+    stored = card_cache.image(name)
+    if stored is None:
+        abort(404)
+    image, mime_type = stored
+    response = make_response(image)
+    response.mimetype = mime_type
+    response.set_etag(name.rsplit('.', 1)[0])
+    response.cache_control.public = True
+    response.cache_control.max_age = card_image_max_age
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+def create_app():
+    # Building the app only defines the layout and callbacks, data loads on first use
+    app = Dash(__name__)
+
+    # Cards are served by name, so the callback only sends their URL
+    app.server.add_url_rule(f'{card_image_route}<name>', 'card_image', card_image_response)
+    app.server.add_url_rule('/card-cache', 'card_cache', card_cache.counters)
+
+    # Layout with dropdowns and image
+    app.layout = html.Div([
+        html.H1("2025 MLB Season Pitching Dashboard", style={'textAlign': 'center'}),
+
+        html.Div([
+            dcc.Dropdown(id='level-dropdown', placeholder='Select a level', style={'flex': 1}),
+            dcc.Dropdown(id='team-dropdown', placeholder='Select a team', style={'flex': 1}),
+            dcc.Dropdown(id='pitcher-dropdown', placeholder='Select a pitcher', style={'flex': 1}),
+        ], style={
+            'display': 'flex',
+            'justifyContent': 'center',
+            'alignItems': 'center',
+            'gap': '2%',
+            'maxWidth': '100%',
+            'margin': '0 auto',
+            'padding': '10px 0'
+        }),
+
+        html.Div([
+            dcc.Loading(
+                id="loading-spinner",
+                type="circle",
+                children=html.Img(id='dashboard-img', style={'width': '100%', 'maxWidth': '1600px'}),
+                fullscreen=False
+            )
+        ], style={
+            'textAlign': 'center',
+            'margin': '0 auto'
+        }),
+
+        # The render job of the selected pitcher, polled until its card is ready
+        html.Div(id='render-status', style={'textAlign': 'center'}),
+        dcc.Store(id='render-job'),
+        dcc.Interval(id='render-poll', interval=500, disabled=True),
+
+        dcc.Interval(id='data-update-interval', interval=24 * 60 * 60 * 1000, n_intervals=0)
+
+    ], style={
+        'maxWidth': '1800px',
+        'margin': '0 auto',
+        'padding': '20px'
+    })
+
+    # Unique level options
+    @app.callback(
+        Output('level-dropdown', 'options'),
+        Input('data-update-interval', 'n_intervals')
+    )
+    def populate_levels(_):
+        sync_reference_tables()
+        levels = sorted(pitcher_roster()['team_level'].dropna().unique())
+        return [{'label': lvl, 'value': lvl} for lvl in levels]
+
+    # Teams filtered by selected level
+    @app.callback(
+        Output('team-dropdown', 'options'),
+        Input('level-dropdown', 'value')
+    )
+    def update_teams(selected_level):
+        if not selected_level:
+            return []
+        df_pitchers = pitcher_roster()
+        teams = df_pitchers[df_pitchers['team_level'] == selected_level]['team'].dropna().unique()
+        return [{'label': team, 'value': team} for team in sorted(teams)]
+
+    # Pitchers filtered by selected team
+    @app.callback(
+        Output('pitcher-dropdown', 'options'),
+        Input('team-dropdown', 'value')
+    )
+    def update_pitchers(selected_team):
+        if not selected_team:
+            return []
+        df_pitchers = pitcher_roster()
+        pitchers = df_pitchers[df_pitchers['team'] == selected_team]
+        return [
+            {'label': row['full_name'], 'value': int(row['key_mlbam'])}
+            for _, row in pitchers.iterrows()
+        ]
+
+    @app.callback(
+        Output('dashboard-img', 'src'),
+        Output('render-job', 'data'),
+        Output('render-poll', 'disabled'),
+        Output('render-status', 'children'),
+        Input('pitcher-dropdown', 'value'),
+        Input('render-poll', 'n_intervals'),
+        State('render-job', 'data')
+    )
+    def update_dashboard_image(pitcher_id, _, job):
+        # A new pitcher replaces the previous job, which is cancelled unless others wait for it
+        if ctx.triggered_id == 'pitcher-dropdown':
+            if job is not None:
+                render_queue.cancel(job['id'])
+            job = None
+        if pitcher_id is None:
+            return None, None, True, None
+
+        # Join or start the pitcher's render; a full queue is retried on the next poll
+        if job is None:
+            job_id = render_queue.submit(pitcher_id, stats)
+            if job_id is None:
+                return no_update, None, False, 'The server is busy, waiting to render the card...'
+            return no_update, {'id': job_id, 'pitcher_id': pitcher_id}, False, 'Rendering the card...'
+
+        state, result = render_queue.status(job['id'])
+        if state == 'pending':
+            return no_update, no_update, False, no_update
+        if state == 'done':
+            return app.get_relative_path(card_image_route + result), job, True, None
+        if state == 'failed':
+            print(f"Could not render the card for pitcher ID {pitcher_id}: {result}")
+            return no_update, job, True, 'The card could not be rendered.'
+        # Jobs unknown to this server process (e.g. after a restart) are submitted again
+        return no_update, None, False, no_update
+
+    return app
+
+def warm_up():
+    # Load the reference tables and team logos in the background so the server
+    # answers requests right away and the first card does not pay for them
+    threading.Thread(target=init_reference_tables, daemon=True).start()
+
+    # Pre-render the cards of pitchers who pitched yesterday, once a day
+    start_prerender_scheduler()
+    return prewarm_logos(card_asset_pixels(profile_dpi(default_render_profile)))
+
+# Run the app
+if __name__ == '__main__':
+    warm_up()
+    create_app().run(debug=True)
@@ -0,0 +1,86 @@
+# League averages the card compares a pitcher with
+import numpy as np
+import pandas as pd
+
+from .card_cache import frame_digest
+from .kde import league_velocity_densities, velocity_grid, velocity_grid_start, velocity_grid_step
+from .reference import league_pitch_movement, league_statcast_group, league_velocity_histograms
+
+class LeagueBaseline:
+    # League averages indexed once by (pitch_type, p_throws), so the table colours, the
+    # velocity panel and the movement panel look values up instead of filtering the tables.
+    # The averages by pitch type apply to both hands; movement averages are per hand.
+    hands = ['L', 'R']
+
+    def __init__(self, df_statcast_group: pd.DataFrame, df_pitch_movement: pd.DataFrame,
+                 df_velocity_hist: pd.DataFrame = None):
+        self.df_statcast_group = df_statcast_group
+        self.df_pitch_movement = df_pitch_movement
+        self.df_velocity_hist = df_velocity_hist
+
+        # Cached cards drawn against other league tables are out of date
+        self.version = frame_digest(*[df for df in [df_statcast_group, df_pitch_movement, df_velocity_hist]
+                                      if df is not None])
+
+        # Mean of every numeric column per pitch type
+        by_pitch = df_statcast_group.drop(columns='pitch_type').apply(pd.to_numeric, errors='coerce')
+        by_pitch = by_pitch.groupby(df_statcast_group['pitch_type'].astype(object).to_numpy()).mean()
+
+        # The first movement row of each pitch type and hand
+        movement = df_pitch_movement.drop_duplicates(['pitch_type', 'p_throws'])
+        movement = pd.DataFrame({'movement_pfx_x': pd.to_numeric(movement['pfx_x'], errors='coerce').to_numpy(),
+                                 'movement_pfx_z': pd.to_numeric(movement['pfx_z'], errors='coerce').to_numpy()},
+                                index=pd.MultiIndex.from_arrays([movement['pitch_type'].astype(object).to_numpy(),
+                                                                 movement['p_throws'].astype(object).to_numpy()]))
+
+        pitch_types = sorted(set(by_pitch.index) | set(movement.index.get_level_values(0)))
+        index = pd.MultiIndex.from_product([pitch_types, self.hands], names=['pitch_type', 'p_throws'])
+        table = by_pitch.reindex(index.get_level_values('pitch_type'))
+        table.index = index
+        self.table = table.join(movement.reindex(index))
+
+        # League velocity densities on the shared grid, smoothed once from the histograms
+        self.velocity_index = pd.MultiIndex.from_tuples([], names=['pitch_type', 'p_throws'])
+        self.velocity_densities = np.empty((0, len(velocity_grid)))
+        if df_velocity_hist is not None and len(df_velocity_hist):
+            keys = df_velocity_hist[['pitch_type', 'p_throws']].astype(object)
+            self.velocity_index = pd.MultiIndex.from_frame(keys.drop_duplicates())
+            rows = self.velocity_index.get_indexer(pd.MultiIndex.from_frame(keys))
+            bins = np.round((df_velocity_hist['release_speed'].to_numpy(dtype=float) - velocity_grid_start)
+                            / velocity_grid_step).astype(int)
+            counts = np.zeros((len(self.velocity_index), len(velocity_grid)))
+            np.add.at(counts, (rows, bins), df_velocity_hist['count'].to_numpy(dtype=float))
+            self.velocity_densities = league_velocity_densities(counts)
+
+    def has(self, column: str):
+        return column in self.table.columns
+
+    def values(self, column: str, pitch_types, p_throws: str):
+        # League averages of one column for a list of pitch types, NaN where there is none
+        keys = pd.MultiIndex.from_arrays([np.asarray(pitch_types, dtype=object), [p_throws] * len(pitch_types)])
+        return self.table[column].reindex(keys).to_numpy(dtype=float)
+
+    def movement(self, pitch_types, p_throws: str):
+        # League average (pfx_x, pfx_z) of each pitch type for the pitcher's hand
+        return np.column_stack([self.values('movement_pfx_x', pitch_types, p_throws),
+                                self.values('movement_pfx_z', pitch_types, p_throws)])
+
+    def velocity_density(self, pitch_type: str, p_throws: str):
+        # League velocity density of a pitch type for the pitcher's hand, None without a histogram
+        row = self.velocity_index.get_indexer([(pitch_type, p_throws)])[0]
+        return None if row < 0 else self.velocity_densities[row]
+
+# Rebuilt whenever one of the league tables is replaced, e.g. by a newer shared generation
+_league_baseline = {'baseline': None}
+
+def league_baseline():
+    df_statcast_group = league_statcast_group()
+    df_pitch_movement = league_pitch_movement()
+    df_velocity_hist = league_velocity_histograms()
+    cached = _league_baseline['baseline']
+    if (cached is None or cached.df_statcast_group is not df_statcast_group
+            or cached.df_pitch_movement is not df_pitch_movement
+            or cached.df_velocity_hist is not df_velocity_hist):
+        cached = LeagueBaseline(df_statcast_group, df_pitch_movement, df_velocity_hist)
+        _league_baseline['baseline'] = cached
+    return cached
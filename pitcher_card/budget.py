@@ -0,0 +1,72 @@
+# Cold-start budget check: python -m pitcher_card.budget
+#
+# Starts a fresh interpreter, imports the web app, builds it and serves the first page
+# load with every outgoing connection blocked. Exits non-zero when the import or the
+# first request takes longer than its budget, or when anything tries to reach the network.
+import os
+import sys
+import json
+import time
+import subprocess
+
+# Seconds allowed for `import pitcher_card.app` and for start-up to the first served page
+import_budget_seconds = float(os.environ.get('IMPORT_BUDGET_SECONDS', 5))
+first_request_budget_seconds = float(os.environ.get('FIRST_REQUEST_BUDGET_SECONDS', 6))
+
+_probe = '''
+import json, socket, sys, time
+start = time.perf_counter()
+
+# Record and refuse every outgoing connection
+connections = []
+def refuse(self, address):
+    connections.append(repr(address))
+    raise OSError('network access during start-up')
+socket.socket.connect = refuse
+socket.socket.connect_ex = refuse
+
+import pitcher_card.app
+imported = time.perf_counter()
+
+# The first page load: the index plus the layout and callback definitions
+client = pitcher_card.app.create_app().server.test_client()
+status = [client.get(path).status_code for path in ['/', '/_dash-layout', '/_dash-dependencies']]
+served = time.perf_counter()
+
+print(json.dumps({'import_seconds': imported - start, 'first_request_seconds': served - start,
+                  'status': status, 'connections': connections}))
+'''
+
+def measure_cold_start():
+    # A fresh interpreter, so nothing is already imported or cached in memory
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', _probe], cwd=root, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Start-up probe failed:\n{result.stderr}")
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured['process_seconds'] = elapsed
+    return measured
+
+def check_budget():
+    measured = measure_cold_start()
+    failures = []
+    if measured['import_seconds'] > import_budget_seconds:
+        failures.append(f"import took {measured['import_seconds']:.2f}s, budget {import_budget_seconds:.2f}s")
+    if measured['first_request_seconds'] > first_request_budget_seconds:
+        failures.append(f"first request after {measured['first_request_seconds']:.2f}s, "
+                        f"budget {first_request_budget_seconds:.2f}s")
+    if any(code != 200 for code in measured['status']):
+        failures.append(f"first page load returned {measured['status']}")
+    if measured['connections']:
+        failures.append(f"network access during start-up: {', '.join(measured['connections'])}")
+    return measured, failures
+
+if __name__ == '__main__':
+    measured, failures = check_budget()
+    print(f"import: {measured['import_seconds']:.2f}s (budget {import_budget_seconds:.2f}s)")
+    print(f"first request: {measured['first_request_seconds']:.2f}s (budget {first_request_budget_seconds:.2f}s)")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
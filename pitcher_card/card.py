@@ -0,0 +1,205 @@
+# The full season pitching card
+import hashlib
+import json
+import pickle
+import threading
+
+import matplotlib.gridspec as gridspec
+import pandas as pd
+from matplotlib.figure import Figure
+
+from .baseline import league_baseline
+from .card_cache import frame_digest
+from .fangraphs import fangraphs_leaderboard, fangraphs_pitcher_stats
+from .header import card_asset_pixels, fetch_header_data, header_version, player_bio, player_headshot, plot_logo
+from .percentiles import percentile_label_map, percentile_ranker, plot_percentile_rankings_by_pitcher
+from .plots import break_plot, break_plot_high_volume_mode, break_plot_max_pitches, velocity_kdes
+from .processing import df_processing
+from .style import apply_plot_style
+from .tables import pitch_table, table_columns
+
+# Subplot parameters of the card. tight_layout finds the same ones for every pitcher, the
+# spacer rows and columns absorb the panels' labels, so they are fixed instead of recomputed.
+# The margins are tight_layout's 1.08 font-size pad; wspace and hspace are its output for a
+# drawn card. Regenerate them with tight_subplot_params() after changing the layout.
+card_subplot_params = {'left': 0.27 / 22, 'right': 1 - 0.27 / 22, 'top': 1 - 0.27 / 20, 'bottom': 0.27 / 20,
+                       'wspace': 3.497648017239111, 'hspace': 0.3803606810033793}
+
+# Size of the card in inches
+card_figsize = (22, 20)
+
+class CardTemplate:
+    # The card's figure, grid, spacer axes and footer, built once and reused for every
+    # render. Only the data-bearing axes are cleared and redrawn per pitcher.
+    def __init__(self):
+        apply_plot_style()
+
+        # Create a 22 by 20 figure, outside pyplot so it is never closed or shared by accident
+        self.fig = Figure(figsize=card_figsize)
+        self.fig.subplots_adjust(**card_subplot_params)
+
+        # Create a gridspec layout with 8 columns and 6 rows
+        # Include border plots for the header, footer, left, and right
+        self.gs = gridspec.GridSpec(6, 8, figure=self.fig,
+                                    height_ratios=[2, 20, 9, 36, 36, 7],
+                                    width_ratios=[1, 22, 22, 18, 18, 28, 28, 1])
+        fig, gs = self.fig, self.gs
+
+        # Define the positions of each subplot in the grid
+        self.ax_headshot = fig.add_subplot(gs[1,1:3])
+        self.ax_bio = fig.add_subplot(gs[1,3:5])
+        self.ax_logo = fig.add_subplot(gs[1,5:7])
+
+        self.ax_season_table = fig.add_subplot(gs[2,1:7])
+
+        self.ax_plot_1 = fig.add_subplot(gs[3,1:3])
+        self.ax_plot_2 = fig.add_subplot(gs[3,3:5])  # This is where the percentile ranking plot will go
+        self.ax_plot_3 = fig.add_subplot(gs[3,5:7])
+
+        self.ax_table = fig.add_subplot(gs[4,1:7])
+
+        ax_footer = fig.add_subplot(gs[-1,1:7])
+        ax_header = fig.add_subplot(gs[0,1:7])
+        ax_left = fig.add_subplot(gs[:,0])
+        ax_right = fig.add_subplot(gs[:,-1])
+
+        # Hide axes for footer, header, left, and right
+        ax_footer.axis('off')
+        ax_header.axis('off')
+        ax_left.axis('off')
+        ax_right.axis('off')
+
+        # Add footer text
+        ax_footer.text(0, 1, 'By: Jake Vickroy', ha='left', va='top', fontsize=24)
+        ax_footer.text(0, 0.5, 'Thanks to: @TJStats', ha='left', va='top', fontsize=16)
+        ax_footer.text(0.5, 1, 'Color Coding Compares to League Average By Pitch', ha='center', va='top', fontsize=16)
+        ax_footer.text(1, 1, 'Data: MLB, Fangraphs\nImages: MLB, ESPN, Fandom', ha='right', va='top', fontsize=24)
+
+        self.data_axes = [self.ax_headshot, self.ax_bio, self.ax_logo, self.ax_season_table,
+                          self.ax_plot_1, self.ax_plot_2, self.ax_plot_3, self.ax_table]
+        self.static_axes = [ax_footer, ax_header, ax_left, ax_right]
+
+    def reset(self):
+        # Drop the axes the previous render added (the velocity panel's rows) and clear the
+        # data axes, including the state clear() keeps: aspect and hidden spines
+        for ax in self.fig.axes:
+            if ax not in self.data_axes and ax not in self.static_axes:
+                ax.remove()
+        for ax in self.data_axes:
+            ax.clear()
+            ax.set_aspect('auto')
+            ax.set_axis_on()
+            for spine in ax.spines.values():
+                spine.set_visible(True)
+
+def tight_subplot_params(pitcher_id: int, df: pd.DataFrame, stats: list):
+    # Draw a card on a fresh template and let tight_layout place it, returning the
+    # parameters to paste into card_subplot_params
+    template = CardTemplate()
+    draw_dashboard(pitcher_id, df, stats, template=template)
+    template.fig.tight_layout()
+    params = template.fig.subplotpars
+    return {name: float(getattr(params, name)) for name in ['left', 'right', 'top', 'bottom', 'wspace', 'hspace']}
+
+# Figures are not safe to draw from several threads, each thread renders into its own template
+_card_templates = threading.local()
+
+def card_template():
+    template = getattr(_card_templates, 'template', None)
+    if template is None:
+        template = CardTemplate()
+        _card_templates.template = template
+    return template
+
+# Panels of the card in drawing order: each draws into its template axes from the
+# processed pitches (None for panels that do not read them), the pitcher ID and stats
+def draw_season_table(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    fangraphs_pitcher_stats(pitcher_id, template.ax_season_table, stats, season=2025, fontsize=20)
+
+def draw_pitch_table(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    pitch_table(df, template.ax_table, fontsize=16)
+
+def draw_header(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    # Images sized for the resolution the card will be saved at
+    header = fetch_header_data(pitcher_id, size=card_asset_pixels(dpi or template.fig.dpi))
+    player_headshot(pitcher_id, ax=template.ax_headshot, header=header)
+    player_bio(pitcher_id, ax=template.ax_bio, header=header)
+    plot_logo(pitcher_id, ax=template.ax_logo, header=header)
+
+def draw_velocity(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    velocity_kdes(df=df, ax=template.ax_plot_1, gs=template.gs, gs_x=[3,4], gs_y=[1,3], fig=template.fig,
+                  baseline=league_baseline())
+
+def draw_percentiles(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    plot_percentile_rankings_by_pitcher(fangraphs_leaderboard(season=2025), ax=template.ax_plot_2,
+                                        pitcher_id=pitcher_id, ranker=percentile_ranker(season=2025))
+
+def draw_break_plot(template: CardTemplate, pitcher_id: int, df: pd.DataFrame, stats: list, dpi: float = None):
+    break_plot(df=df, ax=template.ax_plot_3, baseline=league_baseline())
+
+# For each panel, its drawing function, the template axes it draws into (the velocity panel
+# adds its rows below ax_plot_1) and whether it reads the pitches
+card_panels = {
+    'season_table': {'draw': draw_season_table, 'axes': ['ax_season_table'], 'pitches': False},
+    'pitch_table': {'draw': draw_pitch_table, 'axes': ['ax_table'], 'pitches': True},
+    'header': {'draw': draw_header, 'axes': ['ax_headshot', 'ax_bio', 'ax_logo'], 'pitches': False},
+    'velocity': {'draw': draw_velocity, 'axes': ['ax_plot_1'], 'pitches': True},
+    'percentiles': {'draw': draw_percentiles, 'axes': ['ax_plot_2'], 'pitches': False},
+    'break_plot': {'draw': draw_break_plot, 'axes': ['ax_plot_3'], 'pitches': True},
+}
+
+def draw_dashboard(pitcher_id: str, df: pd.DataFrame, stats: list, template: CardTemplate = None,
+                   dpi: float = None):
+    # Draw the card into a template, this thread's own by default, and return the template's
+    # figure. The figure is reused: the next card drawn on the thread clears and redraws it,
+    # so encode or copy it before drawing another.
+    apply_plot_style()
+    df = df_processing(df, compact=True)
+
+    # Reuse the card's layout, only the pitcher's panels are drawn
+    if template is None:
+        template = card_template()
+    template.reset()
+    for panel in card_panels.values():
+        panel['draw'](template, pitcher_id, df, stats, dpi)
+
+    return template.fig
+
+def pitching_dashboard(pitcher_id: str, df: pd.DataFrame, stats: list, template: CardTemplate = None,
+                       dpi: float = None):
+    # The card as a figure of its own, which later cards leave untouched. Drawn into the
+    # thread's template and copied; callers passing a template get that template's figure.
+    fig = draw_dashboard(pitcher_id, df, stats, template=template, dpi=dpi)
+    if template is not None:
+        return fig
+    return pickle.loads(pickle.dumps(fig))
+
+# Panel versions drawn with a placeholder image start with this; such panels are not kept
+placeholder_version_prefix = 'placeholder-'
+
+def panel_versions(pitcher_id: int, df: pd.DataFrame, stats: list, season: int = 2025, dpi: float = None):
+    # Version of the data each panel is drawn from. The frame only depends on the layout, the
+    # header on the pitcher's bio, team and images at the render's size, the FanGraphs panels
+    # on the pitcher's row, the pitch panels on the pitches, the league averages and the
+    # break plot's volume settings, and the pitch table also on the metrics it shows.
+    header = fetch_header_data(pitcher_id, size=card_asset_pixels(dpi) if dpi else None)
+    df_fangraphs = fangraphs_leaderboard(season=season)
+    df_row = df_fangraphs.loc[df_fangraphs.index.intersection([pitcher_id])]
+    percentiles = percentile_ranker(season=season).percentiles(pitcher_id) if len(df_row) else {}
+    pitches = hashlib.sha256(json.dumps([frame_digest(df), league_baseline().version, break_plot_max_pitches,
+                                         break_plot_high_volume_mode]).encode()).hexdigest()[:32]
+    return {
+        'frame': '',
+        'header': (placeholder_version_prefix if header['placeholder'] else '') + header_version(header),
+        'season_table': frame_digest(df_row.reindex(columns=stats)),
+        'percentiles': hashlib.sha256(json.dumps([frame_digest(df_row.reindex(columns=list(percentile_label_map))),
+                                                  percentiles], sort_keys=True).encode()).hexdigest()[:32],
+        'pitch_table': hashlib.sha256(json.dumps([pitches, table_columns]).encode()).hexdigest()[:32],
+        'velocity': pitches,
+        'break_plot': pitches,
+    }
+
+def card_data_version(pitcher_id: int, df: pd.DataFrame, stats: list, season: int = 2025, dpi: float = None):
+    # Version of everything a card is drawn from. Any change to it means a new card.
+    versions = panel_versions(pitcher_id, df, stats, season, dpi)
+    return hashlib.sha256(json.dumps(versions, sort_keys=True).encode()).hexdigest()[:32]
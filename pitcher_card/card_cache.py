@@ -0,0 +1,209 @@
+# Rendered cards cached in memory and on disk under the version of the data they show
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from .images import card_image_dir, load_card_image, store_card_image, trim_card_images
+
+# Index of the cached cards: for each card, the data version it was rendered from and the
+# name of its image in the image store, which is the disk tier
+card_cache_dir = os.environ.get('CARD_CACHE_DIR', os.path.join('.cache', 'card_cache'))
+
+# Cards kept in memory by this process and bytes of card images kept on disk
+card_cache_memory_items = int(os.environ.get('CARD_CACHE_MEMORY_ITEMS', 256))
+card_cache_disk_bytes = int(os.environ.get('CARD_CACHE_DISK_BYTES', 1024 ** 3))
+
+# The disk tier is trimmed after this many seconds or once this share of its size was written
+card_cache_trim_seconds = 10 * 60
+card_cache_trim_share = 0.05
+
+# Bump when the card's drawing code changes, so cards rendered by older code are not served
+card_layout_version = 2
+
+def frame_digest(*frames):
+    # Digest of the values, labels and column names of data frames
+    digest = hashlib.sha256()
+    for df in frames:
+        digest.update(json.dumps([str(column) for column in df.columns]).encode())
+        try:
+            hashes = pd.util.hash_pandas_object(df, index=True)
+        except TypeError:
+            # Columns holding lists or dicts are hashed by their text
+            hashes = pd.util.hash_pandas_object(df.astype(str), index=True)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()[:32]
+
+def card_cache_key(pitcher_id: int, stats: list, season: int, profile: dict):
+    # The card as requested, independent of the data it is drawn from
+    key = json.dumps([card_layout_version, int(pitcher_id), list(stats), season, profile],
+                     sort_keys=True, default=str)
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+class CardCache:
+    # A card is found by its key and is current when it was rendered from the same data
+    # version. A card whose data moved on is a miss and is replaced by the next render.
+    def __init__(self, root: str = card_cache_dir, image_root: str = card_image_dir,
+                 memory_items: int = card_cache_memory_items, disk_bytes: int = card_cache_disk_bytes):
+        self.root = root
+        self.image_root = image_root
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        # key -> (version, name, image, mime type), least recently used first
+        self._memory = OrderedDict()
+        self._names = {}
+        # name -> (image, mime type) of cards this process served but did not look up itself,
+        # such as the cards its render workers found or drew
+        self._served = OrderedDict()
+        self._lock = threading.Lock()
+        # Bytes written since the last trim; the first put trims what earlier runs left
+        self._written = 0
+        self._trimmed_at = 0.0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _index_path(self, key: str):
+        return os.path.join(self.root, f'{key}.json')
+
+    def _remember(self, key: str, version: str, name: str, image: bytes, mime_type: str):
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._names.pop(old[1], None)
+            self._memory[key] = (version, name, image, mime_type)
+            self._names[name] = key
+            while len(self._memory) > self.memory_items:
+                _, (_, old_name, _, _) = self._memory.popitem(last=False)
+                self._names.pop(old_name, None)
+
+    def _forget(self, key: str):
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._names.pop(old[1], None)
+
+    def get(self, key: str, version: str):
+        # Name of the cached card image, or None when it has to be rendered
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == version:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+        if entry is not None:
+            self._forget(key)
+
+        # Cards rendered earlier or by another worker
+        try:
+            with open(self._index_path(key)) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = None
+        if index is not None and index['version'] == version:
+            stored = load_card_image(index['name'], self.image_root)
+            if stored is not None:
+                # Mark the image as recently used for the disk tier's eviction
+                try:
+                    os.utime(os.path.join(self.image_root, index['name']))
+                except FileNotFoundError:
+                    pass
+                self._remember(key, version, index['name'], *stored)
+                with self._lock:
+                    self.disk_hits += 1
+                return index['name']
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, version: str, image: bytes, mime_type: str):
+        # Store a freshly rendered card, replacing the key's card from an older version
+        name = store_card_image(image, mime_type, self.image_root)
+        os.makedirs(self.root, exist_ok=True)
+        path = self._index_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': version, 'name': name, 'mime_type': mime_type, 'rendered_at': time.time()}, f)
+        os.replace(tmp_path, path)
+        self._remember(key, version, name, image, mime_type)
+        with self._lock:
+            self._written += len(image)
+            due = (self._written >= self.disk_bytes * card_cache_trim_share
+                   or time.time() - self._trimmed_at >= card_cache_trim_seconds)
+            if due:
+                self._written = 0
+                self._trimmed_at = time.time()
+        if due:
+            self.trim()
+        return name
+
+    def trim(self):
+        # Evict the least recently used images past the disk budget, then the index entries
+        # that name an image which is gone. Returns how many of each were removed.
+        images = trim_card_images(self.disk_bytes, self.image_root)
+        indexes = 0
+        try:
+            entries = [entry for entry in os.scandir(self.root) if entry.name.endswith('.json')]
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            try:
+                with open(entry.path) as f:
+                    name = json.load(f)['name']
+            except FileNotFoundError:
+                continue
+            except (ValueError, KeyError):
+                name = None
+            if name is None or not os.path.exists(os.path.join(self.image_root, name)):
+                try:
+                    os.remove(entry.path)
+                    indexes += 1
+                except FileNotFoundError:
+                    pass
+        return images, indexes
+
+    def image(self, name: str):
+        # Bytes and MIME type of a card image, from memory when this process has it
+        with self._lock:
+            key = self._names.get(name)
+            if key is not None:
+                _, _, image, mime_type = self._memory[key]
+                return image, mime_type
+            if name in self._served:
+                self._served.move_to_end(name)
+                return self._served[name]
+        stored = load_card_image(name, self.image_root)
+        if stored is not None:
+            # Names are content hashes, so a stored image never changes under its name
+            with self._lock:
+                self._served[name] = stored
+                while len(self._served) > self.memory_items:
+                    self._served.popitem(last=False)
+        return stored
+
+    def lookups(self):
+        # (memory hits, disk hits, misses) so far
+        with self._lock:
+            return self.memory_hits, self.disk_hits, self.misses
+
+    def add_lookups(self, memory_hits: int, disk_hits: int, misses: int):
+        # Count lookups another process made, such as a render worker
+        with self._lock:
+            self.memory_hits += memory_hits
+            self.disk_hits += disk_hits
+            self.misses += misses
+
+    def counters(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {'memory_hits': self.memory_hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                    'memory_items': len(self._memory) + len(self._served)}
+
+# The cache used by the web app
+card_cache = CardCache()
@@ -0,0 +1,146 @@
+# FanGraphs season leaderboard and the season stats table
+import os
+import threading
+import time
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from .net import http_session, http_timeout
+from .table_render import cell_table
+
+def fangraphs_pitching_leaderboards(season:int):
+    url = f"https://www.fangraphs.com/api/leaders/major-league/data?age=&pos=all&stats=pit&lg=all&season={season}&season1={season}&ind=0&qual=0&type=8&month=0&pageitems=500000"
+    data = http_session.get(url, timeout=http_timeout).json()
+    df = pd.DataFrame(data=data['data'])
+    return df
+
+# Directory and refresh interval for the persisted leaderboard snapshots
+fangraphs_cache_dir = os.environ.get('FANGRAPHS_CACHE_DIR', os.path.join('.cache', 'fangraphs'))
+fangraphs_ttl_seconds = int(os.environ.get('FANGRAPHS_TTL_SECONDS', 6 * 60 * 60))
+
+# Wait this long before retrying after a failed refresh
+fangraphs_retry_seconds = 5 * 60
+
+# One (fetched_at, leaderboard) snapshot per season, shared by every render
+_fangraphs_snapshots = {}
+
+# Seasons being refreshed in the background, and a lock so only one thread fetches at a time
+_fangraphs_refreshing = set()
+_fangraphs_lock = threading.Lock()
+
+# Seasons whose snapshot another process publishes, which this process never fetches itself
+_fangraphs_pinned = set()
+
+def index_by_mlbam(df: pd.DataFrame):
+    # Index the leaderboard by MLBAM ID so a pitcher's row is a single lookup. A leaderboard
+    # indexed already is returned as is.
+    if df.index.name == 'xMLBAMID':
+        return df
+    df = df.dropna(subset=['xMLBAMID']).drop_duplicates(subset='xMLBAMID')
+    df.index = pd.Index(df['xMLBAMID'].astype(int))
+    return df
+
+def _fangraphs_path(season: int):
+    return os.path.join(fangraphs_cache_dir, f'leaderboard_{season}.pkl')
+
+def refresh_fangraphs_leaderboard(season: int):
+    # Fetch the leaderboard now and make it the season's snapshot
+    now = time.time()
+    df = fangraphs_pitching_leaderboards(season)
+
+    df = index_by_mlbam(df)
+
+    # Write to a temporary file first so other processes never read a partial snapshot
+    path = _fangraphs_path(season)
+    os.makedirs(fangraphs_cache_dir, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+    _fangraphs_snapshots[season] = (now, df)
+    return df
+
+def _refresh_in_background(season: int, ttl: int):
+    try:
+        refresh_fangraphs_leaderboard(season)
+    except Exception as e:
+        # Keep serving the stale snapshot and try again in a few minutes
+        print(f"FanGraphs refresh failed for {season}, serving the previous snapshot: {e}")
+        snapshot = _fangraphs_snapshots[season]
+        _fangraphs_snapshots[season] = (time.time() - ttl + fangraphs_retry_seconds, snapshot[1])
+    finally:
+        with _fangraphs_lock:
+            _fangraphs_refreshing.discard(season)
+
+def fangraphs_leaderboard(season: int, ttl: int = fangraphs_ttl_seconds):
+    snapshot = _fangraphs_snapshots.get(season)
+    if snapshot is None:
+        # Concurrent first requests wait for one fetch instead of each starting their own
+        with _fangraphs_lock:
+            snapshot = _fangraphs_snapshots.get(season)
+            if snapshot is None:
+                # After a restart, reuse the snapshot persisted by the previous process
+                path = _fangraphs_path(season)
+                if os.path.exists(path):
+                    snapshot = (os.path.getmtime(path), pd.read_pickle(path))
+                    _fangraphs_snapshots[season] = snapshot
+                else:
+                    return refresh_fangraphs_leaderboard(season)
+
+    # A stale snapshot is served while one background thread fetches its replacement
+    if time.time() - snapshot[0] >= ttl and season not in _fangraphs_pinned:
+        with _fangraphs_lock:
+            start = season not in _fangraphs_refreshing
+            _fangraphs_refreshing.add(season)
+        if start:
+            threading.Thread(target=_refresh_in_background, args=(season, ttl), daemon=True).start()
+    return snapshot[1]
+
+fangraphs_stats_dict = {'IP':{'table_header':'$\\bf{IP}$','format':'.1f',} ,
+ 'TBF':{'table_header':'$\\bf{PA}$','format':'.0f',} ,
+ 'AVG':{'table_header':'$\\bf{AVG}$','format':'.3f',} ,
+ 'K/9':{'table_header':'$\\bf{K\/9}$','format':'.2f',} ,
+ 'BB/9':{'table_header':'$\\bf{BB\/9}$','format':'.2f',} ,
+ 'K/BB':{'table_header':'$\\bf{K\/BB}$','format':'.2f',} ,
+ 'HR/9':{'table_header':'$\\bf{HR\/9}$','format':'.2f',} ,
+ 'K%':{'table_header':'$\\bf{K\%}$','format':'.1%',} ,
+ 'BB%':{'table_header':'$\\bf{BB\%}$','format':'.1%',} ,
+ 'K-BB%':{'table_header':'$\\bf{K-BB\%}$','format':'.1%',} ,
+ 'WHIP':{'table_header':'$\\bf{WHIP}$','format':'.2f',} ,
+ 'BABIP':{'table_header':'$\\bf{BABIP}$','format':'.3f',} , 
+ 'GB%': {'table_header':'$\\bf{GB\%}$','format':'.1%',} ,
+ 'LOB%':{'table_header':'$\\bf{LOB\%}$','format':'.1%',} ,
+ 'xFIP':{'table_header':'$\\bf{xFIP}$','format':'.2f',} ,
+ 'FIP':{'table_header':'$\\bf{FIP}$','format':'.2f',} ,
+ 'H':{'table_header':'$\\bf{H}$','format':'.0f',} ,
+ '2B':{'table_header':'$\\bf{2B}$','format':'.0f',} ,
+ '3B':{'table_header':'$\\bf{3B}$','format':'.0f',} ,
+ 'R':{'table_header':'$\\bf{R}$','format':'.0f',} ,
+ 'ER':{'table_header':'$\\bf{ER}$','format':'.0f',} ,
+ 'HR':{'table_header':'$\\bf{HR}$','format':'.0f',} ,
+ 'BB':{'table_header':'$\\bf{BB}$','format':'.0f',} ,
+ 'IBB':{'table_header':'$\\bf{IBB}$','format':'.0f',} ,
+ 'HBP':{'table_header':'$\\bf{HBP}$','format':'.0f',} ,
+ 'SO':{'table_header':'$\\bf{SO}$','format':'.0f',} ,
+ 'OBP':{'table_header':'$\\bf{OBP}$','format':'.0f',} ,
+ 'SLG':{'table_header':'$\\bf{SLG}$','format':'.0f',} ,
+ 'ERA':{'table_header':'$\\bf{ERA}$','format':'.2f',} ,
+ 'wOBA':{'table_header':'$\\bf{wOBA}$','format':'.3f',} ,
+ 'G':{'table_header':'$\\bf{G}$','format':'.0f',},
+ 'GS':{'table_header':'$\\bf{GS}$','format':'.0f',} }
+
+def fangraphs_pitcher_stats(pitcher_id: int, ax: plt.Axes,stats:list, season:int,fontsize:int=20):
+    df_fangraphs = fangraphs_leaderboard(season = season)
+
+    df_fangraphs_pitcher = df_fangraphs.loc[df_fangraphs.index.intersection([pitcher_id]), stats].reset_index(drop=True)
+    df_fangraphs_pitcher = df_fangraphs_pitcher.astype('object')
+
+    df_fangraphs_pitcher.loc[0] = [format(df_fangraphs_pitcher[x][0],fangraphs_stats_dict[x]['format']) if df_fangraphs_pitcher[x][0] != '---' else '---' for x in df_fangraphs_pitcher]
+    new_column_names = [fangraphs_stats_dict[x]['table_header'] if x in df_fangraphs_pitcher else '---' for x in stats]
+
+    # The font shrinks, as with ax.table, when a value does not fit its column
+    cell_table(ax, cell_text=df_fangraphs_pitcher.values.tolist(), col_labels=new_column_names,
+               bbox=[0.00, 0.0, 1, 1], fontsize=fontsize, auto_font_size=True)
+
+    ax.axis('off')
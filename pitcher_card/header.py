@@ -0,0 +1,343 @@
+# Card header: headshot, bio and team logo
+import hashlib
+import json
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import requests
+from PIL import Image
+
+from .net import http_session, http_timeout
+
+def headshot_url(pitcher_id: str):
+    # Construct the URL for the player's headshot image
+    return f'https://img.mlbstatic.com/mlb-photos/image/'\
+           f'upload/d_people:generic:headshot:67:current.png'\
+           f'/w_640,q_auto:best/v1/people/{pitcher_id}/headshot/silo/current.png'
+
+# Function to get an image from a URL and display it on the given axis
+def player_headshot(pitcher_id: str, ax: plt.Axes, header: dict = None):
+    if header is not None:
+        # Use the image already fetched by the header stage
+        img = header['headshot']
+    else:
+        # Send a GET request to the URL
+        response = http_session.get(headshot_url(pitcher_id), timeout=http_timeout)
+
+        # Open the image from the response content
+        img = Image.open(BytesIO(response.content))
+
+    # Display the image on the axis
+    ax.set_xlim(0, 1.3)
+    ax.set_ylim(0, 1)
+    if img is not None:
+        ax.imshow(img, extent=[0, 1, 0, 1], origin='upper')
+
+    # Turn off the axis
+    ax.axis('off')
+
+def player_bio(pitcher_id: str, ax: plt.Axes, header: dict = None):
+    if header is not None:
+        # Use the player data already fetched by the header stage
+        data = header['people']
+    else:
+        # Construct the URL to fetch player data
+        url = f"https://statsapi.mlb.com/api/v1/people?personIds={pitcher_id}&hydrate=currentTeam"
+
+        # Send a GET request to the URL and parse the JSON response
+        data = http_session.get(url, timeout=http_timeout).json()
+
+    # Extract player information from the JSON data
+    player_name = data['people'][0]['fullName']
+    pitcher_hand = data['people'][0]['pitchHand']['code']
+    age = data['people'][0]['currentAge']
+    height = data['people'][0]['height']
+    weight = data['people'][0]['weight']
+
+    # Display the player's name, handedness, age, height, and weight on the axis
+    ax.text(0.5, 1, f'{player_name}', va='top', ha='center', fontsize=56)
+    ax.text(0.5, 0.65, f'{pitcher_hand}HP, Age:{age}, {height}/{weight}', va='top', ha='center', fontsize=30)
+    ax.text(0.5, 0.40, f'Season Pitching Summary', va='top', ha='center', fontsize=40)
+    ax.text(0.5, 0.15, f'2025 MLB Season', va='top', ha='center', fontsize=30, fontstyle='italic')
+
+    # Turn off the axis
+    ax.axis('off')
+
+# List of MLB and MILB teams and their corresponding logo URLs
+teams = [
+    # MLB
+    {"team": "ATH", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/ath.png&h=500&w=500"},
+    {"team": "AZ", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/ari.png&h=500&w=500"},
+    {"team": "ATL", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/atl.png&h=500&w=500"},
+    {"team": "BAL", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/bal.png&h=500&w=500"},
+    {"team": "BOS", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/bos.png&h=500&w=500"},
+    {"team": "CHC", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/chc.png&h=500&w=500"},
+    {"team": "CWS", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/chw.png&h=500&w=500"},
+    {"team": "CIN", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/cin.png&h=500&w=500"},
+    {"team": "CLE", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/cle.png&h=500&w=500"},
+    {"team": "COL", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/col.png&h=500&w=500"},
+    {"team": "DET", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/det.png&h=500&w=500"},
+    {"team": "HOU", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/hou.png&h=500&w=500"},
+    {"team": "KC", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/kc.png&h=500&w=500"},
+    {"team": "LAA", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/laa.png&h=500&w=500"},
+    {"team": "LAD", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/lad.png&h=500&w=500"},
+    {"team": "MIA", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/mia.png&h=500&w=500"},
+    {"team": "MIL", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/mil.png&h=500&w=500"},
+    {"team": "MIN", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/min.png&h=500&w=500"},
+    {"team": "NYM", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/nym.png&h=500&w=500"},
+    {"team": "NYY", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/nyy.png&h=500&w=500"},
+    {"team": "PHI", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/phi.png&h=500&w=500"},
+    {"team": "PIT", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/pit.png&h=500&w=500"},
+    {"team": "SD", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/sd.png&h=500&w=500"},
+    {"team": "SF", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/sf.png&h=500&w=500"},
+    {"team": "SEA", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/sea.png&h=500&w=500"},
+    {"team": "STL", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/stl.png&h=500&w=500"},
+    {"team": "TB", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/tb.png&h=500&w=500"},
+    {"team": "TEX", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/tex.png&h=500&w=500"},
+    {"team": "TOR", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/tor.png&h=500&w=500"},
+    {"team": "WSH", "logo_url": "https://a.espncdn.com/combiner/i?img=/i/teamlogos/mlb/500/scoreboard/wsh.png&h=500&w=500"},
+
+    # AAA
+    {"team": "ABQ", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/0/0b/Albuquerque_Isotopes.svg/revision/latest/smart/width/250/height/250?cb=20240522035213"},
+    {"team": "BUF", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/b/bc/Buffalo_Bisons.svg/revision/latest/smart/width/250/height/250?cb=20240522011841"},
+    {"team": "CLT", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/2/25/Charlotte_Knights.svg/revision/latest/smart/width/250/height/250?cb=20240522011908"},
+    {"team": "COL", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/1/19/Columbus_Clippers.svg/revision/latest/smart/width/250/height/250?cb=20240522011936"},
+    {"team": "DUR", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/c/c9/Durham_Bulls.svg/revision/latest/smart/width/250/height/250?cb=20240522011959"},
+    {"team": "ELP", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/4/4f/El_Paso_Chihuahuas.svg/revision/latest/smart/width/250/height/250?cb=20240522035226"},
+    {"team": "GWN", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/5/57/Gwinnett_Stripers.svg/revision/latest/smart/width/250/height/250?cb=20240522012022"},
+    {"team": "IND", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/b/b5/Indianapolis_Indians.svg/revision/latest/smart/width/250/height/250?cb=20240522012039"},
+    {"team": "IOW", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/e/e2/Iowa_Cubs.svg/revision/latest/smart/width/250/height/250?cb=20240522012105"},
+    {"team": "JAX", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/2/2b/Jacksonville_Jumbo_Shrimp.svg/revision/latest/smart/width/250/height/250?cb=20240522012119"},
+    {"team": "LV", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/b/ba/Las_Vegas_Aviators.svg/revision/latest/smart/width/250/height/250?cb=20240522035252"},
+    {"team": "LEH", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/3/30/Lehigh_Valley_IronPigs.svg/revision/latest/smart/width/250/height/250?cb=20240522012131"},
+    {"team": "LOU", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/d/d1/Louisville_Bats.svg/revision/latest/smart/width/250/height/250?cb=20240522012251"},
+    {"team": "MEM", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/7/75/Memphis_Redbirds.svg/revision/latest/smart/width/250/height/250?cb=20240522012306"},
+    {"team": "NAS", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/0/02/Nashville_Sounds.svg/revision/latest/smart/width/250/height/250?cb=20240522012505"},
+    {"team": "NOR", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/0/0d/Norfolk_Tides.svg/revision/latest/smart/width/250/height/250?cb=20240522012519"},
+    {"team": "OKC", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/7/75/Oklahoma_City_Comets.svg/revision/latest/scale-to-width-down/213?cb=20241028224007"},
+    {"team": "OMA", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/2/26/Omaha_Storm_Chasers.svg/revision/latest/scale-to-width-down/213?cb=20240522012708"},
+    {"team": "RNO", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/9/94/Reno_Aces.svg/revision/latest/scale-to-width-down/213?cb=20240522035313"},
+    {"team": "ROC", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/f/ff/Rochester_Red_Wings.svg/revision/latest/scale-to-width-down/213?cb=20240522012948"},
+    {"team": "RR", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/0/0c/Round_Rock_Express.svg/revision/latest/scale-to-width-down/213?cb=20240522034505"},
+    {"team": "SAC", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/7/7c/Sacramento_River_Cats.svg/revision/latest/scale-to-width-down/213?cb=20240522035338"},
+    {"team": "SL", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/8/89/Salt_Lake_Bees.svg/revision/latest/scale-to-width-down/155?cb=20240522035345"},
+    {"team": "SWB", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/a/a5/Scranton_Wilkes-Barre_RailRiders_3.svg/revision/latest/scale-to-width-down/213?cb=20240522012923"},
+    {"team": "STP", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/9/9d/St._Paul_Saints.svg/revision/latest/scale-to-width-down/164?cb=20240522012629"},
+    {"team": "SUG", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/4/4c/Sugar_Land_Space_Cowboys.svg/revision/latest/scale-to-width-down/166?cb=20240522035238"},
+    {"team": "SYR", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/c/cd/Syracuse_Mets.svg/revision/latest/scale-to-width-down/141?cb=20240522013011"},
+    {"team": "TAC", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/7/71/Tacoma_Rainiers.svg/revision/latest/scale-to-width-down/213?cb=20240522035352"},
+    {"team": "TOL", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/d/d3/Toledo_Mud_Hens.svg/revision/latest/scale-to-width-down/213?cb=20240522012741"},
+    {"team": "WOR", "logo_url": "https://static.wikia.nocookie.net/minor-league-baseball/images/b/b7/Worcester_Red_Sox.svg/revision/latest/scale-to-width-down/213?cb=20240522013224"}
+]
+
+# Create a DataFrame from the list of dictionaries
+df_image = pd.DataFrame(teams)
+image_dict = df_image.set_index('team')['logo_url'].to_dict()
+
+def plot_logo(pitcher_id: str, ax: plt.Axes, header: dict = None):
+    try:
+        if header is not None:
+            # Use the team already looked up by the header stage
+            team_abb = header['team_abb']
+        else:
+            # Get player info and current team
+            url = f"https://statsapi.mlb.com/api/v1/people?personIds={pitcher_id}&hydrate=currentTeam"
+            data = http_session.get(url, timeout=http_timeout).json()
+            url_team = 'https://statsapi.mlb.com/' + data['people'][0]['currentTeam']['link']
+            data_team = http_session.get(url_team, timeout=http_timeout).json()
+
+            # Extract team abbreviation
+            team_abb = data_team['teams'][0].get('abbreviation')
+
+        # If abbreviation is missing or not in the dictionary, skip
+        if not team_abb or team_abb not in image_dict:
+            print(f"Team abbreviation '{team_abb}' not found in logo dictionary.")
+            ax.axis('off')
+            return
+
+        # Fetch and display the logo image
+        if header is not None:
+            img = header['logo']
+        else:
+            logo_url = image_dict[team_abb]
+            response = http_session.get(logo_url, timeout=http_timeout)
+            img = Image.open(BytesIO(response.content))
+
+        ax.set_xlim(0, 1.3)
+        ax.set_ylim(0, 1)
+        ax.imshow(img, extent=[0.3, 1.3, 0, 1], origin='upper')
+        ax.axis('off')
+
+    except Exception as e:
+        print(f"Could not load logo for pitcher ID {pitcher_id}: {e}")
+        ax.axis('off')
+
+# Decoded, pre-resized RGBA arrays for headshots and logos
+asset_cache_dir = os.environ.get('ASSET_CACHE_DIR', os.path.join('.cache', 'assets'))
+
+# Headshots are refreshed after a month, logos are kept until the cache is cleared
+headshot_max_age = 30 * 24 * 60 * 60
+
+# Size of the square headshot and logo images on the card, in inches
+card_asset_inches = 3.2
+
+# Arrays recently used by this process, least recently used first, with the time each
+# was stored so a stale headshot is reloaded like one on disk, and a digest of its pixels
+asset_memory_items = 256
+_asset_memory = OrderedDict()
+_asset_lock = threading.Lock()
+
+def card_asset_pixels(dpi: float):
+    # Pixel size the headshot and logo are drawn at for a given render resolution
+    return max(int(round(card_asset_inches * dpi)), 1)
+
+def placeholder_asset(size: int):
+    # A light grey silhouette shown while an image is missing
+    y, x = np.mgrid[0:size, 0:size] / size
+    head = (x - 0.5) ** 2 + (y - 0.38) ** 2 < 0.2 ** 2
+    shoulders = ((x - 0.5) / 0.42) ** 2 + ((y - 1.05) / 0.4) ** 2 < 1
+    img = np.zeros((size, size, 4), dtype=np.uint8)
+    img[head | shoulders] = (200, 200, 200, 255)
+    return img
+
+def _download_image(url: str, session: requests.Session = http_session):
+    img = Image.open(BytesIO(session.get(url, timeout=http_timeout).content))
+    # Decode here so the work happens on the fetching thread
+    img.load()
+    return img
+
+def _asset_path(kind: str, key: str, size: int):
+    return os.path.join(asset_cache_dir, kind, f'{key}_{size}.npy')
+
+def _asset_digest(array: np.ndarray):
+    return hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()[:32]
+
+def _remember_asset(asset_key: tuple, stored_at: float, array: np.ndarray):
+    digest = _asset_digest(array)
+    with _asset_lock:
+        _asset_memory[asset_key] = (stored_at, array, digest)
+        _asset_memory.move_to_end(asset_key)
+        while len(_asset_memory) > asset_memory_items:
+            _asset_memory.popitem(last=False)
+    return array, digest
+
+def _store_asset(kind: str, key: str, url: str, size: int, session: requests.Session = http_session):
+    # Download, decode and resize once, then keep the raw array on disk. The image is
+    # scaled to fit the square, keeping its aspect ratio.
+    img = _download_image(url, session).convert('RGBA')
+    img.thumbnail((size, size), Image.LANCZOS)
+    array = np.asarray(img)
+
+    path = _asset_path(kind, key, size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+    return _remember_asset((kind, key, size), time.time(), array)
+
+def _image_asset(kind: str, key: str, url: str, size: int, max_age: float = None,
+                 session: requests.Session = http_session):
+    # The image and the digest of its pixels, or the placeholder and None when it is missing
+    asset_key = (kind, key, size)
+    with _asset_lock:
+        entry = _asset_memory.get(asset_key)
+        if entry is not None and (max_age is None or time.time() - entry[0] < max_age):
+            _asset_memory.move_to_end(asset_key)
+            return entry[1], entry[2]
+
+    # Memory-map the cached array unless it is older than allowed
+    path = _asset_path(kind, key, size)
+    if os.path.exists(path) and (max_age is None or time.time() - os.path.getmtime(path) < max_age):
+        return _remember_asset(asset_key, os.path.getmtime(path), np.load(path, mmap_mode='r'))
+
+    try:
+        return _store_asset(kind, key, url, size, session)
+    except Exception as e:
+        print(f"Could not load {kind} {key}: {e}")
+        return placeholder_asset(size), None
+
+def get_image_asset(kind: str, key: str, url: str, size: int, max_age: float = None,
+                    session: requests.Session = http_session):
+    return _image_asset(kind, key, url, size, max_age, session)[0]
+
+def prewarm_logos(size: int):
+    # Fill the cache with every team logo in the background
+    def prewarm():
+        for team_abb, logo_url in image_dict.items():
+            if not os.path.exists(_asset_path('logo', team_abb, size)):
+                try:
+                    _store_asset('logo', team_abb, logo_url, size)
+                except Exception as e:
+                    print(f"Could not prewarm logo {team_abb}: {e}")
+    thread = threading.Thread(target=prewarm, daemon=True)
+    thread.start()
+    return thread
+
+# Team responses rarely change, so each team is requested once per process
+_team_cache = {}
+
+# People responses are reused for a while, every card lookup reads the pitcher's age and team
+people_ttl_seconds = 60 * 60
+_people_cache = {}
+
+def _fetch_team(link: str, session: requests.Session = http_session):
+    if link not in _team_cache:
+        _team_cache[link] = session.get('https://statsapi.mlb.com/' + link, timeout=http_timeout).json()
+    return _team_cache[link]
+
+def _fetch_people(pitcher_id: str, session: requests.Session = http_session):
+    cached = _people_cache.get(str(pitcher_id))
+    if cached is not None and time.time() - cached[0] < people_ttl_seconds:
+        return cached[1]
+    url = f"https://statsapi.mlb.com/api/v1/people?personIds={pitcher_id}&hydrate=currentTeam"
+    data = session.get(url, timeout=http_timeout).json()
+    _people_cache[str(pitcher_id)] = (time.time(), data)
+    return data
+
+def fetch_header_data(pitcher_id: str, size: int = None, session: requests.Session = http_session):
+    # Images are cached at the size they are drawn at on the card
+    if size is None:
+        size = card_asset_pixels(mpl.rcParams['figure.dpi'])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # The headshot only needs the ID, so it loads while the people call is in flight
+        headshot_future = pool.submit(_image_asset, 'headshot', str(pitcher_id), headshot_url(pitcher_id),
+                                      size, headshot_max_age, session)
+
+        # One people call serves both the bio and the current team
+        data = _fetch_people(pitcher_id, session)
+
+        team_id, team_abb, logo, logo_digest = None, None, None, None
+        try:
+            team = data['people'][0]['currentTeam']
+            team_id = team.get('id')
+            data_team = _fetch_team(team['link'], session)
+            team_abb = data_team['teams'][0].get('abbreviation')
+            if team_abb in image_dict:
+                logo, logo_digest = _image_asset('logo', team_abb, image_dict[team_abb], size, session=session)
+        except Exception as e:
+            print(f"Could not load team logo for pitcher ID {pitcher_id}: {e}")
+
+        headshot, headshot_digest = headshot_future.result()
+
+    # A placeholder stands in for an image that failed to load and is fetched again next time
+    placeholder = headshot_digest is None or (logo is not None and logo_digest is None)
+    return {'people': data, 'team_id': team_id, 'team_abb': team_abb, 'headshot': headshot, 'logo': logo,
+            'headshot_digest': headshot_digest, 'logo_digest': logo_digest, 'placeholder': placeholder}
+
+def header_version(header: dict):
+    # Version of what the header draws: the bio, the team and the images' pixels
+    person = header['people']['people'][0]
+    bio = [person.get(field) for field in ['fullName', 'pitchHand', 'currentAge', 'height', 'weight']]
+    key = [bio, header['team_id'], header['team_abb'], header['headshot_digest'], header['logo_digest'],
+           header['placeholder']]
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[:32]
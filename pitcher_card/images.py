@@ -0,0 +1,67 @@
+# Encoded cards stored under the hash of their bytes, so each URL always names the same image
+import hashlib
+import os
+import re
+import threading
+
+# Encoded cards served by the web app
+card_image_dir = os.environ.get('CARD_IMAGE_DIR', os.path.join('.cache', 'cards'))
+
+# URL path the web app serves the stored cards under
+card_image_route = '/cards/'
+
+# File extension of each image MIME type and back
+image_extensions = {'image/png': 'png', 'image/webp': 'webp', 'image/jpeg': 'jpg', 'image/svg+xml': 'svg'}
+extension_mime_types = {extension: mime for mime, extension in image_extensions.items()}
+
+# Names are a hex digest and an extension, anything else is not a stored card
+_card_image_name = re.compile(r'^[0-9a-f]{32}\.(' + '|'.join(extension_mime_types) + r')$')
+
+def card_image_name(image: bytes, mime_type: str):
+    # Content-addressed name of an encoded card, doubling as its ETag
+    return f"{hashlib.sha256(image).hexdigest()[:32]}.{image_extensions[mime_type]}"
+
+def store_card_image(image: bytes, mime_type: str, root: str = card_image_dir):
+    # Write the card once under its name; a name that exists already holds the same bytes
+    name = card_image_name(image, mime_type)
+    path = os.path.join(root, name)
+    if not os.path.exists(path):
+        os.makedirs(root, exist_ok=True)
+        # Workers rendering the same card write separate temporary files
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(image)
+        os.replace(tmp_path, path)
+    return name
+
+def load_card_image(name: str, root: str = card_image_dir):
+    # Bytes and MIME type of a stored card, None for an unknown name
+    if not _card_image_name.match(name):
+        return None
+    try:
+        with open(os.path.join(root, name), 'rb') as f:
+            image = f.read()
+    except FileNotFoundError:
+        return None
+    return image, extension_mime_types[name.rsplit('.', 1)[1]]
+
+def trim_card_images(max_bytes: int, root: str = card_image_dir):
+    # Remove the least recently used cards until the directory fits in max_bytes. Reads
+    # through the card cache touch a card's modification time, so it orders by last use.
+    try:
+        entries = [entry for entry in os.scandir(root) if _card_image_name.match(entry.name)]
+    except FileNotFoundError:
+        return 0
+    stats = sorted(((entry.stat(), entry.path) for entry in entries), key=lambda item: item[0].st_mtime_ns)
+    total = sum(stat.st_size for stat, _ in stats)
+    removed = 0
+    for stat, path in stats:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= stat.st_size
+        removed += 1
+    return removed
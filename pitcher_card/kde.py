@@ -0,0 +1,100 @@
+# Binned kernel density estimates of pitch velocity
+import numpy as np
+import pandas as pd
+
+# Fixed velocity grid shared by the pitcher densities and the league histograms, in mph
+velocity_grid_start = 30.0
+velocity_grid_stop = 110.0
+velocity_grid_step = 0.05
+velocity_grid = np.arange(velocity_grid_start, velocity_grid_stop + velocity_grid_step / 2, velocity_grid_step)
+
+def bin_velocities(speeds: np.ndarray, codes: np.ndarray, n_groups: int):
+    # Linear binning: each pitch is split between its two nearest grid points, which keeps
+    # the binned estimate close to the exact one at a fraction of the cost
+    codes = np.asarray(codes, dtype=np.int64)
+    position = (np.clip(speeds, velocity_grid_start, velocity_grid_stop) - velocity_grid_start) / velocity_grid_step
+    lower = np.minimum(np.floor(position).astype(int), len(velocity_grid) - 2)
+    upper_weight = position - lower
+    n_bins = len(velocity_grid)
+    counts = np.bincount(codes * n_bins + lower, weights=1 - upper_weight, minlength=n_groups * n_bins)
+    counts += np.bincount(codes * n_bins + lower + 1, weights=upper_weight, minlength=n_groups * n_bins)
+    return counts.reshape(n_groups, n_bins)
+
+def smooth_histograms(counts: np.ndarray, bandwidths: np.ndarray):
+    # Convolve every row with its own Gaussian kernel in one FFT pass. The kernel's transform
+    # is known in closed form, so only the histograms are transformed. Rows are padded so
+    # the kernels do not wrap around the ends of the grid.
+    n_bins = counts.shape[1]
+    padding = int(np.ceil(5 * np.nanmax(bandwidths, initial=0) / velocity_grid_step))
+    n_fft = n_bins + padding
+    frequencies = np.fft.rfftfreq(n_fft, d=velocity_grid_step)
+    kernels = np.exp(-2 * (np.pi * frequencies[None, :] * bandwidths[:, None]) ** 2)
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n=n_fft, axis=1) * kernels, n=n_fft, axis=1)[:, :n_bins]
+
+    # Densities in pitches per mph, normalised to integrate to one
+    totals = counts.sum(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.clip(smoothed, 0, None) / (totals * velocity_grid_step)
+
+def scott_bandwidths(counts: np.ndarray, stds: np.ndarray):
+    # Scott's rule, as used by seaborn's kdeplot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return stds * np.power(counts, -1 / 5)
+
+def velocity_densities(df: pd.DataFrame, pitch_types: list):
+    # Group the pitches once and estimate every pitch type's velocity density together
+    speeds = df['release_speed'].to_numpy(dtype=float)
+    codes = pd.Categorical(df['pitch_type'], categories=pitch_types).codes
+    valid = (codes >= 0) & ~np.isnan(speeds)
+    speeds, codes = speeds[valid], codes[valid]
+    n_groups = len(pitch_types)
+
+    # Per pitch type count, mean, spread and range without filtering the frame
+    counts = np.bincount(codes, minlength=n_groups).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.bincount(codes, weights=speeds, minlength=n_groups) / counts
+        variances = (np.bincount(codes, weights=(speeds - means[codes]) ** 2, minlength=n_groups)
+                     / (counts - 1))
+    lows = np.full(n_groups, np.inf)
+    highs = np.full(n_groups, -np.inf)
+    np.minimum.at(lows, codes, speeds)
+    np.maximum.at(highs, codes, speeds)
+
+    densities = smooth_histograms(bin_velocities(speeds, codes, n_groups),
+                                  scott_bandwidths(counts, np.sqrt(variances)))
+    return pd.DataFrame({'pitch_type': pitch_types, 'pitches': counts, 'mean': means,
+                         'min': lows, 'max': highs}), densities
+
+def density_polygon(density: np.ndarray, low: float, high: float):
+    # The density curve between the pitch type's slowest and fastest pitch, as seaborn's clip
+    inside = (velocity_grid > low) & (velocity_grid < high)
+    x = np.concatenate([[low], velocity_grid[inside], [high]])
+    y = np.concatenate([[np.interp(low, velocity_grid, density)], density[inside],
+                        [np.interp(high, velocity_grid, density)]])
+    return x, y
+
+def velocity_histograms(df: pd.DataFrame):
+    # League velocity histograms by pitch type and handedness on the shared grid, in the
+    # long form saved as statcast_2025_velocity_hist.csv:
+    # velocity_histograms(df_league).to_csv('statcast_2025_velocity_hist.csv', index=False)
+    keys = df[['pitch_type', 'p_throws']].astype(object)
+    groups = keys.drop_duplicates().dropna().sort_values(['pitch_type', 'p_throws']).reset_index(drop=True)
+    codes = pd.MultiIndex.from_frame(groups).get_indexer(pd.MultiIndex.from_frame(keys))
+    speeds = df['release_speed'].to_numpy(dtype=float)
+    valid = (codes >= 0) & ~np.isnan(speeds)
+    counts = bin_velocities(speeds[valid], codes[valid], len(groups))
+
+    # Only the non-empty bins are kept
+    group_index, bin_index = np.nonzero(counts)
+    return pd.DataFrame({'pitch_type': groups['pitch_type'].to_numpy()[group_index],
+                         'p_throws': groups['p_throws'].to_numpy()[group_index],
+                         'release_speed': np.round(velocity_grid[bin_index], 2),
+                         'count': counts[group_index, bin_index]})
+
+def league_velocity_densities(counts: np.ndarray):
+    # League densities from the histograms, smoothed with the same rule as the pitcher's
+    totals = counts.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = counts @ velocity_grid / totals
+        variances = (counts * (velocity_grid[None, :] - means[:, None]) ** 2).sum(axis=1) / (totals - 1)
+    return smooth_histograms(counts, scott_bandwidths(totals, np.sqrt(variances)))
@@ -0,0 +1,211 @@
+# Pitch metric registry: the pitch-level terms each metric reads, how it aggregates them
+# and how it is shown. Selected metrics compile into one plan that is aggregated in a
+# single groupby pass.
+import os
+
+import numpy as np
+import pandas as pd
+
+# Define the codes for different types of swings and whiffs
+swing_code = ['foul_bunt','foul','hit_into_play','swinging_strike', 'foul_tip',
+            'swinging_strike_blocked','missed_bunt','bunt_foul_tip']
+whiff_code = ['swinging_strike', 'foul_tip', 'swinging_strike_blocked']
+called_strike_code = ['called_strike']
+
+def _category_flags(series: pd.Series, codes: list):
+    # Look up each category once, then index the result with the per-pitch category codes.
+    # The appended False covers missing values, whose category code is -1.
+    lookup = np.append(series.cat.categories.isin(codes), False)
+    return lookup[series.cat.codes.to_numpy()]
+
+def _description_flags(df: pd.DataFrame, codes: list):
+    if isinstance(df['description'].dtype, pd.CategoricalDtype):
+        return _category_flags(df['description'], codes)
+    return df['description'].isin(codes).to_numpy()
+
+def _values(df: pd.DataFrame, col: str):
+    return df[col].to_numpy(dtype=float)
+
+# Distance from home plate to the front of the plate and the y0 of Statcast's
+# trajectory fit, in feet
+plate_front_y = 17 / 12
+trajectory_y0 = 50
+
+def _approach_angle(df: pd.DataFrame):
+    # Vertical approach angle at the front of the plate from the constant-acceleration fit
+    vy0, vz0, ay, az = (_values(df, col) for col in ['vy0', 'vz0', 'ay', 'az'])
+    with np.errstate(invalid='ignore'):
+        vy_f = -np.sqrt(vy0 ** 2 - 2 * ay * (trajectory_y0 - plate_front_y))
+        vz_f = vz0 + az * (vy_f - vy0) / ay
+    return -np.degrees(np.arctan(vz_f / vy_f))
+
+def _spin_efficiency(df: pd.DataFrame):
+    # Share of the spin that moves the ball (transverse spin over total spin), from
+    # Alan Nathan's method of backing the Magnus acceleration out of the trajectory fit
+    vx0, vy0, vz0, ax, ay, az = (_values(df, col) for col in ['vx0', 'vy0', 'vz0', 'ax', 'ay', 'az'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Velocity at release
+        y_release = 60.5 - _values(df, 'release_extension')
+        t_release = (-vy0 - np.sqrt(vy0 ** 2 - 2 * ay * (trajectory_y0 - y_release))) / ay
+        vx_r, vy_r, vz_r = vx0 + ax * t_release, vy0 + ay * t_release, vz0 + az * t_release
+
+        # Average velocity over the flight to the front of the plate
+        t_flight = (-vy_r - np.sqrt(vy_r ** 2 - 2 * ay * (y_release - plate_front_y))) / ay
+        vx_bar, vy_bar, vz_bar = vx_r + ax * t_flight / 2, vy_r + ay * t_flight / 2, vz_r + az * t_flight / 2
+        v_bar = np.sqrt(vx_bar ** 2 + vy_bar ** 2 + vz_bar ** 2)
+
+        # Remove drag (along the velocity) and gravity to leave the Magnus acceleration
+        g = 32.174
+        a_drag = -(ax * vx_bar + ay * vy_bar + (az + g) * vz_bar) / v_bar
+        a_magnus = np.sqrt((ax + a_drag * vx_bar / v_bar) ** 2 +
+                           (ay + a_drag * vy_bar / v_bar) ** 2 +
+                           (az + a_drag * vz_bar / v_bar + g) ** 2)
+
+        # Lift coefficient to spin factor to transverse spin in rpm
+        lift = a_magnus / (0.005383 * v_bar ** 2)
+        spin_factor = 0.4 * lift / (1 - 2.32 * lift)
+        transverse_spin = 78.92 * spin_factor * v_bar
+        return np.clip(transverse_spin / _values(df, 'release_spin_rate'), 0, 1)
+
+# Pitch-level terms: the columns a term reads and how it is computed for every pitch.
+# Missing values are NaN and are left out of averages.
+pitch_terms = {
+    'pitch': {'inputs': ['pitch_type'], 'compute': lambda df: df['pitch_type'].notna().to_numpy()},
+    'swing': {'inputs': ['description'], 'compute': lambda df: _description_flags(df, swing_code)},
+    'whiff': {'inputs': ['description'], 'compute': lambda df: _description_flags(df, whiff_code)},
+    'called_strike': {'inputs': ['description'], 'compute': lambda df: _description_flags(df, called_strike_code)},
+    'csw': {'inputs': ['description'], 'compute': lambda df: _description_flags(df, called_strike_code + whiff_code)},
+    'in_zone': {'inputs': ['zone'], 'compute': lambda df: (df['zone'] < 10).to_numpy()},
+    'out_zone': {'inputs': ['zone'], 'compute': lambda df: (df['zone'] > 10).to_numpy()},
+    'chase': {'inputs': ['zone', 'description'],
+              'compute': lambda df: ~(df['zone'] < 10).to_numpy() & _description_flags(df, swing_code)},
+    'xwobacon': {'inputs': ['type', 'estimated_woba_using_speedangle'],
+                 'compute': lambda df: np.where((df['type'] == 'X').to_numpy(),
+                                                _values(df, 'estimated_woba_using_speedangle'), np.nan)},
+    'vaa': {'inputs': ['vy0', 'vz0', 'ay', 'az'], 'compute': _approach_angle},
+    'spin_efficiency': {'inputs': ['vx0', 'vy0', 'vz0', 'ax', 'ay', 'az', 'release_spin_rate', 'release_extension'],
+                        'compute': _spin_efficiency},
+}
+for col in ['release_speed', 'pfx_z', 'pfx_x', 'release_spin_rate', 'release_pos_x',
+            'release_pos_z', 'release_extension', 'delta_run_exp']:
+    pitch_terms[col] = {'inputs': [col], 'compute': lambda df, col=col: _values(df, col)}
+
+# Metrics: how each aggregates its terms, whether the "All" row shows it, and its display.
+#   count: pitches, share: pitches over the pitcher's total, mean: average of a term,
+#   rate: sum of a term over the sum of another (`per`), times `scale` when given.
+# `color` compares the value with the league average of the pitch type (`league_range`,
+# as factors of the average) or with a fixed `range`, reversed when lower is better.
+pitch_metrics = {
+    'pitch': {'agg': 'count', 'summary': True,
+              'table_header': '$\\bf{Count}$', 'format': '.0f'},
+    'pitch_usage': {'agg': 'share', 'summary': True,
+                    'table_header': '$\\bf{Pitch\\%}$', 'format': '.1%'},
+    'release_speed': {'agg': 'mean', 'term': 'release_speed', 'summary': False,
+                      'table_header': '$\\bf{Velocity}$', 'format': '.1f',
+                      'color': {'league_range': (0.95, 1.05)}},
+    'pfx_z': {'agg': 'mean', 'term': 'pfx_z', 'summary': False,
+              'table_header': '$\\bf{iVB}$', 'format': '.1f'},
+    'pfx_x': {'agg': 'mean', 'term': 'pfx_x', 'summary': False,
+              'table_header': '$\\bf{HB}$', 'format': '.1f'},
+    'release_spin_rate': {'agg': 'mean', 'term': 'release_spin_rate', 'summary': False,
+                          'table_header': '$\\bf{Spin}$', 'format': '.0f'},
+    'release_pos_x': {'agg': 'mean', 'term': 'release_pos_x', 'summary': False,
+                      'table_header': '$\\bf{hRel}$', 'format': '.1f'},
+    'release_pos_z': {'agg': 'mean', 'term': 'release_pos_z', 'summary': False,
+                      'table_header': '$\\bf{vRel}$', 'format': '.1f'},
+    'release_extension': {'agg': 'mean', 'term': 'release_extension', 'summary': True,
+                          'table_header': '$\\bf{Ext.}$', 'format': '.1f',
+                          'color': {'league_range': (0.7, 1.3)}},
+    'delta_run_exp_per_100': {'agg': 'rate', 'term': 'delta_run_exp', 'per': 'pitch', 'scale': -100, 'summary': True,
+                              'table_header': '$\\bf{RV\\//100}$', 'format': '.1f',
+                              'color': {'range': (-1.5, 1.5)}},
+    'in_zone_rate': {'agg': 'rate', 'term': 'in_zone', 'per': 'pitch', 'summary': True,
+                     'table_header': '$\\bf{Zone\\%}$', 'format': '.1%',
+                     'color': {'league_range': (0.7, 1.3)}},
+    'chase_rate': {'agg': 'rate', 'term': 'chase', 'per': 'out_zone', 'summary': True,
+                   'table_header': '$\\bf{Chase\\%}$', 'format': '.1%',
+                   'color': {'league_range': (0.7, 1.3)}},
+    'whiff_rate': {'agg': 'rate', 'term': 'whiff', 'per': 'swing', 'summary': True,
+                   'table_header': '$\\bf{Whiff\\%}$', 'format': '.1%',
+                   'color': {'league_range': (0.7, 1.3)}},
+    'xwobacon': {'agg': 'mean', 'term': 'xwobacon', 'summary': True,
+                 'table_header': '$\\bf{xwOBA}$\n$\\bf{con}$', 'format': '.3f',
+                 'color': {'league_range': (0.7, 1.3), 'reverse': True}},
+    'csw_rate': {'agg': 'rate', 'term': 'csw', 'per': 'pitch', 'summary': True,
+                 'table_header': '$\\bf{CSW\\%}$', 'format': '.1%',
+                 'color': {'league_range': (0.7, 1.3)}},
+    'called_strike_rate': {'agg': 'rate', 'term': 'called_strike', 'per': 'pitch', 'summary': True,
+                           'table_header': '$\\bf{CStr\\%}$', 'format': '.1%',
+                           'color': {'league_range': (0.7, 1.3)}},
+    'vaa': {'agg': 'mean', 'term': 'vaa', 'summary': False,
+            'table_header': '$\\bf{VAA}$', 'format': '.1f'},
+    'spin_efficiency': {'agg': 'mean', 'term': 'spin_efficiency', 'summary': False,
+                        'table_header': '$\\bf{Spin\\ Eff.}$', 'format': '.0%'},
+}
+
+# Metrics shown in the pitch table, overridable per deployment with a comma-separated
+# PITCH_TABLE_METRICS list
+default_table_metrics = ['pitch', 'pitch_usage', 'release_speed', 'pfx_z', 'pfx_x', 'release_spin_rate',
+                         'release_pos_x', 'release_pos_z', 'release_extension', 'delta_run_exp_per_100',
+                         'in_zone_rate', 'chase_rate', 'whiff_rate', 'xwobacon']
+table_metrics = [x.strip() for x in os.environ['PITCH_TABLE_METRICS'].split(',')] \
+    if os.environ.get('PITCH_TABLE_METRICS') else default_table_metrics
+
+def compile_metrics(metrics: list):
+    # The pitch count is always aggregated, it orders the table and weights usage
+    metrics = ['pitch'] + [x for x in metrics if x != 'pitch']
+    unknown = [x for x in metrics if x not in pitch_metrics]
+    if unknown:
+        raise ValueError(f"Unknown pitch metrics: {', '.join(unknown)}")
+
+    # Each metric becomes summed columns: a term's zero-filled values, plus the count of
+    # its non-missing values for averages
+    columns = {}
+    for name in metrics:
+        metric = pitch_metrics[name]
+        if metric['agg'] in ('count', 'share'):
+            columns['pitch'] = ('pitch', 'value')
+        elif metric['agg'] == 'mean':
+            columns[metric['term']] = (metric['term'], 'value')
+            columns[metric['term'] + '_count'] = (metric['term'], 'count')
+        elif metric['agg'] == 'rate':
+            columns[metric['term']] = (metric['term'], 'value')
+            columns[metric['per']] = (metric['per'], 'value')
+        else:
+            raise ValueError(f"Unknown aggregation '{metric['agg']}' for {name}")
+
+    inputs = sorted({col for term, _ in columns.values() for col in pitch_terms[term]['inputs']})
+    return {'metrics': metrics, 'columns': columns, 'inputs': inputs}
+
+def pitch_sums(df: pd.DataFrame, plan: dict):
+    # The per-pitch columns of the plan, ready to be summed together by any grouping
+    terms = {}
+    parts = {}
+    for name, (term, kind) in plan['columns'].items():
+        if term not in terms:
+            # Terms whose inputs the frame does not carry (e.g. an older download) are missing
+            if all(col in df.columns for col in pitch_terms[term]['inputs']):
+                terms[term] = np.asarray(pitch_terms[term]['compute'](df), dtype=float)
+            else:
+                terms[term] = np.full(len(df), np.nan)
+        parts[name] = np.nan_to_num(terms[term]) if kind == 'value' else ~np.isnan(terms[term])
+    return pd.DataFrame(parts, index=df.index)
+
+def metric_values(sums: pd.DataFrame, plan: dict, pitch_totals=None):
+    # Metric values from summed columns, `pitch_totals` is each row's total for usage shares
+    values = {}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for name in plan['metrics']:
+            metric = pitch_metrics[name]
+            if metric['agg'] == 'count':
+                value = sums['pitch'].to_numpy().astype('int64')
+            elif metric['agg'] == 'share':
+                value = sums['pitch'].to_numpy() / (sums['pitch'].to_numpy() if pitch_totals is None else pitch_totals)
+            elif metric['agg'] == 'mean':
+                value = sums[metric['term']].to_numpy() / sums[metric['term'] + '_count'].to_numpy()
+            else:
+                value = sums[metric['term']].to_numpy() / sums[metric['per']].to_numpy()
+            if 'scale' in metric:
+                value = value * metric['scale']
+            values[name] = value
+    return pd.DataFrame(values, index=sums.index)
@@ -0,0 +1,8 @@
+import requests
+
+# Pooled HTTP session shared by the API and image requests
+http_session = requests.Session()
+http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
+# Seconds to wait on any single request
+http_timeout = 10
@@ -0,0 +1,64 @@
+# Pitch type colors and names
+import matplotlib.pyplot as plt
+
+### PITCH COLORS ###
+pitch_colors = {
+    ## Fastballs ##
+    'FF': {'color': '#C21014', 'name': '4-Seam Fastball'},
+    'FA': {'color': '#C21014', 'name': 'Fastball'},
+    'SI': {'color': '#F4B400', 'name': 'Sinker'},
+    'FC': {'color': '#993300', 'name': 'Cutter'},
+
+    ## Offspeed ##
+    'CH': {'color': '#00B386', 'name': 'Changeup'},
+    'FS': {'color': '#66CCCC', 'name': 'Splitter'},
+    'SC': {'color': '#33CC99', 'name': 'Screwball'},
+    'FO': {'color': '#339966', 'name': 'Forkball'},
+
+    ## Sliders ##
+    'SL': {'color': '#FFCC00', 'name': 'Slider'},
+    'ST': {'color': '#CCCC66', 'name': 'Sweeper'},
+    'SV': {'color': '#9999FF', 'name': 'Slurve'},
+
+    ## Curveballs ##
+    'KC': {'color': '#0000CC', 'name': 'Knuckle Curve'},
+    'CU': {'color': '#3399FF', 'name': 'Curveball'},
+    'CS': {'color': '#66CCFF', 'name': 'Slow Curve'},
+
+    ## Knuckleball ##
+    'KN': {'color': '#3333CC', 'name': 'Knuckleball'},
+
+    ## Others ##
+    'EP': {'color': '#999966', 'name': 'Eephus'},
+    'PO': {'color': '#CCCCCC', 'name': 'Pitchout'},
+    'UN': {'color': '#9C8975', 'name': 'Unknown'},
+}
+
+# Create a dictionary mapping pitch types to their colors
+dict_color = dict(zip(pitch_colors.keys(), [pitch_colors[key]['color'] for key in pitch_colors]))
+
+# Create a dictionary mapping pitch types to their colors
+dict_pitch = dict(zip(pitch_colors.keys(), [pitch_colors[key]['name'] for key in pitch_colors]))
+
+def plot_pitch_colors():
+    # Create a figure and axis
+    fig, ax = plt.subplots(figsize=(6, 10))
+
+    # Plot a square for each pitch type with its corresponding color
+    for i, pitch_type in enumerate(pitch_colors):
+        ax.add_patch(plt.Rectangle((0, i), 1, 1, color=pitch_colors[pitch_type]['color']))
+        ax.text(-0.02, i + 0.5, f'{pitch_type}: {pitch_colors[pitch_type]["name"]} - {pitch_colors[pitch_type]["color"]}', va='center', ha='right')
+
+    # Set the y-axis limits and remove ticks
+    ax.set_ylim(0, len(pitch_colors))
+    ax.set_yticks([])
+    ax.set_ylabel('')
+
+    # Remove the x-axis
+    ax.set_xticks([])
+    ax.set_xlabel('')
+    ax.invert_yaxis()
+
+    # Set the title
+    ax.set_title('Pitch Colors')
+    return fig
@@ -0,0 +1,171 @@
+# Percentile ranks against the FanGraphs leaderboard
+import matplotlib.colors as mcolors
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .fangraphs import fangraphs_leaderboard, index_by_mlbam
+
+# Metrics shown in the percentile panel and their labels
+percentile_label_map = {
+    'xERA': 'xERA',
+    'EV': 'Avg Exit Velocity',
+    'pfxZone%': 'Zone%',
+    'pfxO-Swing%': 'O-Swing%',
+    'K%': 'K%',
+    'BB%': 'BB%',
+    'Barrel%': 'Barrel%',
+    'HardHit%': 'Hard-Hit%',
+    'GB%': 'GB%',
+}
+
+# Metrics for which lower is better
+percentile_reverse_metrics = ['xERA', 'EV', 'Barrel%', 'HardHit%', 'BB%']
+
+class PercentileRanker:
+    # Sorted metric arrays built once per leaderboard snapshot and population, so each
+    # percentile is a binary search instead of a scan over the whole leaderboard
+    def __init__(self, df_fangraphs: pd.DataFrame, metrics: list = None,
+                 reverse_metrics: list = percentile_reverse_metrics, levels: pd.Series = None):
+        # Pitchers are looked up by MLBAM ID, also in a raw leaderboard with a range index
+        self.df = index_by_mlbam(df_fangraphs)
+        self.metrics = list(percentile_label_map) if metrics is None else metrics
+        self.reverse_metrics = set(reverse_metrics)
+        # Optional level per MLBAM ID (e.g. from the enriched roster) for level populations
+        self.levels = levels
+        self._populations = {}
+
+    def _population(self, min_ip: float = 0, role: str = None, level: str = None):
+        key = (min_ip, role, level)
+        if key not in self._populations:
+            mask = np.ones(len(self.df), dtype=bool)
+            if min_ip:
+                mask &= (self.df['IP'] >= min_ip).to_numpy()
+            # Starters made at least half of their appearances as a starter
+            if role == 'SP':
+                mask &= (self.df['GS'] >= self.df['G'] / 2).to_numpy()
+            elif role == 'RP':
+                mask &= (self.df['GS'] < self.df['G'] / 2).to_numpy()
+            if level is not None:
+                if self.levels is None:
+                    raise ValueError("A level population needs the ranker to be built with levels")
+                mask &= (self.levels.reindex(self.df.index) == level).to_numpy()
+
+            # Missing values are left out of the population instead of counting as lowest
+            sorted_values = {}
+            for metric in self.metrics:
+                values = self.df[metric].to_numpy(dtype=float)[mask]
+                sorted_values[metric] = np.sort(values[~np.isnan(values)])
+            self._populations[key] = sorted_values
+        return self._populations[key]
+
+    def _rank(self, metric: str, values: np.ndarray, sorted_values: np.ndarray):
+        # Share of the population strictly below each value, flipped when lower is better
+        values = np.asarray(values, dtype=float)
+        percentile = np.searchsorted(sorted_values, values, side='left') / max(len(sorted_values), 1) * 100
+        if metric in self.reverse_metrics:
+            percentile = 100 - percentile
+        return np.where(np.isnan(values), np.nan, percentile)
+
+    def percentiles(self, pitcher_id: int, min_ip: float = 0, role: str = None, level: str = None):
+        population = self._population(min_ip, role, level)
+        pitcher_row = self.df.loc[pitcher_id]
+        return {metric: float(self._rank(metric, pitcher_row[metric], population[metric]))
+                for metric in self.metrics}
+
+    def percentile_table(self, min_ip: float = 0, role: str = None, level: str = None):
+        # Percentiles for every pitcher on the leaderboard against the chosen population
+        population = self._population(min_ip, role, level)
+        return pd.DataFrame({metric: self._rank(metric, self.df[metric].to_numpy(dtype=float), population[metric])
+                             for metric in self.metrics}, index=self.df.index)
+
+# One ranker per season, rebuilt whenever the leaderboard snapshot is refreshed
+_percentile_rankers = {}
+
+def percentile_ranker(season: int):
+    df_fangraphs = fangraphs_leaderboard(season)
+    cached = _percentile_rankers.get(season)
+    if cached is None or cached.df is not df_fangraphs:
+        cached = PercentileRanker(df_fangraphs)
+        _percentile_rankers[season] = cached
+    return cached
+
+def plot_percentile_rankings_by_pitcher(df_fangraphs, pitcher_id, ax=None, ranker: PercentileRanker = None,
+                                        season: int = 2025):
+    label_map = percentile_label_map
+
+    # The season's shared ranker, unless the leaderboard passed in is another one
+    if ranker is None:
+        ranker = percentile_ranker(season)
+        if ranker.df is not df_fangraphs:
+            ranker = PercentileRanker(df_fangraphs)
+
+    # Find the pitcher by pitcher_id (xMLBAMID)
+    pitcher_row = ranker.df.loc[pitcher_id]
+
+    # Calculate percentiles, reversed for metrics where lower is better
+    percentiles = ranker.percentiles(pitcher_id)
+
+    # Prepare data for plotting
+    plot_data = pd.DataFrame({
+        'Metric': [label_map[k] for k in label_map],
+        'Percentile': [percentiles[k] for k in label_map],
+        'Value': [
+            round(pitcher_row[k] * 100, 1) if '%' in k else round(pitcher_row[k], 2)
+            for k in label_map
+        ]
+    })
+
+    # Ensure the DataFrame is ordered by label_map
+    plot_data['Metric'] = pd.Categorical(
+        plot_data['Metric'],
+        categories=[label_map[k] for k in label_map],
+        ordered=True
+    )
+    plot_data = plot_data.sort_values('Metric', ascending=False)
+
+    # Normalize the percentiles for colormap
+    norm = mcolors.Normalize(vmin=0, vmax=100)
+    cmap = plt.get_cmap("coolwarm")
+
+    # If no axis is passed, create a new figure and axis
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 7))  # Adjusted figsize to avoid squishing
+
+    # Plotting the percentile rankings
+    for i, row in plot_data.iterrows():
+        color = cmap(norm(row['Percentile']))
+        ax.barh(row['Metric'], row['Percentile'], color=color)
+
+        # Adjust the placement of the percentile text
+        if row['Percentile'] > 90:
+            percentile_x = row['Percentile'] - 5
+            label_color = 'white'
+            ha = 'right'
+        else:
+            percentile_x = row['Percentile'] + 1
+            label_color = 'black'
+            ha = 'left'
+
+        # Pitchers without a value for the metric get an empty bar
+        if not np.isnan(row['Percentile']):
+            ax.text(percentile_x, row['Metric'], f"{int(row['Percentile'])}",
+            va='center', ha=ha, color=label_color)
+
+        # Handle special formatting for xERA
+        value_label = f"{row['Value']:.2f}" if row['Metric'] == "xERA" else f"{row['Value']:.1f}"
+        ax.text(105, row['Metric'], value_label, va='center', ha='left')
+
+    # Decorations
+    ax.axvline(33, color='lightgray', linestyle='--')
+    ax.axvline(67, color='lightgray', linestyle='--')
+    ax.set_title("Percentile Rankings (Fangraphs)", fontsize=20)
+    ax.set_xlabel("Percentile")
+    ax.spines['right'].set_visible(False)
+    ax.set_xlim(0, 100)
+
+    # Adjust layout for a better fit (important for tight layouts)
+    if ax is None:
+        plt.tight_layout()
+        plt.subplots_adjust(left=0.05, right=0.95, top=0.95, bottom=0.05)  # Fine-tuned margins
+        plt.show()
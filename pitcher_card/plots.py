@@ -0,0 +1,342 @@
+# Velocity distributions and pitch movement
+import math
+import os
+
+import matplotlib.colors as mcolors
+import matplotlib.gridspec as gridspec
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.collections import EllipseCollection
+from matplotlib.patches import Ellipse
+from matplotlib.ticker import FuncFormatter
+
+from .baseline import LeagueBaseline, league_baseline
+from .kde import density_polygon, velocity_densities, velocity_grid
+from .palette import dict_color
+from .style import font_properties, font_properties_axes, font_properties_titles
+
+def velocity_kdes(df: pd.DataFrame,
+                  ax: plt.Axes,
+                  gs: gridspec,
+                  gs_x: list,
+                  gs_y: list,
+                  fig: plt.Figure,
+                  baseline: LeagueBaseline = None,
+                  league_overlay: bool = True):
+    if baseline is None:
+        baseline = league_baseline()
+    pitcher_hand = df['p_throws'].iloc[0]
+
+    # Get the count of each pitch type and sort them in descending order
+    sorted_value_counts = df['pitch_type'].value_counts().sort_values(ascending=False)
+
+    # Get the list of pitch types ordered from most to least frequent
+    items_in_order = sorted_value_counts.index.tolist()
+
+    # Every pitch type's velocity density from one binned pass, and the league averages
+    df_velocity, densities = velocity_densities(df, items_in_order)
+    league_speeds = baseline.values('release_speed', items_in_order, pitcher_hand)
+
+    # Turn off the axis and set the title for the main plot
+    ax.axis('off')
+    ax.set_title('Pitch Velocity Distribution', fontdict={'size': 20})
+
+    # Create a grid for the inner subplots
+    inner_grid_1 = gridspec.GridSpecFromSubplotSpec(len(items_in_order), 1, subplot_spec=gs[gs_x[0]:gs_x[-1], gs_y[0]:gs_y[-1]])
+    ax_top = []
+
+    # Create subplots for each pitch type
+    for inner in inner_grid_1:
+        ax_top.append(fig.add_subplot(inner))
+
+    ax_number = 0
+
+    # Loop through each pitch type and plot the velocity distribution
+    for i, row, density, league_speed in zip(items_in_order, df_velocity.itertuples(), densities, league_speeds):
+        color = dict_color[i]
+        # Check if all release speeds for the pitch type are the same
+        if row.min == row.max:
+            # Plot a single line if all values are the same
+            ax_top[ax_number].plot([row.min, row.min], [0, 1], linewidth=4, color=color, zorder=20)
+        else:
+            # Fill the density between the slowest and fastest pitch
+            x, y = density_polygon(density, row.min, row.max)
+            artist = ax_top[ax_number].fill_between(x, 0, y, facecolor=mcolors.to_rgba(color, 0.25),
+                                                    edgecolor=mcolors.to_rgba(color, 1))
+            artist.sticky_edges.y[:] = (0, np.inf)
+
+        # Plot the mean release speed for the current data, over the full height of the row
+        # whatever the league overlay adds to its limits
+        ax_top[ax_number].axvline(row.mean, color=color, linestyle='--')
+
+        # Overlay the league distribution of the pitch type, or its mean when there is no histogram
+        league_density = baseline.velocity_density(i, pitcher_hand) if league_overlay else None
+        if league_density is not None:
+            ax_top[ax_number].plot(velocity_grid, league_density, color=color, linestyle=':')
+        else:
+            ax_top[ax_number].axvline(league_speed, color=color, linestyle=':')
+
+        # Set the x-axis limits
+        ax_top[ax_number].set_xlim(math.floor(df['release_speed'].min() / 5) * 5, math.ceil(df['release_speed'].max() / 5) * 5)
+        ax_top[ax_number].set_xlabel('')
+        ax_top[ax_number].set_ylabel('')
+
+        # Hide the top, right, and left spines for all but the last subplot
+        if ax_number < len(items_in_order) - 1:
+            ax_top[ax_number].spines['top'].set_visible(False)
+            ax_top[ax_number].spines['right'].set_visible(False)
+            ax_top[ax_number].spines['left'].set_visible(False)
+            ax_top[ax_number].tick_params(axis='x', colors='none')
+
+        # Set the x-ticks and y-ticks
+        ax_top[ax_number].set_xticks(range(math.floor(df['release_speed'].min() / 5) * 5, math.ceil(df['release_speed'].max() / 5) * 5, 5))
+        ax_top[ax_number].set_yticks([])
+        ax_top[ax_number].grid(axis='x', linestyle='--')
+
+        # Add text label for the pitch type
+        ax_top[ax_number].text(-0.01, 0.5, i, transform=ax_top[ax_number].transAxes,
+                               fontsize=14, va='center', ha='right')
+        ax_number += 1
+
+    # Hide the top, right, and left spines for the last subplot
+    ax_top[-1].spines['top'].set_visible(False)
+    ax_top[-1].spines['right'].set_visible(False)
+    ax_top[-1].spines['left'].set_visible(False)
+
+    # Set the x-ticks and x-label for the last subplot
+    ax_top[-1].set_xticks(list(range(math.floor(df['release_speed'].min() / 5) * 5, math.ceil(df['release_speed'].max() / 5) * 5, 5)))
+    ax_top[-1].set_xlabel('Velocity (mph)')
+
+# Above this many pitches break_plot switches to its high-volume mode, so the panel costs
+# the same for a full starter's season as for a reliever's month
+break_plot_max_pitches = int(os.environ.get('BREAK_PLOT_MAX_PITCHES', 2000))
+
+# 'sample' draws a stratified sample of each pitch type, 'density' draws density contours
+break_plot_high_volume_mode = os.environ.get('BREAK_PLOT_HIGH_VOLUME_MODE', 'sample')
+
+# Movement grid of the density contours, in inches
+movement_grid_edges = np.arange(-25, 26, 1.0)
+movement_grid_bandwidth = 1.5
+
+def covariance_ellipses(x: np.ndarray, y: np.ndarray, codes: np.ndarray, n_groups: int):
+    # Centre, 2 standard deviation axes and angle of every group's covariance ellipse,
+    # from one pass of sums and one batched eigen decomposition
+    counts = np.bincount(codes, minlength=n_groups).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.bincount(codes, weights=x, minlength=n_groups) / counts
+        mean_y = np.bincount(codes, weights=y, minlength=n_groups) / counts
+        dx = x - mean_x[codes]
+        dy = y - mean_y[codes]
+        cov = np.empty((n_groups, 2, 2))
+        cov[:, 0, 0] = np.bincount(codes, weights=dx * dx, minlength=n_groups) / (counts - 1)
+        cov[:, 1, 1] = np.bincount(codes, weights=dy * dy, minlength=n_groups) / (counts - 1)
+        cov[:, 0, 1] = cov[:, 1, 0] = np.bincount(codes, weights=dx * dy, minlength=n_groups) / (counts - 1)
+
+    # Groups with fewer than two points have no covariance
+    valid = (counts >= 2) & np.isfinite(cov).all(axis=(1, 2))
+    eigenvalues, eigenvectors = np.linalg.eigh(cov[valid])
+    eigenvalues = np.sqrt(np.clip(eigenvalues, 0, None))
+    return pd.DataFrame({'x': mean_x[valid], 'y': mean_y[valid],
+                         'width': eigenvalues[:, 1] * 4, 'height': eigenvalues[:, 0] * 4,
+                         'angle': np.degrees(np.arctan2(eigenvectors[:, 1, 1], eigenvectors[:, 0, 1]))},
+                        index=np.flatnonzero(valid))
+
+def draw_ellipses(ax: plt.Axes, ellipses: pd.DataFrame, colors: list, alpha: float = 0.2, zorder: int = 1):
+    # Every ellipse in one collection
+    if ellipses.empty:
+        return
+    rgba = [mcolors.to_rgba(colors[i], alpha) for i in ellipses.index]
+    ax.add_collection(EllipseCollection(ellipses['width'].to_numpy(), ellipses['height'].to_numpy(),
+                                        ellipses['angle'].to_numpy(),
+                                        units='xy', offsets=ellipses[['x', 'y']].to_numpy(),
+                                        offset_transform=ax.transData, facecolors=rgba, edgecolors=rgba,
+                                        linewidths=1.5, zorder=zorder))
+
+def add_ellipse(ax, x, y, color, label):
+    if len(x) < 2:
+        return  # skip if not enough points to compute covariance
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    draw_ellipses(ax, covariance_ellipses(x, y, np.zeros(len(x), dtype=int), 1), [color])
+
+def stratified_sample(codes: np.ndarray, n_groups: int, max_points: int, seed: int = 0):
+    # Positions of a sample of at most max_points in which every group keeps its share,
+    # and small groups keep at least a few points. Seeded so a card always renders the same.
+    counts = np.bincount(codes, minlength=n_groups)
+    quotas = np.maximum(np.round(counts * max_points / max(len(codes), 1)), np.minimum(counts, 10))
+
+    # Rank the points of each group in a random order and keep the first ones
+    order = np.lexsort((np.random.default_rng(seed).random(len(codes)), codes))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranks = np.empty(len(codes), dtype=int)
+    ranks[order] = np.arange(len(codes)) - starts[codes[order]]
+    return np.flatnonzero(ranks < quotas[codes])
+
+def movement_densities(x: np.ndarray, y: np.ndarray, codes: np.ndarray, n_groups: int):
+    # Every group's 2D movement histogram on the fixed grid, smoothed in one batched FFT pass
+    n_bins = len(movement_grid_edges) - 1
+    inside = (x >= movement_grid_edges[0]) & (x < movement_grid_edges[-1]) & \
+             (y >= movement_grid_edges[0]) & (y < movement_grid_edges[-1])
+    ix = ((x[inside] - movement_grid_edges[0]) // 1).astype(int)
+    iy = ((y[inside] - movement_grid_edges[0]) // 1).astype(int)
+    counts = np.bincount((codes[inside] * n_bins + iy) * n_bins + ix,
+                         minlength=n_groups * n_bins * n_bins).reshape(n_groups, n_bins, n_bins)
+
+    # Gaussian smoothing with the kernel's closed-form transform, padded against wrap-around
+    n_fft = n_bins + int(np.ceil(4 * movement_grid_bandwidth))
+    fy = np.fft.fftfreq(n_fft)[:, None]
+    fx = np.fft.rfftfreq(n_fft)[None, :]
+    kernel = np.exp(-2 * (np.pi * movement_grid_bandwidth) ** 2 * (fx ** 2 + fy ** 2))
+    smoothed = np.fft.irfft2(np.fft.rfft2(counts, s=(n_fft, n_fft)) * kernel, s=(n_fft, n_fft))
+    return np.clip(smoothed[:, :n_bins, :n_bins], 0, None)
+
+def draw_movement_densities(ax: plt.Axes, x: np.ndarray, y: np.ndarray, codes: np.ndarray, colors: list):
+    # Filled contours at fixed fractions of each pitch type's peak density
+    centres = (movement_grid_edges[:-1] + movement_grid_edges[1:]) / 2
+    for density, color in zip(movement_densities(x, y, codes, len(colors)), colors):
+        peak = density.max()
+        if peak == 0:
+            continue
+        ax.contourf(centres, centres, density / peak, levels=[0.15, 0.5, 1.01],
+                    colors=[mcolors.to_rgba(color, 0.35), mcolors.to_rgba(color, 0.7)], zorder=2)
+        ax.contour(centres, centres, density / peak, levels=[0.15], colors=[color], linewidths=1, zorder=2)
+
+def draw_pitches(ax: plt.Axes, x: np.ndarray, y: np.ndarray, codes: np.ndarray, colors: list):
+    # The markers seaborn's scatterplot drew, without building a hue mapping and legend
+    size = plt.rcParams['lines.markersize'] ** 2
+    ax.scatter(x, y, s=size, c=mcolors.to_rgba_array(colors)[codes], ec='black',
+               linewidths=0.08 * np.sqrt(size), alpha=1, zorder=2)
+
+def integer_tick(x, pos):
+    # Tick label formatter of the break plot, a module function so drawn cards can be copied
+    return int(x)
+
+def break_plot(df: pd.DataFrame, ax: plt.Axes, baseline: LeagueBaseline = None,
+               max_pitches: int = None, high_volume_mode: str = None):
+    if max_pitches is None:
+        max_pitches = break_plot_max_pitches
+    if high_volume_mode is None:
+        high_volume_mode = break_plot_high_volume_mode
+
+    # Movement in plot coordinates, horizontal break flipped for right-handers
+    flip = -1 if df['p_throws'].values[0] == 'R' else 1
+    x = df['pfx_x'].to_numpy(dtype=float) * flip
+    y = df['pfx_z'].to_numpy(dtype=float)
+    categories = pd.Categorical(df['pitch_type'])
+    valid = (categories.codes >= 0) & ~np.isnan(x) & ~np.isnan(y)
+    x, y, codes = x[valid], y[valid], categories.codes[valid].astype(np.int64)
+    colors = [dict_color.get(pitch_type, 'gray') for pitch_type in categories.categories]
+
+    if len(x) <= max_pitches:
+        # Every pitch as a black-edged marker, in one collection
+        draw_pitches(ax, x, y, codes, colors)
+    else:
+        # High volume: a sample or the density of each pitch type, with the pitcher's own
+        # covariance ellipses summarising every pitch
+        if high_volume_mode == 'density':
+            draw_movement_densities(ax, x, y, codes, colors)
+        else:
+            keep = stratified_sample(codes, len(colors), max_pitches)
+            draw_pitches(ax, x[keep], y[keep], codes[keep], colors)
+        draw_ellipses(ax, covariance_ellipses(x, y, codes, len(colors)), colors)
+
+    # Add league average ellipses for reference
+    if baseline is not None:
+        pitcher_hand = df['p_throws'].iloc[0]
+        pitch_types = df['pitch_type'].unique()
+
+        for pitch_type, (league_x, league_y) in zip(pitch_types, baseline.movement(pitch_types, pitcher_hand)):
+            if np.isnan(league_x) and np.isnan(league_y):
+                continue
+
+            # Flip horizontal for RHP to match plot orientation
+            league_x = -league_x if pitcher_hand == 'R' else league_x
+
+            color = dict_color.get(pitch_type, 'gray')
+
+            ell = Ellipse(
+                xy=(league_x, league_y),
+                width=7,        # make this bigger/smaller as needed
+                height=7,
+                angle=0,
+                edgecolor=color,
+                facecolor=color,
+                alpha=0.5,
+                lw=2,
+                zorder=0
+            )
+            ax.add_patch(ell)
+
+
+    # Draw horizontal and vertical lines at y=0 and x=0 respectively
+    ax.axhline(y=0, color='#808080', alpha=0.5, linestyle='--', zorder=1)
+    ax.axvline(x=0, color='#808080', alpha=0.5, linestyle='--', zorder=1)
+
+    # Set the labels for the x and y axes
+    ax.set_xlabel('Horizontal Break (in)', fontdict=font_properties_axes)
+    ax.set_ylabel('Induced Vertical Break (in)', fontdict=font_properties_axes)
+
+    # Add title and subtitle to plot
+    if 'arm_angle' in df.columns:
+        avg_angle = df['arm_angle'].mean()
+    
+        # Set plot title
+        title = f"Pitch Breaks - Arm Angle: {avg_angle:.0f}°"
+
+        # Set title with extra padding to make room for subtitle
+        ax.set_title(title, fontdict=font_properties_titles, pad=25)
+        
+        # Additional Note: MLB average movement ellipses
+        ax.text(0.5, 1.02, "Note: Ellipses = League average pitch movement",
+            transform=ax.transAxes,
+            ha='center',
+            fontsize=11,
+            style='italic',
+            color='dimgray',
+            zorder=4)
+
+    # Set the tick positions and labels for the x and y axes
+    ax.set_xticks(range(-20, 21, 10))
+    ax.set_xticklabels(range(-20, 21, 10), fontdict=font_properties)
+    ax.set_yticks(range(-20, 21, 10))
+    ax.set_yticklabels(range(-20, 21, 10), fontdict=font_properties)
+
+    # Set the limits for the x and y axes
+    ax.set_xlim((-25, 25))
+    ax.set_ylim((-25, 25))
+
+    # Add text annotations based on the pitcher's throwing hand
+    if df['p_throws'].values[0] == 'R':
+        ax.text(-24.2, -24.2, s='← Glove Side', fontstyle='italic', ha='left', va='bottom',
+                bbox=dict(facecolor='white', edgecolor='black'), fontsize=10, zorder=3)
+        ax.text(24.2, -24.2, s='Arm Side →', fontstyle='italic', ha='right', va='bottom',
+                bbox=dict(facecolor='white', edgecolor='black'), fontsize=10, zorder=3)
+
+    if df['p_throws'].values[0] == 'L':
+        ax.invert_xaxis()
+        ax.text(24.2, -24.2, s='← Arm Side', fontstyle='italic', ha='left', va='bottom',
+                bbox=dict(facecolor='white', edgecolor='black'), fontsize=10, zorder=3)
+        ax.text(-24.2, -24.2, s='Glove Side →', fontstyle='italic', ha='right', va='bottom',
+                bbox=dict(facecolor='white', edgecolor='black'), fontsize=10, zorder=3)
+        
+    # Add dashed arm angle line from the origin
+    if 'arm_angle' in df.columns and not df['arm_angle'].isnull().all():
+        mean_angle_deg = df['arm_angle'].mean()
+        mean_angle_rad = np.deg2rad(mean_angle_deg)  # Don't subtract from π
+
+        length = 35  # Length of the line
+
+        # Compute end coordinates regardless of throwing hand
+        x_end = length * np.cos(mean_angle_rad)
+        y_end = length * np.sin(mean_angle_rad)
+
+        ax.plot([0, x_end], [0, y_end], linestyle='--', color='black', alpha=0.7, label='Arm Angle')
+  
+    # Set the aspect ratio of the plot to be equal
+    ax.set_aspect('equal', adjustable='box')
+
+    # Format the x and y axis tick labels as integers
+    ax.xaxis.set_major_formatter(FuncFormatter(integer_tick))
+    ax.yaxis.set_major_formatter(FuncFormatter(integer_tick))
@@ -0,0 +1,163 @@
+# Daily pre-render of the cards of pitchers who pitched since the last run
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from .reference import refresh_pitcher_roster
+from .statcast import add_statcast_pitches, download_statcast, empty_statcast_frame
+from .store import load_pitch_store, pitch_store_dir, update_pitch_store
+
+# Run once a day at this local hour, when the previous day's games are final on Savant
+prerender_enabled = os.environ.get('PRERENDER', '1') == '1'
+prerender_hour = int(os.environ.get('PRERENDER_HOUR', 9))
+
+# Pre-renders run in their own low-priority processes so they never slow down interactive renders
+prerender_workers = int(os.environ.get('PRERENDER_WORKERS', 1))
+prerender_niceness = 10
+
+# The last covered date and report, and the lock file of the latest day so only one process runs it
+prerender_dir = os.environ.get('PRERENDER_DIR', os.path.join('.cache', 'prerender'))
+
+def _init_prerender_worker():
+    os.nice(prerender_niceness)
+
+def prerender_card(pitcher_id: int, stats: list, profile):
+    # Runs in a worker process: fetch the pitcher's new pitches and render the card unless
+    # it is current. Returns whether a render was needed.
+    from .app import get_dashboard_image_name
+    from .card_cache import card_cache
+    misses = card_cache.misses
+    get_dashboard_image_name(pitcher_id, stats, profile)
+    return card_cache.misses > misses
+
+def pitchers_with_new_pitches(start_dt: str, end_dt: str):
+    # One league query per day lists every pitch thrown. With a local store the days are
+    # written into it, which is the only fetch its pitchers need; without one, each pitcher's
+    # rows go into their own cache so their cards render without another Savant query.
+    # Returns the pitchers and the date ranges that could not be downloaded.
+    if os.path.isdir(pitch_store_dir):
+        result = update_pitch_store(start_dt, end_dt)
+        df = load_pitch_store(start_dt=start_dt, end_dt=end_dt, columns=['pitcher', 'game_type'])
+        # Chunks retried from earlier updates are the store's to report
+        failed = [(chunk_start, chunk_end) for chunk_start, chunk_end in result['failed']
+                  if start_dt <= chunk_start <= end_dt]
+    else:
+        csv_path = os.path.join(prerender_dir, 'new_pitches.csv')
+        os.makedirs(prerender_dir, exist_ok=True)
+        result = download_statcast(start_dt, end_dt, csv_path)
+        df = pd.read_csv(result['path']) if result['rows'] else empty_statcast_frame()
+        os.remove(result['path'])
+        failed = [(chunk_start.isoformat(), chunk_end.isoformat()) for chunk_start, chunk_end in result['failed']]
+    pitchers = sorted(int(pitcher) for pitcher in df.loc[df['game_type'] == 'R', 'pitcher'].dropna().unique())
+
+    if not os.path.isdir(pitch_store_dir):
+        # Rows after a failed day are merged too; the cache refetches anything it lacks
+        covered_end = (date.fromisoformat(failed[0][0]) - timedelta(days=1)).isoformat() if failed else end_dt
+        if covered_end >= start_dt:
+            for pitcher_id, df_pitcher in df[df['pitcher'].isin(pitchers)].groupby('pitcher'):
+                add_statcast_pitches(int(pitcher_id), df_pitcher, start_dt, covered_end)
+    return pitchers, failed
+
+def _state_path():
+    return os.path.join(prerender_dir, 'state.json')
+
+def load_prerender_state():
+    try:
+        with open(_state_path()) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def claim_prerender_day(day: date):
+    # Only the first process to ask runs the day's pre-render. The claim removes the locks of
+    # earlier days, whose runs every process has long since asked for.
+    os.makedirs(prerender_dir, exist_ok=True)
+    try:
+        os.close(os.open(os.path.join(prerender_dir, f'{day.isoformat()}.lock'), os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return False
+    for name in os.listdir(prerender_dir):
+        if name.endswith('.lock') and name < f'{day.isoformat()}.lock':
+            try:
+                os.remove(os.path.join(prerender_dir, name))
+            except FileNotFoundError:
+                pass
+    return True
+
+def run_prerender(end_dt: date = None, stats: list = None, profile=None):
+    # Pre-render the cards of every pitcher with pitches after the last covered date, up to
+    # yesterday, and report how many were rendered, skipped as current or failed
+    started = time.time()
+    end_dt = end_dt or date.today() - timedelta(days=1)
+    state = load_prerender_state()
+    start_dt = date.fromisoformat(state['end']) + timedelta(days=1) if 'end' in state else end_dt
+    report = {'start': start_dt.isoformat(), 'end': end_dt.isoformat(), 'pitchers': 0,
+              'rendered': 0, 'skipped': 0, 'failed': 0, 'failed_days': []}
+    covered_end = end_dt
+    if start_dt <= end_dt:
+        if stats is None:
+            from .app import stats
+        pitchers, failed_days = pitchers_with_new_pitches(start_dt.isoformat(), end_dt.isoformat())
+        report['pitchers'] = len(pitchers)
+        report['failed_days'] = failed_days
+        if failed_days:
+            # The next run starts again from the first day that could not be downloaded
+            covered_end = date.fromisoformat(failed_days[0][0]) - timedelta(days=1)
+        with ProcessPoolExecutor(max_workers=prerender_workers, initializer=_init_prerender_worker,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {pool.submit(prerender_card, pitcher_id, stats, profile): pitcher_id for pitcher_id in pitchers}
+            for future in as_completed(futures):
+                try:
+                    report['rendered' if future.result() else 'skipped'] += 1
+                except Exception as e:
+                    print(f"Could not pre-render the card for pitcher ID {futures[future]}: {e}")
+                    report['failed'] += 1
+
+        # New players join the roster, and those who pitched are looked up again in case they moved
+        try:
+            refresh_pitcher_roster(stale_ids=pitchers)
+        except Exception as e:
+            print(f"Could not refresh the pitcher roster: {e}")
+    report['seconds'] = round(time.time() - started, 1)
+
+    # Cards that failed are reported and render when first viewed; retrying them would
+    # re-download the dates of every later run for a card that may never render
+    state['end'] = max(covered_end, start_dt - timedelta(days=1)).isoformat()
+    state['report'] = report
+    os.makedirs(prerender_dir, exist_ok=True)
+    with open(_state_path() + '.tmp', 'w') as f:
+        json.dump(state, f)
+    os.replace(_state_path() + '.tmp', _state_path())
+    print(f"Pre-rendered {report['rendered']} cards, skipped {report['skipped']}, failed {report['failed']} "
+          f"for {report['start']} to {report['end']} in {report['seconds']}s")
+    if report['failed_days']:
+        print(f"Could not download Statcast for {', '.join(f'{start} to {end}' for start, end in report['failed_days'])}")
+    return report
+
+def _next_run(now: datetime):
+    run_at = now.replace(hour=prerender_hour, minute=0, second=0, microsecond=0)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+def _prerender_loop():
+    while True:
+        now = datetime.now()
+        time.sleep((_next_run(now) - now).total_seconds())
+        if claim_prerender_day(date.today()):
+            try:
+                run_prerender()
+            except Exception as e:
+                print(f"Pre-render failed: {e}")
+
+def start_prerender_scheduler():
+    # Wake up every day after the games are final, in one daemon thread per process
+    if not prerender_enabled:
+        return None
+    thread = threading.Thread(target=_prerender_loop, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,134 @@
+# Pitch-level flags and per-pitch-type aggregation
+import time
+
+import numpy as np
+import pandas as pd
+
+from .metrics import (compile_metrics, metric_values, pitch_metrics, pitch_sums, pitch_terms,
+                      swing_code, table_metrics)
+from .palette import dict_color, dict_pitch
+from .store import card_columns
+
+# Low-cardinality text columns stored as categories in compact mode
+categorical_columns = ['pitch_type', 'description', 'p_throws', 'type', 'game_type']
+
+# Pitch-level flags added to the processed frame, computed by the metric registry's terms
+pitch_flags = ['swing', 'whiff', 'in_zone', 'out_zone', 'chase']
+
+def df_processing(df_pyb: pd.DataFrame, compact: bool = False):
+    if compact:
+        # Keep only the columns the card uses, with categorical text and float32 numbers
+        df = df_pyb[[x for x in card_columns if x in df_pyb.columns]].copy()
+        for col in categorical_columns:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        float_columns = df.select_dtypes('float64').columns
+        df[float_columns] = df[float_columns].astype('float32')
+    else:
+        df = df_pyb.copy()
+
+    # Create new columns in the DataFrame to indicate swings, whiffs, in-zone, out-zone, and chase
+    for flag in pitch_flags:
+        df[flag] = pitch_terms[flag]['compute'](df)
+
+    # Convert the pitch type to a categorical variable
+    df['pfx_z'] = df['pfx_z'] * 12
+    df['pfx_x'] = df['pfx_x'] * 12
+    return df
+
+def benchmark_df_processing(n_pitches: int = 700_000, n_extra_columns: int = 70, seed: int = 0):
+    # Build a synthetic league-size Statcast frame: the card's columns plus filler columns
+    # so the frame is about as wide as a real ~90 column download
+    rng = np.random.default_rng(seed)
+    descriptions = swing_code + ['ball', 'called_strike', 'blocked_ball', 'hit_by_pitch']
+    df_bench = pd.DataFrame({
+        'game_date': pd.to_datetime('2025-04-01') + pd.to_timedelta(rng.integers(0, 180, n_pitches), unit='D'),
+        'game_pk': rng.integers(770000, 780000, n_pitches),
+        'at_bat_number': rng.integers(1, 80, n_pitches),
+        'pitch_number': rng.integers(1, 10, n_pitches),
+        'game_type': 'R',
+        'pitcher': rng.integers(600000, 700000, n_pitches),
+        'p_throws': rng.choice(['L', 'R'], n_pitches),
+        'pitch_type': rng.choice(list(dict_color), n_pitches),
+        'description': rng.choice(descriptions, n_pitches),
+        'type': rng.choice(['B', 'S', 'X'], n_pitches),
+        'zone': rng.integers(1, 15, n_pitches).astype(float),
+    })
+    for col in card_columns:
+        if col not in df_bench.columns:
+            df_bench[col] = rng.normal(size=n_pitches)
+    for i in range(n_extra_columns):
+        df_bench[f'extra_{i}'] = rng.normal(size=n_pitches) if i % 4 else rng.choice(['a', 'b', 'c'], n_pitches)
+
+    # Time each mode and measure the processed frame's memory footprint
+    results = []
+    for compact in [False, True]:
+        start = time.perf_counter()
+        df_out = df_processing(df_bench, compact=compact)
+        elapsed = time.perf_counter() - start
+        results.append({'mode': 'compact' if compact else 'full',
+                        'seconds': round(elapsed, 3),
+                        'memory_mb': round(df_out.memory_usage(deep=True).sum() / 1e6, 1),
+                        'columns': df_out.shape[1]})
+        del df_out
+    return pd.DataFrame(results)
+
+def df_grouping(df: pd.DataFrame, by_pitcher: bool = False, metrics: list = None):
+    # The table's metrics by default, always with the pitch count and usage
+    if metrics is None:
+        metrics = table_metrics
+    plan = compile_metrics(['pitch', 'pitch_usage'] + [x for x in metrics if x not in ('pitch', 'pitch_usage')])
+
+    # One table per pitcher when grouping a multi-pitcher frame (a staff or the league)
+    keys = ['pitcher', 'pitch_type'] if by_pitcher else ['pitch_type']
+
+    # Aggregate the plan's sums per pitch type in one pass. Pitches without a pitch type
+    # get their own group: they are left out of the pitch type rows but count towards "All".
+    sums = pitch_sums(df, plan).groupby([df[key] for key in keys], observed=True, dropna=False).sum()
+    has_type = sums.index.get_level_values('pitch_type').notna()
+
+    # Pitch usage is the share of the pitcher's pitches with a pitch type
+    type_sums = sums[has_type]
+    if by_pitcher:
+        pitch_totals = type_sums['pitch'].groupby(level='pitcher').transform('sum').to_numpy()
+    else:
+        pitch_totals = type_sums['pitch'].sum()
+
+    # Group by pitch type and aggregate the metrics
+    df_group = metric_values(type_sums, plan, pitch_totals).reset_index()
+
+    # Map pitch types to their descriptions
+    df_group['pitch_type'] = df_group['pitch_type'].astype(object)
+    df_group['pitch_description'] = df_group['pitch_type'].map(dict_pitch)
+
+    # Map pitch types to their colors
+    df_group['color'] = df_group['pitch_type'].map(dict_color)
+
+    # Sort the DataFrame by pitch usage in descending order
+    if by_pitcher:
+        df_group = df_group.sort_values(by=['pitcher', 'pitch_usage'], ascending=[True, False])
+    else:
+        df_group = df_group.sort_values(by='pitch_usage', ascending=False)
+    color_list = df_group['color'].tolist()
+
+    # The "All" summary rows are totals of the same sums, no further scans of the pitches.
+    # Metrics that only make sense per pitch type are left empty.
+    totals = sums.groupby(level='pitcher', dropna=False).sum() if by_pitcher else sums.sum().to_frame().T
+    plot_table_all = metric_values(totals, plan)
+    for name in plan['metrics']:
+        if not pitch_metrics[name]['summary']:
+            plot_table_all[name] = np.nan
+    plot_table_all.insert(0, 'pitch_type', 'All')
+    plot_table_all['pitch_description'] = 'All'
+
+    if by_pitcher:
+        # Each pitcher's summary row follows that pitcher's pitch type rows
+        plot_table_all = plot_table_all.rename_axis('pitcher').reset_index()
+        plot_table_all = plot_table_all[plot_table_all['pitcher'].notna()]
+        df_plot = pd.concat([df_group, plot_table_all], ignore_index=True)
+        df_plot = df_plot.sort_values(by='pitcher', kind='stable', ignore_index=True)
+    else:
+        # Concatenate the group DataFrame with the summary row DataFrame
+        df_plot = pd.concat([df_group, plot_table_all.reset_index(drop=True)], ignore_index=True)
+
+    return df_plot, color_list
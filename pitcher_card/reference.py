@@ -0,0 +1,293 @@
+# Reference tables shared by every render: league averages, the FanGraphs leaderboard and the roster
+import os
+import json
+import time
+import shutil
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .fangraphs import (_fangraphs_pinned, _fangraphs_snapshots, fangraphs_leaderboard, fangraphs_ttl_seconds,
+                        refresh_fangraphs_leaderboard)
+from .roster import _chadwick_snapshots, build_pitcher_roster, chadwick_snapshot
+
+# Directory holding the league average CSVs, by default the repository root
+league_data_dir = os.environ.get('LEAGUE_DATA_DIR', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Worker processes can share one read-only copy of the reference tables. Tables are
+# written once as Arrow IPC files (in /dev/shm when available) and memory-mapped by
+# every worker; a CURRENT file names the generation that readers should attach to.
+shared_tables_enabled = os.environ.get('SHARED_TABLES', '0') == '1'
+shared_tables_dir = os.environ.get('SHARED_TABLES_DIR',
+                                   '/dev/shm/mlb_pitcher_card' if os.path.isdir('/dev/shm')
+                                   else os.path.join('.cache', 'shared_tables'))
+
+# A publisher that stops touching its lock for this long is taken to have crashed; while
+# it builds, it touches the lock well within that time
+publish_lock_stale_seconds = 600
+publish_lock_touch_seconds = 60
+
+# How often each worker checks whether the published FanGraphs leaderboard is due a refresh
+shared_tables_check_seconds = 5 * 60
+
+# The attached generation and its tables for this process
+_attached_tables = {'generation': 0, 'tables': None}
+
+def _current_generation(root: str = shared_tables_dir):
+    try:
+        with open(os.path.join(root, 'CURRENT')) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return 0
+
+def acquire_publish_lock(root: str = shared_tables_dir, stale_seconds: int = publish_lock_stale_seconds):
+    # Only one process at a time builds and publishes the tables
+    os.makedirs(root, exist_ok=True)
+    lock_path = os.path.join(root, 'publish.lock')
+    try:
+        # A lock left behind by a crashed publisher is broken after a while
+        if time.time() - os.path.getmtime(lock_path) > stale_seconds:
+            os.remove(lock_path)
+    except FileNotFoundError:
+        pass
+    try:
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL))
+        return True
+    except FileExistsError:
+        return False
+
+def release_publish_lock(root: str = shared_tables_dir):
+    try:
+        os.remove(os.path.join(root, 'publish.lock'))
+    except FileNotFoundError:
+        pass
+
+def _touch_publish_lock(root: str, stop: threading.Event, interval: float):
+    while not stop.wait(interval):
+        try:
+            os.utime(os.path.join(root, 'publish.lock'))
+        except FileNotFoundError:
+            return
+
+def keep_publish_lock(root: str = shared_tables_dir, interval: float = publish_lock_touch_seconds):
+    # Keep a held lock fresh while a build that can outlast the stale cutoff runs (a cold
+    # roster build downloads the whole Chadwick register). Set the returned event to stop.
+    stop = threading.Event()
+    threading.Thread(target=_touch_publish_lock, args=(root, stop, interval), daemon=True).start()
+    return stop
+
+def publish_reference_tables(tables: dict, metadata: dict = None, root: str = shared_tables_dir, keep: int = 2):
+    # Write every table into a new generation directory
+    generation = _current_generation(root) + 1
+    generation_dir = os.path.join(root, f'gen-{generation}')
+    os.makedirs(generation_dir, exist_ok=True)
+    for name, df in tables.items():
+        table = pa.Table.from_pandas(df)
+        with pa.OSFile(os.path.join(generation_dir, f'{name}.arrow'), 'wb') as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    with open(os.path.join(generation_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata or {}, f)
+
+    # Swap the CURRENT pointer in one step so readers see either the old or the new generation
+    with open(os.path.join(root, 'CURRENT.tmp'), 'w') as f:
+        f.write(str(generation))
+    os.replace(os.path.join(root, 'CURRENT.tmp'), os.path.join(root, 'CURRENT'))
+
+    # Old generations can be removed, workers that still map them keep their pages until they move on
+    for old_dir in os.listdir(root):
+        if old_dir.startswith('gen-') and int(old_dir[4:]) <= generation - keep:
+            shutil.rmtree(os.path.join(root, old_dir), ignore_errors=True)
+    return generation
+
+def _arrow_strings(arrow_type):
+    # Text columns stay Arrow-backed so they keep pointing into the shared mapping
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+def attach_reference_tables(root: str = shared_tables_dir):
+    generation = _current_generation(root)
+    if generation == 0:
+        return None
+    if generation == _attached_tables['generation']:
+        return _attached_tables['tables']
+
+    generation_dir = os.path.join(root, f'gen-{generation}')
+    tables = {}
+    for file_name in os.listdir(generation_dir):
+        if file_name.endswith('.arrow'):
+            # Reading from a memory map is zero-copy, the buffers live in the shared pages
+            table = ipc.open_file(pa.memory_map(os.path.join(generation_dir, file_name), 'r')).read_all()
+            tables[file_name[:-len('.arrow')]] = table.to_pandas(types_mapper=_arrow_strings, split_blocks=True)
+    with open(os.path.join(generation_dir, 'metadata.json')) as f:
+        tables['metadata'] = json.load(f)
+
+    _attached_tables.update(generation=generation, tables=tables)
+    return tables
+
+def wait_for_reference_tables(root: str = shared_tables_dir, timeout: int = 600):
+    # Another worker is publishing, wait for it instead of building the tables again
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        tables = attach_reference_tables(root)
+        if tables is not None:
+            return tables
+        time.sleep(0.5)
+    return None
+
+# Tables this process currently uses, built on first use or taken from a shared generation
+_reference = {}
+_reference_lock = threading.Lock()
+_shared = {'tables': None}
+
+def _reference_table(name: str, build):
+    table = _reference.get(name)
+    if table is None:
+        # Concurrent first requests wait for one build instead of each starting their own
+        with _reference_lock:
+            table = _reference.get(name)
+            if table is None:
+                table = build()
+                _reference[name] = table
+    return table
+
+def league_statcast_group():
+    # 2025 league average metrics by pitch type
+    return _reference_table('df_statcast_group',
+                            lambda: pd.read_csv(os.path.join(league_data_dir, 'statcast_2025_grouped.csv')))
+
+def league_pitch_movement():
+    # 2025 league average movement by pitch type and handedness
+    return _reference_table('df_pitch_movement',
+                            lambda: pd.read_csv(os.path.join(league_data_dir, 'statcast_2025_pitch_movement.csv')))
+
+def league_velocity_histograms():
+    # 2025 league velocity histograms by pitch type and handedness, empty when the file is absent
+    def build():
+        path = os.path.join(league_data_dir, 'statcast_2025_velocity_hist.csv')
+        if not os.path.exists(path):
+            return pd.DataFrame({'pitch_type': pd.Series(dtype=object), 'p_throws': pd.Series(dtype=object),
+                                 'release_speed': pd.Series(dtype=float), 'count': pd.Series(dtype=float)})
+        return pd.read_csv(path)
+    return _reference_table('df_velocity_hist', build)
+
+def pitcher_roster():
+    # 2025 pitchers with their current team and level
+    return _reference_table('df_pitchers', lambda: build_pitcher_roster(season=2025))
+
+def refresh_pitcher_roster(stale_ids=None):
+    # Rebuild the roster from a new register snapshot, querying new players and `stale_ids`
+    # again, and publish it to the other workers when the tables are shared
+    df_pitchers = build_pitcher_roster(season=2025, refresh=True, stale_ids=stale_ids)
+    with _reference_lock:
+        _reference['df_pitchers'] = df_pitchers
+    if shared_tables_enabled and acquire_publish_lock():
+        _publish_with_lock()
+    return df_pitchers
+
+def reference_tables():
+    # The read-only tables every worker needs, in publishable form
+    return {
+        'df_fangraphs': fangraphs_leaderboard(season=2025),
+        'df_statcast_group': league_statcast_group(),
+        'df_pitch_movement': league_pitch_movement(),
+        'df_velocity_hist': league_velocity_histograms(),
+        'df_chadwick_2025': chadwick_snapshot(season=2025),
+        'df_pitchers': pitcher_roster(),
+    }
+
+def publish_current_reference_tables():
+    # Publish this process's tables as a new generation
+    tables = reference_tables()
+    metadata = {'fangraphs_fetched_at': _fangraphs_snapshots[2025][0], 'published_at': time.time()}
+    return publish_reference_tables(tables, metadata)
+
+def _use_shared_tables(tables: dict):
+    _shared['tables'] = tables
+    _reference['df_statcast_group'] = tables['df_statcast_group']
+    _reference['df_pitch_movement'] = tables['df_pitch_movement']
+    _reference['df_velocity_hist'] = tables['df_velocity_hist']
+    _reference['df_pitchers'] = tables['df_pitchers']
+    _chadwick_snapshots[2025] = tables['df_chadwick_2025']
+    # The publisher refreshes the leaderboard, this worker only moves to its new generation
+    _fangraphs_pinned.add(2025)
+    _fangraphs_snapshots[2025] = (tables['metadata']['fangraphs_fetched_at'], tables['df_fangraphs'])
+
+def sync_reference_tables():
+    # Switch to a newer published generation, if there is one
+    if not shared_tables_enabled:
+        return
+    tables = attach_reference_tables()
+    if tables is None or tables is _shared['tables']:
+        return
+    _use_shared_tables(tables)
+
+def _publish_with_lock():
+    # Build and publish from this worker while it holds the publish lock
+    stop = keep_publish_lock()
+    try:
+        return publish_current_reference_tables()
+    finally:
+        stop.set()
+        release_publish_lock()
+
+def _shared_fangraphs_stale(ttl: int):
+    tables = attach_reference_tables()
+    return tables is not None and time.time() - tables['metadata']['fangraphs_fetched_at'] >= ttl
+
+def refresh_shared_tables(ttl: int = fangraphs_ttl_seconds):
+    # Publish a generation with a fresh FanGraphs leaderboard once the published one is
+    # stale. Whichever worker takes the lock fetches it; the others pick up the generation.
+    if not _shared_fangraphs_stale(ttl) or not acquire_publish_lock():
+        return None
+    try:
+        # Another worker may have published while this one waited for the lock
+        if not _shared_fangraphs_stale(ttl):
+            release_publish_lock()
+            return None
+        refresh_fangraphs_leaderboard(2025)
+    except Exception as e:
+        # The published generation stays in use, the next check tries again
+        print(f"FanGraphs refresh failed, keeping the published tables: {e}")
+        release_publish_lock()
+        return None
+    return _publish_with_lock()
+
+def _publisher_loop():
+    while True:
+        time.sleep(shared_tables_check_seconds)
+        try:
+            refresh_shared_tables()
+        except Exception as e:
+            print(f"Publishing the reference tables failed: {e}")
+
+def start_reference_publisher():
+    # Every worker checks periodically, the publish lock lets only one of them publish
+    thread = threading.Thread(target=_publisher_loop, daemon=True)
+    thread.start()
+    return thread
+
+def init_reference_tables():
+    # Without sharing, every table is simply built by this process
+    if not shared_tables_enabled:
+        reference_tables()
+        return
+
+    # Attach to published tables, or claim the lock to build and publish them from this worker
+    tables = attach_reference_tables()
+    if tables is None:
+        if acquire_publish_lock():
+            # The worker holding the publish lock shares what it builds
+            _publish_with_lock()
+            tables = attach_reference_tables()
+        else:
+            tables = wait_for_reference_tables()
+
+    if tables is not None:
+        _use_shared_tables(tables)
+    else:
+        reference_tables()
+    start_reference_publisher()
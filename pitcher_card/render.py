@@ -0,0 +1,75 @@
+# Render profiles and image encoding of served cards
+import io
+import os
+
+from PIL import Image
+
+from .card import card_figsize
+from .style import figure_dpi
+
+# Each profile sets the resolution from the width the client displays (or a fixed dpi for
+# print) and the image format with its encoder settings:
+# png (compress_level), png8 (palette quantized, colors), webp and jpeg (quality) or svg
+render_profiles = {
+    'web': {'width': 1600, 'format': 'webp', 'quality': 90},
+    'retina': {'width': 3200, 'format': 'webp', 'quality': 85},
+    'print': {'dpi': 300, 'format': 'png', 'compress_level': 6},
+    'web_png': {'width': 1600, 'format': 'png8', 'colors': 256},
+}
+
+# Profile used by the web app
+default_render_profile = os.environ.get('CARD_RENDER_PROFILE', 'web')
+
+image_mime_types = {'png': 'image/png', 'png8': 'image/png', 'webp': 'image/webp',
+                    'jpeg': 'image/jpeg', 'svg': 'image/svg+xml'}
+
+def render_profile(profile):
+    # A profile by name, or a profile dict as it is
+    return render_profiles[profile] if isinstance(profile, str) else profile
+
+def profile_dpi(profile):
+    # Resolution that makes the card as wide as the profile's target width
+    profile = render_profile(profile)
+    if 'width' in profile:
+        return profile['width'] / card_figsize[0]
+    return profile.get('dpi', figure_dpi)
+
+def encode_figure(fig, profile=None):
+    # Encode the card for a profile, returning the bytes and their MIME type
+    profile = render_profile(default_render_profile if profile is None else profile)
+    image_format = profile.get('format', 'png')
+    dpi = profile_dpi(profile)
+    buf = io.BytesIO()
+    if image_format == 'svg':
+        fig.savefig(buf, format='svg', bbox_inches='tight')
+    elif image_format == 'png':
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight',
+                    pil_kwargs={'compress_level': profile.get('compress_level', 6)})
+    elif image_format == 'png8':
+        # Draw without compression, then reduce to a palette, which the card's flat colours
+        # survive well, and compress once
+        raw = io.BytesIO()
+        fig.savefig(raw, format='png', dpi=dpi, bbox_inches='tight', pil_kwargs={'compress_level': 0})
+        return encode_image(Image.open(raw), profile)
+    elif image_format in ('webp', 'jpeg'):
+        fig.savefig(buf, format=image_format, dpi=dpi, bbox_inches='tight',
+                    pil_kwargs={'quality': profile.get('quality', 90)})
+    else:
+        raise ValueError(f"Unknown image format {image_format!r}")
+    return buf.getvalue(), image_mime_types[image_format]
+
+def encode_image(image: Image.Image, profile=None):
+    # Encode a card already drawn to an image, such as one composed from tiles, for a profile
+    profile = render_profile(default_render_profile if profile is None else profile)
+    image_format = profile.get('format', 'png')
+    buf = io.BytesIO()
+    if image_format == 'png':
+        image.save(buf, format='PNG', compress_level=profile.get('compress_level', 6))
+    elif image_format == 'png8':
+        image = image.convert('RGB').quantize(colors=profile.get('colors', 256), method=Image.Quantize.FASTOCTREE)
+        image.save(buf, format='PNG', compress_level=profile.get('compress_level', 6))
+    elif image_format in ('webp', 'jpeg'):
+        image.convert('RGB').save(buf, format=image_format.upper(), quality=profile.get('quality', 90))
+    else:
+        raise ValueError(f"Cannot encode an image as {image_format!r}")
+    return buf.getvalue(), image_mime_types[image_format]
@@ -0,0 +1,127 @@
+# Background card renders in a process pool, shared by every client asking for the same card
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from .card_cache import card_cache
+
+# Processes rendering cards, and how many jobs may wait for one before new ones are refused
+render_workers = int(os.environ.get('RENDER_WORKERS', 2))
+render_queue_depth = int(os.environ.get('RENDER_QUEUE_DEPTH', 32))
+
+# Finished jobs are kept this long for their clients to pick up the result
+render_job_ttl = 10 * 60
+
+def render_card(pitcher_id: int, stats: list, profile):
+    # Runs in a worker process: render (or find in the card cache) and store the card
+    from .app import get_dashboard_image_name
+    return get_dashboard_image_name(pitcher_id, stats, profile)
+
+def counted_render(render, pitcher_id: int, stats: list, profile):
+    # Runs in a worker process: the card's name and the card cache lookups the render made
+    # there, which the server adds to its own counters
+    before = card_cache.lookups()
+    name = render(pitcher_id, stats, profile)
+    return name, [after - count for after, count in zip(card_cache.lookups(), before)]
+
+def render_job_key(pitcher_id: int, stats: list, profile):
+    # Requests for the same card share one job
+    return json.dumps([int(pitcher_id), list(stats), profile], sort_keys=True, default=str)
+
+class RenderJob:
+    def __init__(self, key: str, future):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.future = future
+        # Clients waiting for the card; a job nobody waits for any more is cancelled
+        self.clients = 1
+        self.finished_at = None
+
+class RenderQueue:
+    # Jobs by ID and the in-flight job of each card. A client joins the in-flight job for
+    # its card instead of starting another render of it.
+    def __init__(self, workers: int = render_workers, max_depth: int = render_queue_depth, render=render_card):
+        self.workers = workers
+        self.max_depth = max_depth
+        # A module-level function, so the spawned workers can import it
+        self.render = render
+        self._executor = None
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        # Started on first use; spawned workers do not inherit the server's threads and locks
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def _finished(self, job: RenderJob):
+        with self._lock:
+            job.finished_at = time.time()
+            if self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+        if not job.future.cancelled() and job.future.exception() is None:
+            card_cache.add_lookups(*job.future.result()[1])
+
+    def _prune(self):
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > render_job_ttl:
+                del self._jobs[job_id]
+
+    def submit(self, pitcher_id: int, stats: list, profile=None):
+        # ID of the job rendering the card, or None when the queue is full
+        key = render_job_key(pitcher_id, stats, profile)
+        with self._lock:
+            self._prune()
+            job = self._in_flight.get(key)
+            # A job that just finished may not have left the in-flight jobs yet
+            if job is not None and not job.future.done():
+                job.clients += 1
+                return job.id
+            if len(self._in_flight) >= self.max_depth:
+                return None
+            job = RenderJob(key, self._pool().submit(counted_render, self.render, pitcher_id, stats, profile))
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+        job.future.add_done_callback(lambda _: self._finished(job))
+        return job.id
+
+    def status(self, job_id: str):
+        # ('pending' | 'done' | 'failed' | 'cancelled' | 'unknown', card name or error)
+        job = self._jobs.get(job_id)
+        if job is None:
+            return 'unknown', None
+        if not job.future.done():
+            return 'pending', None
+        if job.future.cancelled():
+            return 'cancelled', None
+        error = job.future.exception()
+        if error is not None:
+            return 'failed', error
+        return 'done', job.future.result()[0]
+
+    def cancel(self, job_id: str):
+        # The client moved on. A queued job no other client waits for is dropped, a
+        # running one finishes and its card stays in the card cache.
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.future.done():
+                return False
+            job.clients -= 1
+            if job.clients > 0:
+                return False
+        return job.future.cancel()
+
+    def counters(self):
+        with self._lock:
+            return {'in_flight': len(self._in_flight), 'jobs': len(self._jobs), 'max_depth': self.max_depth}
+
+# The queue used by the web app
+render_queue = RenderQueue()
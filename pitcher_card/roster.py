@@ -0,0 +1,167 @@
+# Season roster: Chadwick register snapshot enriched with current team and level
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pybaseball as pyb
+import requests
+
+from .net import http_session
+
+# Compact current-season slices of the Chadwick register, stored as Parquet
+chadwick_cache_dir = os.environ.get('CHADWICK_CACHE_DIR', os.path.join('.cache', 'chadwick'))
+
+# The only register columns the dashboard uses
+chadwick_columns = ['key_mlbam', 'name_first', 'name_last', 'mlb_played_last']
+
+# Snapshots already loaded by this process
+_chadwick_snapshots = {}
+
+def build_chadwick_snapshot(season: int, path: str):
+    # Download the full register once and keep only the players active in the season
+    df = pyb.chadwick_register()
+    df = df[df['mlb_played_last'] == season]
+    df = df[df['key_mlbam'].notna() & (df['key_mlbam'] > 0)][chadwick_columns]
+    df = df.astype({'key_mlbam': 'int64', 'mlb_played_last': 'int64'}).reset_index(drop=True)
+    df['full_name'] = df['name_first'].fillna('') + ' ' + df['name_last'].fillna('')
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path + '.tmp')
+    os.replace(path + '.tmp', path)
+    return df
+
+def chadwick_snapshot(season: int = 2025, refresh: bool = False):
+    # Loaded on first use, from memory, then the Parquet snapshot, then the full register
+    if season in _chadwick_snapshots and not refresh:
+        return _chadwick_snapshots[season]
+
+    path = os.path.join(chadwick_cache_dir, f'chadwick_{season}.parquet')
+    if os.path.exists(path) and not refresh:
+        df = pq.read_table(path).to_pandas()
+    else:
+        df = build_chadwick_snapshot(season, path)
+    _chadwick_snapshots[season] = df
+    return df
+
+def _statsapi_json(session: requests.Session, url: str, retries: int = 3, backoff: float = 0.5, timeout: int = 10):
+    # Retry failed requests with exponential backoff
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+def _fetch_people_batch(session: requests.Session, batch_ids: list, retries: int, backoff: float):
+    ids_str = ",".join(map(str, batch_ids))
+    url = f"https://statsapi.mlb.com/api/v1/people?personIds={ids_str}&hydrate=currentTeam"
+    data = _statsapi_json(session, url, retries, backoff)
+
+    rows = []
+    for person in data.get('people', []):
+        team = person.get('currentTeam', {})
+        rows.append({
+            'key_mlbam': person['id'],
+            'team': team.get('name', 'Unknown'),
+            'team_id': team.get('id', None),
+            'position': person.get('primaryPosition', {}).get('name', 'Unknown'),
+        })
+    return rows
+
+def _fetch_team_level(session: requests.Session, team_id: int, retries: int, backoff: float):
+    team_data = _statsapi_json(session, f"https://statsapi.mlb.com/api/v1/teams/{team_id}", retries, backoff)
+    if 'teams' in team_data and team_data['teams']:
+        return team_data['teams'][0].get('sport', {}).get('name', 'Unknown')
+    return 'Unknown'
+
+def enrich_chadwick(df, batch_size=200, previous=None, known_ids=None, max_workers=8,
+                    retries=3, backoff=0.5, session=http_session):
+    df = df.copy()
+    ids = df['key_mlbam'].astype(int)
+
+    # Players already enriched in `previous` keep their values, by default all of them,
+    # so a refresh only queries new players and those passed outside `known_ids`
+    known = pd.DataFrame(columns=['team', 'position', 'team_level'])
+    if previous is not None:
+        known = previous.assign(key_mlbam=previous['key_mlbam'].astype(int)).drop_duplicates('key_mlbam')
+        known = known.set_index('key_mlbam')[['team', 'position', 'team_level']]
+        if known_ids is not None:
+            known = known[known.index.isin(pd.Index(known_ids).astype(int))]
+    query_ids = ids[~ids.isin(known.index)].drop_duplicates().tolist()
+
+    # Step 1: Batch-fetch person info (position and currentTeam ID) in parallel
+    batches = [query_ids[i:i + batch_size] for i in range(0, len(query_ids), batch_size)]
+    person_rows = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_fetch_people_batch, session, batch, retries, backoff): i
+                   for i, batch in enumerate(batches)}
+        for future in as_completed(futures):
+            try:
+                person_rows.extend(future.result())
+            except Exception as e:
+                print(f"Person batch {futures[future] + 1} failed: {e}")
+    people = pd.DataFrame(person_rows, columns=['key_mlbam', 'team', 'team_id', 'position'])
+
+    # Step 2: Fetch team level info by unique team IDs in parallel
+    team_ids = people['team_id'].dropna().astype(int).unique().tolist()
+    team_level_map = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_fetch_team_level, session, team_id, retries, backoff): team_id
+                   for team_id in team_ids}
+        for future in as_completed(futures):
+            team_id = futures[future]
+            try:
+                team_level_map[team_id] = future.result()
+            except Exception as e:
+                print(f"Team fetch failed for team_id {team_id}: {e}")
+                team_level_map[team_id] = 'Unknown'
+    people['team_level'] = people['team_id'].map(team_level_map)
+
+    # Step 3: Assign everything back to the DataFrame in one pass
+    info = pd.concat([known, people.drop_duplicates('key_mlbam').set_index('key_mlbam')[['team', 'position', 'team_level']]])
+    for column in ['team', 'position', 'team_level']:
+        df[column] = ids.map(info[column]).fillna('Unknown').values
+
+    return df
+
+def _roster_path(season: int):
+    return os.path.join(chadwick_cache_dir, f'roster_{season}.parquet')
+
+def build_pitcher_roster(season: int = 2025, refresh: bool = False, stale_ids=None):
+    # Enrich the register starting from the last enrichment stored for the season, so only
+    # players new to it are queried. A refresh takes a new register snapshot and also queries
+    # the players in `stale_ids` again, such as those who just pitched and may have moved.
+    path = _roster_path(season)
+    previous = pq.read_table(path).to_pandas() if os.path.exists(path) else None
+    known_ids = None
+    if previous is not None and stale_ids is not None:
+        known_ids = previous.loc[~previous['key_mlbam'].isin(list(stale_ids)), 'key_mlbam']
+    df_enriched = enrich_chadwick(chadwick_snapshot(season, refresh=refresh), previous=previous, known_ids=known_ids)
+
+    # Players whose lookup failed have no position and are left out, the next build asks again
+    stored = df_enriched[df_enriched['position'] != 'Unknown'][['key_mlbam', 'team', 'position', 'team_level']]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    pq.write_table(pa.Table.from_pandas(stored, preserve_index=False), tmp_path)
+    os.replace(tmp_path, path)
+
+    df_enriched['team_level'] = df_enriched['team_level'].replace({
+        'Major League Baseball': 'MLB',
+        'Triple-A': 'AAA',
+        'Double-A': 'AA',
+        'High-A': 'A+',
+        'Single-A': 'A',
+    })
+
+    # Sort the DataFrame by last name
+    df_enriched= df_enriched.sort_values('name_last')
+
+    # Only keep players listed as pitchers
+    return df_enriched[df_enriched['position'].str.contains("Pitcher", na=False)]
@@ -0,0 +1,227 @@
+# Statcast pitch data: an incremental per-pitcher cache and a chunked league downloader
+import io
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import pandas as pd
+import pybaseball as pyb
+import requests
+
+from .net import http_session
+
+# Directory holding one pitch file and one coverage file per pitcher
+statcast_cache_dir = os.environ.get('STATCAST_CACHE_DIR', os.path.join('.cache', 'statcast'))
+
+# Columns that uniquely identify a pitch
+pitch_key_columns = ['game_pk', 'at_bat_number', 'pitch_number']
+
+# Today's games may still be in progress: today's pitches are fetched again only after this long
+statcast_today_ttl_seconds = int(os.environ.get('STATCAST_TODAY_TTL_SECONDS', 15 * 60))
+
+def empty_statcast_frame():
+    # No pitches, with the columns and types of the card's pitch data
+    from .store import pitch_store_schema
+    df = pitch_store_schema.empty_table().to_pandas()
+    df['game_date'] = pd.to_datetime(df['game_date'])
+    return df
+
+def _missing_date_ranges(start_dt: date, end_dt: date, covered: dict):
+    if start_dt > end_dt:
+        return []
+    # Nothing cached yet, so the whole range is missing
+    if not covered:
+        return [(start_dt, end_dt)]
+
+    covered_start = date.fromisoformat(covered['start'])
+    covered_end = date.fromisoformat(covered['end'])
+
+    # Only the edges outside of the covered range need to be fetched
+    # Fetched ranges always touch the covered range so the coverage stays contiguous
+    ranges = []
+    if start_dt < covered_start:
+        ranges.append((start_dt, covered_start - timedelta(days=1)))
+    if end_dt > covered_end:
+        ranges.append((covered_end + timedelta(days=1), end_dt))
+    return ranges
+
+def _merge_pitches(frames: list):
+    # Merge old and new pitches, keeping the freshest copy of any duplicate pitch
+    df_all = pd.concat(frames, ignore_index=True) if frames else empty_statcast_frame()
+    if not df_all.empty:
+        df_all['game_date'] = pd.to_datetime(df_all['game_date'])
+        df_all = df_all.drop_duplicates(subset=pitch_key_columns, keep='last')
+        df_all = df_all.sort_values(['game_date'] + pitch_key_columns[1:], ascending=False, ignore_index=True)
+    return df_all
+
+def _save_statcast_cache(data_path: str, meta_path: str, df_all: pd.DataFrame, start_dt: date, end_dt: date,
+                         covered: dict, fetched_at: float):
+    # Today's games may still be in progress, so never mark today as covered
+    last_final_day = date.today() - timedelta(days=1)
+    new_start = min([start_dt] + ([date.fromisoformat(covered['start'])] if covered else []))
+    new_end = max([min(end_dt, last_final_day)] + ([date.fromisoformat(covered['end'])] if covered else []))
+
+    # Write to temporary files first so readers never see a half-written cache
+    df_all.to_pickle(data_path + '.tmp')
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'start': new_start.isoformat(), 'end': new_end.isoformat(), 'fetched_at': fetched_at}, f)
+    os.replace(data_path + '.tmp', data_path)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def _load_statcast_cache(data_path: str, meta_path: str):
+    # The cached pitches and the date range they cover
+    if os.path.exists(data_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            covered = json.load(f)
+        return pd.read_pickle(data_path), covered
+    return None, {}
+
+def cached_statcast_pitcher(start_dt: str, end_dt: str, pitcher_id: int, cache_dir: str = statcast_cache_dir):
+    start_dt, end_dt = date.fromisoformat(start_dt), date.fromisoformat(end_dt)
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path = os.path.join(cache_dir, f'{pitcher_id}.pkl')
+    meta_path = os.path.join(cache_dir, f'{pitcher_id}.json')
+
+    df_cached, covered = _load_statcast_cache(data_path, meta_path)
+
+    # Fetch only the dates that are not covered yet (typically just the latest games). Dates
+    # after today have no games, and today alone is refetched once its last fetch is stale.
+    today = date.today()
+    frames = [] if df_cached is None else [df_cached]
+    missing = _missing_date_ranges(start_dt, min(end_dt, today), covered)
+    if (missing == [(today, today)] and df_cached is not None
+            and time.time() - covered.get('fetched_at', 0) < statcast_today_ttl_seconds):
+        missing = []
+    for fetch_start, fetch_end in missing:
+        df_new = pyb.statcast_pitcher(fetch_start.isoformat(), fetch_end.isoformat(), pitcher_id)
+        if df_new is not None and not df_new.empty:
+            frames.append(df_new)
+
+    if missing:
+        df_all = _merge_pitches(frames)
+        _save_statcast_cache(data_path, meta_path, df_all, start_dt, end_dt, covered, time.time())
+    elif df_cached is None:
+        # Nothing cached and nothing to fetch, as for a range after today
+        return empty_statcast_frame()
+    else:
+        df_all = df_cached
+
+    if df_all.empty:
+        # Caches written before the empty frame kept the schema have no columns
+        return df_all if len(df_all.columns) else empty_statcast_frame()
+
+    # Return only the pitches inside the requested date range
+    in_range = df_all['game_date'].between(pd.Timestamp(start_dt), pd.Timestamp(end_dt))
+    return df_all[in_range].reset_index(drop=True)
+
+def add_statcast_pitches(pitcher_id: int, df_new: pd.DataFrame, start_dt: str, end_dt: str,
+                         cache_dir: str = statcast_cache_dir):
+    # Merge a pitcher's pitches for the date range, taken from a league download, into the
+    # pitcher's cache so the next card render has nothing to fetch for those days. A range
+    # that would leave a gap after the covered dates is left for the render to fetch.
+    start_dt, end_dt = date.fromisoformat(start_dt), date.fromisoformat(end_dt)
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path = os.path.join(cache_dir, f'{pitcher_id}.pkl')
+    meta_path = os.path.join(cache_dir, f'{pitcher_id}.json')
+    df_cached, covered = _load_statcast_cache(data_path, meta_path)
+    if covered and (start_dt > date.fromisoformat(covered['end']) + timedelta(days=1)
+                    or end_dt < date.fromisoformat(covered['start']) - timedelta(days=1)):
+        return False
+
+    # Today's pitches keep their own fetch time
+    frames = ([] if df_cached is None else [df_cached]) + [df_new]
+    _save_statcast_cache(data_path, meta_path, _merge_pitches(frames), start_dt, end_dt, covered,
+                         covered.get('fetched_at', 0))
+    return True
+
+# Baseball Savant search endpoint (the same one pybaseball queries)
+savant_csv_url = 'https://baseballsavant.mlb.com/statcast_search/csv'
+
+def statcast_date_chunks(start_dt: str, end_dt: str, chunk_days: int = 1):
+    # Split the date range into consecutive chunks of `chunk_days` days
+    start_dt, end_dt = date.fromisoformat(start_dt), date.fromisoformat(end_dt)
+    chunks = []
+    while start_dt <= end_dt:
+        chunk_end = min(start_dt + timedelta(days=chunk_days - 1), end_dt)
+        chunks.append((start_dt, chunk_end))
+        start_dt = chunk_end + timedelta(days=1)
+    return chunks
+
+def fetch_statcast_chunk(session: requests.Session, chunk: tuple, pitcher_id: int = None,
+                         base_url: str = savant_csv_url, retries: int = 3, backoff: float = 1.0, timeout: int = 60):
+    # Query parameters for one chunk of pitch-level data
+    params = {
+        'all': 'true',
+        'type': 'details',
+        'player_type': 'pitcher',
+        'hfGT': 'R|PO|',
+        'game_date_gt': chunk[0].isoformat(),
+        'game_date_lt': chunk[1].isoformat(),
+        'min_pitches': 0,
+        'min_results': 0,
+        'group_by': 'name',
+        'sort_col': 'pitches',
+        'sort_order': 'desc',
+    }
+    if pitcher_id is not None:
+        params['pitchers_lookup[]'] = pitcher_id
+
+    # Retry failed requests with exponential backoff
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(base_url, params=params, timeout=timeout)
+            response.raise_for_status()
+            if not response.text.strip():
+                return pd.DataFrame()
+            return pd.read_csv(io.StringIO(response.text), low_memory=False)
+        except (requests.RequestException, pd.errors.ParserError):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+def download_statcast(start_dt: str, end_dt: str, out_path: str, pitcher_id: int = None,
+                      chunk_days: int = None, max_workers: int = 4, retries: int = 3,
+                      base_url: str = savant_csv_url, session: requests.Session = http_session):
+    # League-wide pulls use daily chunks to stay under Savant's row limit,
+    # single pitchers fit comfortably into weekly chunks
+    if chunk_days is None:
+        chunk_days = 1 if pitcher_id is None else 7
+    chunks = statcast_date_chunks(start_dt, end_dt, chunk_days)
+
+    columns = None
+    rows = 0
+    failed = []
+    tmp_path = out_path + '.tmp'
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool, open(tmp_path, 'w', newline='') as f:
+        futures = {pool.submit(fetch_statcast_chunk, session, chunk, pitcher_id, base_url, retries): chunk
+                   for chunk in chunks}
+
+        # Append each chunk to disk as soon as it arrives instead of holding the season in memory
+        for future in as_completed(futures):
+            chunk = futures.pop(future)
+            try:
+                df_chunk = future.result()
+            except Exception as e:
+                print(f"Statcast chunk {chunk[0]} to {chunk[1]} failed: {e}")
+                failed.append(chunk)
+                continue
+
+            if df_chunk.empty:
+                continue
+
+            # Use the first chunk's columns so every appended chunk lines up with the header
+            if columns is None:
+                columns = list(df_chunk.columns)
+                df_chunk.to_csv(f, index=False)
+            else:
+                df_chunk.reindex(columns=columns).to_csv(f, index=False, header=False)
+            rows += len(df_chunk)
+
+    # Only a complete download takes the output path. With failed chunks the rows that did
+    # arrive are kept next to it, and callers find them through 'path'.
+    path = out_path if not failed else out_path + '.partial'
+    os.replace(tmp_path, path)
+    return {'rows': rows, 'chunks': len(chunks), 'failed': sorted(failed), 'path': path}
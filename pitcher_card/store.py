@@ -0,0 +1,203 @@
+# Local Parquet store of league pitch data
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+from .statcast import cached_statcast_pitcher, download_statcast
+
+# Parquet files partitioned by game month and bucketed by pitcher, so one pitcher's
+# season is a handful of small files while a single day can still be replaced cheaply
+pitch_store_dir = os.environ.get('PITCH_STORE_DIR', os.path.join('.cache', 'pitch_store'))
+pitch_store_buckets = 16
+
+# Only the columns the card reads are stored, with a fixed schema so every partition lines up
+pitch_store_schema = pa.schema([
+    ('game_date', pa.string()),
+    ('game_pk', pa.int64()),
+    ('at_bat_number', pa.int32()),
+    ('pitch_number', pa.int32()),
+    ('game_type', pa.string()),
+    ('pitcher', pa.int64()),
+    ('p_throws', pa.string()),
+    ('pitch_type', pa.string()),
+    ('description', pa.string()),
+    ('type', pa.string()),
+    ('zone', pa.float64()),
+    ('release_speed', pa.float64()),
+    ('release_spin_rate', pa.float64()),
+    ('release_pos_x', pa.float64()),
+    ('release_pos_z', pa.float64()),
+    ('release_extension', pa.float64()),
+    ('pfx_x', pa.float64()),
+    ('pfx_z', pa.float64()),
+    ('delta_run_exp', pa.float64()),
+    ('estimated_woba_using_speedangle', pa.float64()),
+    ('arm_angle', pa.float64()),
+    ('vx0', pa.float64()),
+    ('vy0', pa.float64()),
+    ('vz0', pa.float64()),
+    ('ax', pa.float64()),
+    ('ay', pa.float64()),
+    ('az', pa.float64()),
+])
+pitch_store_partitioning = ds.partitioning(
+    pa.schema([('game_month', pa.string()), ('pitcher_bucket', pa.int32())]), flavor='hive')
+
+# Columns used by the card
+card_columns = pitch_store_schema.names
+
+# Dataset handles are reused until a writer, in any process, bumps the store's generation.
+# A leading underscore keeps the generation file out of the Parquet dataset.
+_pitch_store_datasets = {}
+
+def _generation_path(root: str):
+    return os.path.join(root, '_generation')
+
+def _bump_generation(root: str):
+    # A token unique to this write, so concurrent writers never leave the old one behind
+    path = _generation_path(root)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(f'{time.time_ns()}-{os.getpid()}-{threading.get_ident()}')
+    os.replace(tmp_path, path)
+
+def _read_generation(root: str):
+    try:
+        with open(_generation_path(root)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return ''
+
+def write_pitch_store(df: pd.DataFrame, root: str = pitch_store_dir, replace_dates: set = None):
+    # Conform the frame to the store schema, adding any missing column as nulls
+    df = df.reindex(columns=card_columns).copy()
+    df['game_date'] = pd.to_datetime(df['game_date']).dt.strftime('%Y-%m-%d')
+
+    # By default the written dates replace whatever was stored for them before
+    if replace_dates is None:
+        replace_dates = set(df['game_date'].unique())
+
+    game_month = df['game_date'].str[:7]
+    pitcher_bucket = df['pitcher'] % pitch_store_buckets
+    for (month, bucket), df_part in df.groupby([game_month, pitcher_bucket]):
+        part_dir = os.path.join(root, f'game_month={month}', f'pitcher_bucket={bucket}')
+        part_path = os.path.join(part_dir, 'part-0.parquet')
+        os.makedirs(part_dir, exist_ok=True)
+
+        # Merge with the rows already stored for this month and bucket
+        table = pa.Table.from_pandas(df_part, schema=pitch_store_schema, preserve_index=False)
+        if os.path.exists(part_path):
+            table_old = pq.read_table(part_path, schema=pitch_store_schema)
+            keep = pc.invert(pc.is_in(table_old['game_date'], pa.array(sorted(replace_dates), type=pa.string())))
+            table = pa.concat_tables([table_old.filter(keep), table])
+
+        # Sorting by pitcher keeps row group statistics tight for pitcher filters
+        table = table.sort_by([('pitcher', 'ascending'), ('game_date', 'ascending'),
+                               ('at_bat_number', 'ascending'), ('pitch_number', 'ascending')])
+        pq.write_table(table, part_path + '.tmp', row_group_size=8192)
+        os.replace(part_path + '.tmp', part_path)
+
+    # Readers in other processes discover the new partition files on their next load
+    _bump_generation(root)
+    _pitch_store_datasets.pop(os.path.abspath(root), None)
+
+def build_pitch_store(csv_path: str, root: str = pitch_store_dir, chunksize: int = 200_000):
+    # Load a downloaded Statcast CSV into the store without reading it all at once.
+    # A date replaces the stored one the first time it shows up, later rows of it are appended.
+    seen_dates = set()
+    for df_chunk in pd.read_csv(csv_path, chunksize=chunksize, low_memory=False):
+        df_chunk['game_date'] = pd.to_datetime(df_chunk['game_date']).dt.strftime('%Y-%m-%d')
+        new_dates = set(df_chunk['game_date'].unique()) - seen_dates
+        write_pitch_store(df_chunk, root, replace_dates=new_dates)
+        seen_dates |= new_dates
+
+def _failed_chunks_path(root: str):
+    # A leading underscore keeps the file out of the Parquet dataset
+    return os.path.join(root, '_failed_chunks.json')
+
+def load_failed_chunks(root: str = pitch_store_dir):
+    # Date ranges whose download failed and that the next update fetches again
+    try:
+        with open(_failed_chunks_path(root)) as f:
+            return [tuple(chunk) for chunk in json.load(f)]
+    except (FileNotFoundError, ValueError):
+        return []
+
+def update_pitch_store(start_dt: str, end_dt: str, root: str = pitch_store_dir, max_workers: int = 4):
+    # Download the league's pitches for the date range and write them into the store, along
+    # with any chunk that failed in an earlier update
+    ranges = [(start_dt, end_dt)] + [(chunk_start, chunk_end) for chunk_start, chunk_end in load_failed_chunks(root)
+                                     if chunk_end < start_dt or chunk_start > end_dt]
+    csv_path = os.path.abspath(root) + '_download.csv'
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    rows, chunks, failed = 0, 0, []
+    for range_start, range_end in ranges:
+        result = download_statcast(range_start, range_end, csv_path, max_workers=max_workers)
+        if result['rows']:
+            build_pitch_store(result['path'], root)
+        os.remove(result['path'])
+        rows += result['rows']
+        chunks += result['chunks']
+        failed += [(chunk_start.isoformat(), chunk_end.isoformat()) for chunk_start, chunk_end in result['failed']]
+
+    # Failed days stay out of the store until a later update fetches them
+    os.makedirs(root, exist_ok=True)
+    with open(_failed_chunks_path(root) + '.tmp', 'w') as f:
+        json.dump(sorted(failed), f)
+    os.replace(_failed_chunks_path(root) + '.tmp', _failed_chunks_path(root))
+    return {'rows': rows, 'chunks': chunks, 'failed': sorted(failed)}
+
+def _pitch_store_dataset(root: str):
+    root = os.path.abspath(root)
+    version = _read_generation(root)
+    cached = _pitch_store_datasets.get(root)
+    if cached is None or cached[0] != version:
+        # Memory-mapped reads avoid copying Parquet pages into the heap
+        dataset = ds.dataset(root, format='parquet', schema=pitch_store_schema.append(pa.field('game_month', pa.string()))
+                                                                          .append(pa.field('pitcher_bucket', pa.int32())),
+                             partitioning=pitch_store_partitioning,
+                             filesystem=pafs.LocalFileSystem(use_mmap=True))
+        cached = (version, dataset)
+        _pitch_store_datasets[root] = cached
+    return cached[1]
+
+def load_pitch_store(pitcher_id: int = None, start_dt: str = None, end_dt: str = None,
+                     columns: list = card_columns, root: str = pitch_store_dir):
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=columns)
+    dataset = _pitch_store_dataset(root)
+
+    # Partition filters prune whole files, the pitcher and date filters use row group statistics
+    filters = []
+    if pitcher_id is not None:
+        filters.append(ds.field('pitcher_bucket') == pitcher_id % pitch_store_buckets)
+        filters.append(ds.field('pitcher') == pitcher_id)
+    if start_dt is not None:
+        filters.append(ds.field('game_month') >= start_dt[:7])
+        filters.append(ds.field('game_date') >= start_dt)
+    if end_dt is not None:
+        filters.append(ds.field('game_month') <= end_dt[:7])
+        filters.append(ds.field('game_date') <= end_dt)
+    condition = None
+    for f in filters:
+        condition = f if condition is None else condition & f
+
+    df = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    if 'game_date' in df.columns:
+        df['game_date'] = pd.to_datetime(df['game_date'])
+    return df
+
+def load_pitcher_pitches(pitcher_id: int, start_dt: str, end_dt: str):
+    # Prefer the local store when a deployment keeps one, fall back to the per-pitcher cache
+    df = load_pitch_store(pitcher_id, start_dt, end_dt)
+    if df.empty:
+        df = cached_statcast_pitcher(start_dt, end_dt, pitcher_id)
+    return df
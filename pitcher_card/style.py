@@ -0,0 +1,27 @@
+# Plotting preferences shared by every panel of the card
+import matplotlib as mpl
+import seaborn as sns
+
+# Define font properties for general text
+font_properties = {'family': 'DejaVu Sans', 'size': 12}
+
+# Define font properties for titles
+font_properties_titles = {'family': 'DejaVu Sans', 'size': 20}
+
+# Define font properties for axes labels
+font_properties_axes = {'family': 'DejaVu Sans', 'size': 16}
+
+# Resolution of the figures
+figure_dpi = 300
+
+def apply_plot_style():
+    # Set the theme for seaborn plots
+    sns.set_theme(style='whitegrid',
+                  palette='deep',
+                  font='DejaVu Sans',
+                  font_scale=1.5,
+                  color_codes=True,
+                  rc=None)
+
+    # Set the resolution of the figures to 300 DPI
+    mpl.rcParams['figure.dpi'] = figure_dpi
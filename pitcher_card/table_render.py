@@ -0,0 +1,138 @@
+# Table renderer for the card: cells laid out arithmetically and drawn as a few collections
+import functools
+
+import matplotlib as mpl
+import matplotlib.colors as mcolors
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.cbook import is_math_text
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.font_manager import FontProperties, findfont, get_font
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath, text_to_path
+from matplotlib.transforms import Affine2D
+
+# Padding on each side of a cell's text, as a fraction of the text width (matplotlib's Cell.PAD)
+cell_padding = 0.1
+
+def _line_metrics(prop: FontProperties):
+    # Minimum ascent and descent of a line and the gap between lines, from the font's tables
+    # as matplotlib's Text uses them, in points
+    font = get_font(findfont(prop))
+    scale = prop.get_size_in_points() / font.get_sfnt_table('head')['unitsPerEm']
+    for table_name, gap_key, ascent_key, descent_key in [('OS/2', 'sTypoLineGap', 'sTypoAscender', 'sTypoDescender'),
+                                                         ('hhea', 'lineGap', 'ascent', 'descent')]:
+        table = font.get_sfnt_table(table_name)
+        if table is not None:
+            return table[ascent_key] * scale, -table[descent_key] * scale, table[gap_key] * scale
+    _, height, descent = text_to_path.get_text_width_height_descent('lp', prop, False)
+    return height - descent, descent, 0
+
+@functools.lru_cache(maxsize=4096)
+def text_path(text: str, prop: FontProperties):
+    # Outline of a cell text centred on the origin, in points, and its width. Headers are
+    # mathtext and the same few strings on every card, so each is parsed once per process.
+    lines = text.split('\n')
+    min_ascent, min_descent, line_gap = _line_metrics(prop)
+    if len(lines) == 1:
+        line_gap = 0
+
+    # Stack the lines as matplotlib's Text does, each centred horizontally
+    y = 0
+    placed = []
+    for line in lines:
+        width, height, descent = text_to_path.get_text_width_height_descent(line, prop, is_math_text(line)) if line else (0, 0, 0)
+        y -= max(height - descent, min_ascent) + line_gap / 2
+        placed.append((line, width, y))
+        y -= max(descent, min_descent) + line_gap / 2
+
+    # Centre the block vertically on the origin
+    paths = [TextPath((-width / 2, baseline - y / 2), line, prop=prop) for line, width, baseline in placed if line]
+    return Path.make_compound_path(*paths), max(width for _, width, _ in placed)
+
+class CellTable(Artist):
+    # A drop-in for the ax.table calls of the card: one collection for the cell backgrounds
+    # and edges and one per text style. Row 0 is the header, as in Table.get_celld().
+    def __init__(self, ax, cell_text: list, col_labels: list, bbox: list, col_widths: list = None,
+                 cell_colours: list = None, fontsize: float = 10, auto_font_size: bool = False,
+                 text_props: dict = None):
+        super().__init__()
+        self.axes = ax
+        self.set_figure(ax.figure)
+        self.set_transform(ax.transAxes)
+        self.set_clip_on(False)
+        self.texts = [list(col_labels)] + [[str(text) for text in row] for row in cell_text]
+        self.colours = [['w'] * len(col_labels)] + (list(cell_colours) if cell_colours is not None
+                                                    else [['w'] * len(col_labels) for _ in cell_text])
+        self.bbox = bbox
+        self.col_widths = np.asarray(col_widths if col_widths is not None else [1] * len(col_labels), dtype=float)
+        self.fontsize = fontsize
+        self.auto_font_size = auto_font_size
+        self.text_props = text_props or {}
+
+    def cell_edges(self):
+        # Columns share the width in proportion to col_widths, rows share the height equally
+        left, bottom, width, height = self.bbox
+        x_edges = left + np.concatenate([[0], np.cumsum(self.col_widths)]) / self.col_widths.sum() * width
+        y_edges = bottom + height - np.arange(len(self.texts) + 1) * height / len(self.texts)
+        return x_edges, y_edges
+
+    def _fitted_font_size(self):
+        # Like Table's auto font size: shrink every cell until the widest text, with its
+        # padding, fits the default column width of 1 / columns of the axes
+        fontsize = self.fontsize
+        column_points = self.axes.bbox.width / len(self.col_widths) * 72 / self.figure.dpi
+        for row in self.texts:
+            for text in row:
+                while (fontsize > 1 and text_path(text, FontProperties(size=fontsize))[1] * (1 + 2 * cell_padding)
+                       > column_points):
+                    fontsize -= 1
+        return fontsize
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        x_edges, y_edges = self.cell_edges()
+        n_rows, n_cols = len(self.texts), len(self.col_widths)
+        fontsize = self._fitted_font_size() if self.auto_font_size else self.fontsize
+
+        # Cell backgrounds and edges
+        left, right = np.tile(x_edges[:-1], n_rows), np.tile(x_edges[1:], n_rows)
+        top, bottom = np.repeat(y_edges[:-1], n_cols), np.repeat(y_edges[1:], n_cols)
+        verts = np.stack([np.column_stack([left, bottom]), np.column_stack([right, bottom]),
+                          np.column_stack([right, top]), np.column_stack([left, top])], axis=1)
+        cells = PolyCollection(verts, closed=True, transform=self.axes.transAxes,
+                               facecolors=[colour for row in self.colours for colour in row],
+                               edgecolors='k', linewidths=mpl.rcParams['patch.linewidth'])
+        cells.set_figure(self.figure)
+        cells.draw(renderer)
+
+        # Texts grouped by colour and weight, each group one collection of glyph outlines
+        centres_x = (x_edges[:-1] + x_edges[1:]) / 2
+        centres_y = (y_edges[:-1] + y_edges[1:]) / 2
+        styles = {}
+        for i, row in enumerate(self.texts):
+            for j, text in enumerate(row):
+                if not text:
+                    continue
+                props = self.text_props.get((i, j), {})
+                style = (mcolors.to_hex(props.get('color', mpl.rcParams['text.color'])), props.get('fontweight', 'normal'))
+                path = text_path(text, FontProperties(size=fontsize, weight=style[1]))[0]
+                styles.setdefault(style, ([], []))
+                styles[style][0].append(path)
+                styles[style][1].append((centres_x[j], centres_y[i]))
+
+        points_to_pixels = Affine2D().scale(renderer.points_to_pixels(1.0))
+        for (colour, _), (paths, offsets) in styles.items():
+            texts = PathCollection(paths, offsets=offsets, offset_transform=self.axes.transAxes,
+                                   facecolors=colour, edgecolors='none', linewidths=0)
+            texts.set_transform(points_to_pixels)
+            texts.set_figure(self.figure)
+            texts.draw(renderer)
+        self.stale = False
+
+def cell_table(ax, cell_text: list, col_labels: list, bbox: list, **kwargs):
+    # Add a CellTable to the axes, as ax.table would
+    table = CellTable(ax, cell_text, col_labels, bbox, **kwargs)
+    ax.add_artist(table)
+    return table
@@ -0,0 +1,117 @@
+# Pitch metric summary table
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .baseline import LeagueBaseline, league_baseline
+from .metrics import pitch_metrics, table_metrics
+from .processing import df_grouping
+from .table_render import cell_table
+
+# Header and number format of every metric in the registry
+pitch_stats_dict = {name: {'table_header': metric['table_header'], 'format': metric['format']}
+                    for name, metric in pitch_metrics.items()}
+
+# Columns shown in the table, chosen per deployment through the registry
+table_columns = ['pitch_description'] + table_metrics
+
+def plot_pitch_format(df: pd.DataFrame):
+    # Create a DataFrame for the summary row with aggregated statistics for all pitches
+    df_group = df[table_columns].fillna('—')
+
+    # Apply the formats to the DataFrame
+    # Iterate over each column in pitch_stats_dict
+    for column, props in pitch_stats_dict.items():
+        # Check if the column exists in df_plot
+        if column in df_group.columns:
+            # Apply the specified format to the column values
+            df_group[column] = df_group[column].apply(lambda x: format(x, props['format']) if isinstance(x, (int, float)) else x)
+    return df_group
+
+# Define color maps
+cmap_sum = matplotlib.colors.LinearSegmentedColormap.from_list("", ['#648FFF','#FFFFFF','#FFB000'])
+cmap_sum_r = matplotlib.colors.LinearSegmentedColormap.from_list("", ['#FFB000','#FFFFFF','#648FFF'])
+
+# List of statistics to color
+color_stats = [name for name, metric in pitch_metrics.items() if 'color' in metric]
+
+### GET COLORS ###
+# Two hex digits for every 0-255 channel value
+_hex_digits = np.array([format(i, '02x') for i in range(256)])
+
+def colors_to_hex(rgba: np.ndarray):
+    # mcolors.to_hex for a whole array of RGBA colours
+    channels = np.round(rgba[:, :3] * 255).astype(int)
+    return np.char.add(np.char.add(np.char.add('#', _hex_digits[channels[:, 0]]),
+                                   _hex_digits[channels[:, 1]]), _hex_digits[channels[:, 2]])
+
+def get_cell_colouts(df_group: pd.DataFrame,
+                     baseline: LeagueBaseline,
+                     color_stats: list,
+                     cmap_sum: matplotlib.colors.LinearSegmentedColormap,
+                     cmap_sum_r: matplotlib.colors.LinearSegmentedColormap,
+                     p_throws: str = 'R'):
+    df_rows = df_group.drop_duplicates('pitch_type')
+    pitch_types = df_rows['pitch_type'].to_numpy()
+    color_matrix = np.full((len(df_rows), len(table_columns)), '#ffffff', dtype=object)
+
+    # One colour scale and one colormap call per column
+    for j, tb in enumerate(table_columns):
+        if tb not in color_stats or df_rows[tb].dtype != np.float64:
+            continue
+        color = pitch_metrics[tb]['color']
+        values = df_rows[tb].to_numpy()
+        if 'range' in color:
+            vmin = np.full(len(values), color['range'][0], dtype=float)
+            vmax = np.full(len(values), color['range'][1], dtype=float)
+        elif baseline.has(tb):
+            # Compare with the league average of the pitch type
+            league_mean = baseline.values(tb, pitch_types, p_throws)
+            vmin = league_mean * color['league_range'][0]
+            vmax = league_mean * color['league_range'][1]
+        else:
+            # No league average for this metric, leave the cells uncoloured
+            continue
+
+        # Same scaling as mcolors.Normalize, an empty range maps to the bottom of the scale
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scaled = (values - vmin) / (vmax - vmin)
+        scaled[vmin == vmax] = 0
+        rgba = (cmap_sum_r if color.get('reverse') else cmap_sum)(scaled)
+        color_matrix[:, j] = np.where(np.isnan(values), '#ffffff', colors_to_hex(rgba))
+    return color_matrix.tolist()
+
+def pitch_table(df: pd.DataFrame, ax: plt.Axes,fontsize:int=20, baseline: LeagueBaseline = None):
+    if baseline is None:
+        baseline = league_baseline()
+    df_group, color_list = df_grouping(df)
+    color_list_df = get_cell_colouts(df_group, baseline, color_stats, cmap_sum, cmap_sum_r, p_throws=df['p_throws'].iloc[0])
+    df_plot = plot_pitch_format(df_group)
+
+    # Correctly format the new column names using LaTeX formatting
+    new_column_names = ['$\\bf{Pitch\\ Name}$'] + [pitch_stats_dict[x]['table_header'] if x in pitch_stats_dict else '---' for x in table_columns[1:]]
+
+    # Bold the first column in the table
+    text_props = {(i + 1, 0): {'fontweight': 'bold'} for i in range(len(df_plot))}
+
+    # Set the color for the first column, all rows except header and last
+    for i in range(1, len(df_plot)):
+        # Check if the pitch type is in the specified list
+        if df_plot['pitch_description'].iloc[i - 1] in ['Split-Finger', 'Slider', 'Changeup']:
+            text_props[(i, 0)]['color'] = '#000000'
+        else:
+            text_props[(i, 0)]['color'] = '#FFFFFF'
+        # Set the background color of the cell
+        color_list_df[i - 1][0] = color_list[i - 1]
+
+    # Draw the table with the DataFrame values and the new column names
+    cell_table(ax, cell_text=df_plot.values.tolist(), col_labels=new_column_names,
+               bbox=[0, -0.1, 1, 1],
+               col_widths=[2.5] + [1] * (len(table_columns) - 1),
+               cell_colours=color_list_df,
+               fontsize=fontsize,
+               text_props=text_props)
+
+    # Remove the axis
+    ax.axis('off')
@@ -0,0 +1,203 @@
+# Cards composed from per-panel raster tiles, each cached under the version of its own data
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.transforms import Bbox
+from PIL import Image, PngImagePlugin
+
+from .card import CardTemplate, card_panels, card_template, panel_versions, placeholder_version_prefix
+from .card_cache import card_layout_version
+from .processing import df_processing
+from .style import apply_plot_style
+
+# Compose cards from tiles instead of drawing the whole figure, except for vector profiles
+card_tiles_enabled = os.environ.get('CARD_TILES', '0') == '1'
+
+# One tile per panel, pitcher and resolution on disk, and recently used tiles in memory
+card_tile_dir = os.environ.get('CARD_TILE_DIR', os.path.join('.cache', 'card_tiles'))
+card_tile_memory_bytes = int(os.environ.get('CARD_TILE_MEMORY_BYTES', 256 * 1024 ** 2))
+
+# The footer and spacers, the same on every card, are one more tile
+frame_panel = 'frame'
+
+def tile_key(panel: str, pitcher_id: int, stats: list, dpi: float):
+    # The tile's place on a card: the frame is shared by every pitcher, only the season
+    # table depends on the stats shown
+    key = [card_layout_version, panel, round(float(dpi), 3),
+           None if panel == frame_panel else int(pitcher_id), list(stats) if panel == 'season_table' else None]
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:32]
+
+class TileCache:
+    # A tile is an RGBA image cropped to its panel, the pixel offset it is pasted at and
+    # its exact extent, which the card's crop is computed from. A tile whose panel data
+    # moved on is a miss and is replaced by the next render.
+    def __init__(self, root: str = card_tile_dir, memory_bytes: int = card_tile_memory_bytes):
+        self.root = root
+        self.memory_bytes = memory_bytes
+        # key -> (version, tile), least recently used first
+        self._memory = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.renders = Counter()
+
+    def _path(self, panel: str, key: str):
+        return os.path.join(self.root, panel, f'{key}.png')
+
+    def _remember(self, key: str, version: str, tile: dict):
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= old[1]['image'].nbytes
+            self._memory[key] = (version, tile)
+            self._memory_used += tile['image'].nbytes
+            while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+                _, (_, old_tile) = self._memory.popitem(last=False)
+                self._memory_used -= old_tile['image'].nbytes
+
+    def get(self, panel: str, key: str, version: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] == version:
+                self._memory.move_to_end(key)
+                self.hits[panel] += 1
+                return entry[1]
+
+        # Tiles rendered earlier or by another worker
+        try:
+            with Image.open(self._path(panel, key)) as image:
+                image.load()
+                meta = image.text
+                tile = {'image': np.asarray(image.convert('RGBA')), 'offset': tuple(json.loads(meta['card_offset'])),
+                        'bbox': json.loads(meta['card_bbox'])}
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            return None
+        if meta.get('card_version') != version:
+            return None
+        self._remember(key, version, tile)
+        with self._lock:
+            self.hits[panel] += 1
+        return tile
+
+    def put(self, panel: str, key: str, version: str, tile: dict):
+        path = self._path(panel, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        info = PngImagePlugin.PngInfo()
+        # PIL reads some text keys itself (a 'bbox' key breaks loading), so ours are prefixed
+        info.add_text('card_version', version)
+        info.add_text('card_offset', json.dumps(list(tile['offset'])))
+        info.add_text('card_bbox', json.dumps(tile['bbox']))
+        buf = io.BytesIO()
+        Image.fromarray(tile['image'], 'RGBA').save(buf, format='PNG', pnginfo=info, compress_level=1)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(buf.getvalue())
+        os.replace(tmp_path, path)
+        self._remember(key, version, tile)
+        with self._lock:
+            self.renders[panel] += 1
+
+    def counters(self):
+        with self._lock:
+            return {'hits': dict(self.hits), 'renders': dict(self.renders)}
+
+# The tiles used by the web app
+card_tile_cache = TileCache()
+
+def render_tiles(template: CardTemplate, panels: dict, dpi: float):
+    # Draw the figure once per panel with only that panel's axes visible and a transparent
+    # background, cropping each draw to the panel's extent
+    fig = template.fig
+    canvas = FigureCanvasAgg(fig)
+    old_dpi = fig.dpi
+    visible = {ax: ax.get_visible() for ax in fig.axes}
+    fig.set_dpi(dpi)
+    fig.patch.set_visible(False)
+    try:
+        tiles = {}
+        for panel, axes in panels.items():
+            for ax in fig.axes:
+                ax.set_visible(ax in axes)
+            canvas.draw()
+            renderer = canvas.get_renderer()
+            bbox = Bbox.union([b for b in (ax.get_tightbbox(renderer) for ax in axes) if b is not None])
+
+            # Keep the drawn pixels only; the extent still covers empty axes such as the spacers.
+            # Rows of the buffer run from the top of the figure.
+            buffer = np.asarray(canvas.buffer_rgba())
+            rows = np.flatnonzero(buffer[:, :, 3].any(axis=1))
+            columns = np.flatnonzero(buffer[:, :, 3].any(axis=0))
+            top, bottom = (rows[0], rows[-1] + 1) if len(rows) else (0, 0)
+            left, right = (columns[0], columns[-1] + 1) if len(columns) else (0, 0)
+            tiles[panel] = {'image': buffer[top:bottom, left:right].copy(), 'offset': (int(left), int(top)),
+                            'bbox': [bbox.x0, bbox.y0, bbox.x1, bbox.y1]}
+        return tiles
+    finally:
+        for ax, was_visible in visible.items():
+            ax.set_visible(was_visible)
+        fig.patch.set_visible(True)
+        fig.set_dpi(old_dpi)
+
+def compose_tiles(tiles: list, size: tuple, facecolor: tuple, dpi: float):
+    # Paste the tiles onto the card's background and crop to their extent plus the same
+    # padding savefig's tight bounding box adds
+    width, height = size
+    card = Image.new('RGBA', size, tuple(int(round(c * 255)) for c in facecolor))
+    for tile in tiles:
+        card.alpha_composite(Image.fromarray(tile['image'], 'RGBA'), dest=tile['offset'])
+    bbox = Bbox.union([Bbox.from_extents(*tile['bbox']) for tile in tiles]).padded(mpl.rcParams['savefig.pad_inches'] * dpi)
+
+    # savefig truncates the size; its sub-pixel shift is rounded to whole pixels here
+    left, top = int(round(bbox.x0)), int(round(height - bbox.y1))
+    right, bottom = left + int(bbox.width), top + int(bbox.height)
+
+    # The padding can reach past the figure, which is filled with the background
+    cropped = Image.new('RGBA', (right - left, bottom - top), card.getpixel((0, 0)))
+    cropped.paste(card.crop((max(left, 0), max(top, 0), min(right, width), min(bottom, height))),
+                  (max(-left, 0), max(-top, 0)))
+    return cropped.convert('RGB')
+
+def tiled_dashboard(pitcher_id: int, df, stats: list, dpi: float, template: CardTemplate = None,
+                    cache: TileCache = None):
+    # The card as an image, re-rendering only the panels whose data changed since their
+    # tiles were drawn: after a new game the pitch panels, never the header
+    apply_plot_style()
+    if template is None:
+        template = card_template()
+    if cache is None:
+        cache = card_tile_cache
+    versions = panel_versions(pitcher_id, df, stats, dpi=dpi)
+    order = [frame_panel] + list(card_panels)
+    keys = {panel: tile_key(panel, pitcher_id, stats, dpi) for panel in order}
+    tiles = {panel: cache.get(panel, keys[panel], versions[panel]) for panel in order}
+    missing = [panel for panel in order if tiles[panel] is None]
+
+    if missing:
+        # Draw the missing panels into the template, noting the axes each one draws into
+        template.reset()
+        if any(panel != frame_panel and card_panels[panel]['pitches'] for panel in missing):
+            df = df_processing(df, compact=True)
+        panels = {}
+        for panel in missing:
+            if panel == frame_panel:
+                panels[panel] = list(template.static_axes)
+                continue
+            axes_before = set(template.fig.axes)
+            card_panels[panel]['draw'](template, pitcher_id, df, stats, dpi)
+            panels[panel] = ([getattr(template, name) for name in card_panels[panel]['axes']]
+                             + [ax for ax in template.fig.axes if ax not in axes_before])
+        for panel, tile in render_tiles(template, panels, dpi).items():
+            # A tile with a placeholder image is used once; the next render fetches the image again
+            if not versions[panel].startswith(placeholder_version_prefix):
+                cache.put(panel, keys[panel], versions[panel], tile)
+            tiles[panel] = tile
+
+    size = (int(round(template.fig.get_figwidth() * dpi)), int(round(template.fig.get_figheight() * dpi)))
+    return compose_tiles([tiles[panel] for panel in order], size, template.fig.get_facecolor(), dpi)
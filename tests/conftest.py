@@ -0,0 +1,23 @@
+# Fixtures shared by the tests of the Statcast download's callers
+from datetime import date
+
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def fake_download():
+    # Builds stand-ins for download_statcast that write one pitch per day of the range,
+    # except for the failing days, and record the ranges they were asked for in `calls`
+    def build(failing_days: set, calls: list = None, pitcher: int = 1, game_type: str = 'R'):
+        def download(start_dt, end_dt, out_path, max_workers=4):
+            if calls is not None:
+                calls.append((start_dt, end_dt))
+            days = [day.strftime('%Y-%m-%d') for day in pd.date_range(start_dt, end_dt)]
+            failed = [(date.fromisoformat(day), date.fromisoformat(day)) for day in days if day in failing_days]
+            rows = [{'game_date': day, 'game_pk': i, 'at_bat_number': 1, 'pitch_number': 1, 'game_type': game_type,
+                     'pitcher': pitcher} for i, day in enumerate(days) if day not in failing_days]
+            path = out_path if not failed else out_path + '.partial'
+            pd.DataFrame(rows).to_csv(path, index=False)
+            return {'rows': len(rows), 'chunks': len(days), 'failed': failed, 'path': path}
+        return download
+    return build
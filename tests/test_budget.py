@@ -0,0 +1,6 @@
+# Cold-start budget of the web app, see pitcher_card/budget.py
+from pitcher_card.budget import check_budget
+
+def test_cold_start_within_budget():
+    measured, failures = check_budget()
+    assert not failures, '; '.join(failures)
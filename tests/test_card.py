@@ -0,0 +1,31 @@
+# The full card drawn for two pitchers on one thread, the first card surviving the second
+import io
+
+from pitcher_card.card import card_panels, pitching_dashboard
+from test_grouping import pitches
+
+stats = ['G', 'GS', 'IP', 'TBF', 'WHIP', 'ERA', 'FIP', 'K%', 'BB%', 'GB%']
+
+def draw_offline(template, pitcher_id, df, stats, dpi=None):
+    # Stands in for the panels that fetch the header and FanGraphs data
+    for ax in [template.ax_headshot, template.ax_bio, template.ax_logo, template.ax_season_table, template.ax_plot_2]:
+        ax.text(0.5, 0.5, f'Pitcher {pitcher_id}', ha='center')
+
+def png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', dpi=20)
+    return buf.getvalue()
+
+def test_a_card_is_unchanged_by_the_next_one(monkeypatch):
+    for panel in ['header', 'season_table', 'percentiles']:
+        monkeypatch.setitem(card_panels[panel], 'draw', draw_offline)
+    df = pitches(n=1500, pitchers=[1, 2])
+    df = df[df['pitch_type'].notna()]
+
+    first = pitching_dashboard(1, df[df['pitcher'] == 1], stats)
+    drawn = png(first)
+    second = pitching_dashboard(2, df[df['pitcher'] == 2], stats)
+
+    assert second is not first
+    assert png(first) == drawn
+    assert png(second) != drawn
@@ -0,0 +1,28 @@
+# The card cache's disk tier is trimmed on a schedule, images and index entries alike
+import os
+
+import pitcher_card.card_cache as card_cache
+
+def make_cache(tmp_path, disk_bytes: int):
+    return card_cache.CardCache(root=str(tmp_path / 'index'), image_root=str(tmp_path / 'images'),
+                                memory_items=8, disk_bytes=disk_bytes)
+
+def test_puts_between_trims_do_not_scan_the_disk(monkeypatch, tmp_path):
+    trims = []
+    monkeypatch.setattr(card_cache, 'trim_card_images', lambda max_bytes, root: trims.append(root) or 0)
+    cache = make_cache(tmp_path, disk_bytes=10 ** 6)
+    for i in range(10):
+        cache.put(f'key{i}', 'v', f'image {i}'.encode(), 'image/png')
+    # Only the first put trims, the rest are well inside the interval and the write share
+    assert len(trims) == 1
+
+def test_trim_removes_index_entries_of_evicted_images(tmp_path):
+    cache = make_cache(tmp_path, disk_bytes=10 ** 6)
+    names = [cache.put(f'key{i}', 'v', bytes([i]) * 100, 'image/png') for i in range(3)]
+
+    # Age the first image so it is the least recently used, then shrink the budget
+    os.utime(os.path.join(cache.image_root, names[0]), (1, 1))
+    cache.disk_bytes = 250
+    assert cache.trim() == (1, 1)
+    assert sorted(os.listdir(cache.root)) == ['key1.json', 'key2.json']
+    assert make_cache(tmp_path, disk_bytes=10 ** 6).get('key0', 'v') is None
@@ -0,0 +1,44 @@
+# The FanGraphs leaderboard is fetched once by concurrent requests and refreshed in the background
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import pitcher_card.fangraphs as fangraphs
+
+def fake_leaderboards(calls: list, release: threading.Event):
+    def fetch(season):
+        calls.append(season)
+        release.wait(5)
+        return pd.DataFrame({'xMLBAMID': [1.0, 2.0], 'ERA': [3.0, float(len(calls))]})
+    return fetch
+
+def test_concurrent_first_requests_share_one_fetch(monkeypatch, tmp_path):
+    monkeypatch.setattr(fangraphs, 'fangraphs_cache_dir', str(tmp_path))
+    monkeypatch.setattr(fangraphs, '_fangraphs_snapshots', {})
+    calls, release = [], threading.Event()
+    monkeypatch.setattr(fangraphs, 'fangraphs_pitching_leaderboards', fake_leaderboards(calls, release))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(fangraphs.fangraphs_leaderboard, 2025) for _ in range(8)]
+        time.sleep(0.2)
+        release.set()
+        frames = [future.result() for future in futures]
+    assert calls == [2025]
+    assert all(df is frames[0] for df in frames)
+
+def test_stale_snapshot_is_served_during_the_refresh(monkeypatch, tmp_path):
+    monkeypatch.setattr(fangraphs, 'fangraphs_cache_dir', str(tmp_path))
+    stale = pd.DataFrame({'ERA': [4.0]}, index=pd.Index([1]))
+    monkeypatch.setattr(fangraphs, '_fangraphs_snapshots', {2025: (time.time() - 3600, stale)})
+    calls, release = [], threading.Event()
+    monkeypatch.setattr(fangraphs, 'fangraphs_pitching_leaderboards', fake_leaderboards(calls, release))
+
+    # Every request during the refresh gets the stale snapshot, and only one refresh runs
+    assert all(fangraphs.fangraphs_leaderboard(2025, ttl=60) is stale for _ in range(5))
+    release.set()
+    deadline = time.time() + 5
+    while 2025 in fangraphs._fangraphs_refreshing and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls == [2025]
+    assert fangraphs.fangraphs_leaderboard(2025, ttl=60) is not stale
@@ -0,0 +1,159 @@
+# Per pitch type aggregation against the notebook's original groupby, and the derived
+# pitch terms (approach angle, spin efficiency)
+import numpy as np
+import pandas as pd
+import pytest
+
+from pitcher_card.metrics import _approach_angle, _spin_efficiency, plate_front_y, trajectory_y0
+from pitcher_card.processing import df_grouping, df_processing
+
+swing_code = ['foul_bunt', 'foul', 'hit_into_play', 'swinging_strike', 'foul_tip',
+              'swinging_strike_blocked', 'missed_bunt', 'bunt_foul_tip']
+whiff_code = ['swinging_strike', 'foul_tip', 'swinging_strike_blocked']
+
+# The card's table metrics, in the notebook's original columns
+baseline_metrics = ['pitch', 'pitch_usage', 'release_speed', 'pfx_z', 'pfx_x', 'release_spin_rate', 'release_pos_x',
+                    'release_pos_z', 'release_extension', 'delta_run_exp_per_100', 'in_zone_rate', 'chase_rate',
+                    'whiff_rate', 'xwobacon']
+
+def pitches(n: int = 3000, pitchers: list = (1, 2, 3), seed: int = 11):
+    # A fixed synthetic season with missing pitch types, zones and measurements
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'game_date': pd.to_datetime('2025-04-01') + pd.to_timedelta(rng.integers(0, 150, n), unit='D'),
+        'game_pk': rng.integers(770000, 780000, n), 'at_bat_number': rng.integers(1, 80, n),
+        'pitch_number': rng.integers(1, 8, n), 'game_type': 'R', 'pitcher': rng.choice(pitchers, n),
+        'p_throws': 'R', 'pitch_type': rng.choice(['FF', 'SL', 'CH', 'CU', None], n, p=[0.4, 0.25, 0.2, 0.1, 0.05]),
+        'description': rng.choice(swing_code + ['ball', 'called_strike', 'blocked_ball'], n),
+        'type': rng.choice(['B', 'S', 'X'], n), 'zone': rng.integers(1, 15, n).astype(float),
+        'release_speed': rng.normal(90, 5, n), 'release_spin_rate': rng.normal(2300, 200, n),
+        'release_pos_x': rng.normal(-2, 0.3, n), 'release_pos_z': rng.normal(5.8, 0.2, n),
+        'release_extension': rng.normal(6.4, 0.3, n), 'pfx_x': rng.normal(0, 0.8, n), 'pfx_z': rng.normal(1, 0.5, n),
+        'delta_run_exp': rng.normal(0, 0.1, n), 'estimated_woba_using_speedangle': rng.uniform(0, 1.5, n),
+    })
+    for col, share in [('zone', 0.03), ('release_speed', 0.02), ('release_extension', 0.05),
+                       ('estimated_woba_using_speedangle', 0.1)]:
+        df.loc[rng.random(n) < share, col] = np.nan
+    return df
+
+def baseline_grouping(df_pyb: pd.DataFrame):
+    # The notebook's original processing and groupby, before the metric registry
+    df = df_pyb.copy()
+    df['swing'] = df['description'].isin(swing_code)
+    df['whiff'] = df['description'].isin(whiff_code)
+    df['in_zone'] = df['zone'] < 10
+    df['out_zone'] = df['zone'] > 10
+    df['chase'] = (df.in_zone == False) & (df.swing == 1)
+    df['pfx_z'] = df['pfx_z'] * 12
+    df['pfx_x'] = df['pfx_x'] * 12
+    df_group = df.groupby(['pitch_type']).agg(
+        pitch=('pitch_type', 'count'), release_speed=('release_speed', 'mean'), pfx_z=('pfx_z', 'mean'),
+        pfx_x=('pfx_x', 'mean'), release_spin_rate=('release_spin_rate', 'mean'),
+        release_pos_x=('release_pos_x', 'mean'), release_pos_z=('release_pos_z', 'mean'),
+        release_extension=('release_extension', 'mean'), delta_run_exp=('delta_run_exp', 'sum'),
+        swing=('swing', 'sum'), whiff=('whiff', 'sum'), in_zone=('in_zone', 'sum'), out_zone=('out_zone', 'sum'),
+        chase=('chase', 'sum')).reset_index()
+    df_group['xwobacon'] = df_group['pitch_type'].map(
+        lambda pt: df[(df['pitch_type'] == pt) & (df['type'] == 'X')]['estimated_woba_using_speedangle'].mean())
+    df_group['pitch_usage'] = df_group['pitch'] / df_group['pitch'].sum()
+    df_group['whiff_rate'] = df_group['whiff'] / df_group['swing']
+    df_group['in_zone_rate'] = df_group['in_zone'] / df_group['pitch']
+    df_group['chase_rate'] = df_group['chase'] / df_group['out_zone']
+    df_group['delta_run_exp_per_100'] = -df_group['delta_run_exp'] / df_group['pitch'] * 100
+    df_group = df_group.sort_values(by='pitch_usage', ascending=False)
+    nan = np.nan
+    plot_table_all = pd.DataFrame(data={
+        'pitch_type': 'All', 'pitch': df['pitch_type'].count(), 'pitch_usage': 1, 'release_speed': nan,
+        'pfx_z': nan, 'pfx_x': nan, 'release_spin_rate': nan, 'release_pos_x': nan, 'release_pos_z': nan,
+        'release_extension': df['release_extension'].mean(),
+        'delta_run_exp_per_100': df['delta_run_exp'].sum() / df['pitch_type'].count() * -100,
+        'whiff_rate': df['whiff'].sum() / df['swing'].sum(),
+        'in_zone_rate': df['in_zone'].sum() / df['pitch_type'].count(),
+        'chase_rate': df['chase'].sum() / df['out_zone'].sum(),
+        'xwobacon': df[df['type'] == 'X']['estimated_woba_using_speedangle'].mean()}, index=[0])
+    return pd.concat([df_group, plot_table_all], ignore_index=True)
+
+def assert_matches_baseline(df_plot: pd.DataFrame, df_base: pd.DataFrame, rtol: float):
+    assert df_plot['pitch_type'].tolist() == df_base['pitch_type'].tolist()
+    for metric in baseline_metrics:
+        np.testing.assert_allclose(df_plot[metric].to_numpy(dtype=float), df_base[metric].to_numpy(dtype=float),
+                                   rtol=rtol, atol=0, err_msg=metric)
+
+def test_full_mode_matches_the_baseline():
+    df = pitches()
+    df_plot, color_list = df_grouping(df_processing(df), metrics=baseline_metrics)
+    assert_matches_baseline(df_plot, baseline_grouping(df), rtol=1e-12)
+    assert len(color_list) == 4
+
+def test_compact_mode_matches_the_baseline_to_float32():
+    df = pitches()
+    df_plot, _ = df_grouping(df_processing(df, compact=True), metrics=baseline_metrics)
+    assert_matches_baseline(df_plot, baseline_grouping(df), rtol=1e-5)
+
+def test_by_pitcher_matches_each_pitcher_alone():
+    df = pitches()
+    df_plot, _ = df_grouping(df_processing(df), by_pitcher=True, metrics=baseline_metrics)
+    for pitcher_id, df_pitcher in df.groupby('pitcher'):
+        rows = df_plot[df_plot['pitcher'] == pitcher_id].reset_index(drop=True)
+        assert_matches_baseline(rows, baseline_grouping(df_pitcher), rtol=1e-12)
+
+def test_derived_terms_average_per_pitch_type():
+    df = pitches()
+    for col, value in [('vx0', 5.0), ('vy0', -130.0), ('vz0', -5.0), ('ax', -10.0), ('ay', 28.0), ('az', -20.0)]:
+        df[col] = value + np.random.default_rng(len(col)).normal(0, 1, len(df))
+    df_processed = df_processing(df)
+    df_plot, _ = df_grouping(df_processed, metrics=['vaa', 'spin_efficiency'])
+    df_plot = df_plot.set_index('pitch_type')
+    for term, compute in [('vaa', _approach_angle), ('spin_efficiency', _spin_efficiency)]:
+        expected = pd.Series(compute(df_processed), index=df.index).groupby(df['pitch_type']).mean()
+        np.testing.assert_allclose(df_plot.loc[expected.index, term], expected, rtol=1e-12)
+        # Per pitch type only, the summary row leaves them empty
+        assert np.isnan(df_plot.loc['All', term])
+
+def one_pitch(**columns):
+    return pd.DataFrame({col: [float(value)] for col, value in columns.items()})
+
+def test_approach_angle_at_the_front_of_the_plate():
+    vy0, vz0, ay, az = -130.0, -5.0, 28.0, -20.0
+    # Solve y(t) = plate_front_y independently of the closed form
+    t = min(root.real for root in np.roots([ay / 2, vy0, trajectory_y0 - plate_front_y]) if root.real > 0)
+    expected = -np.degrees(np.arctan((vz0 + az * t) / (vy0 + ay * t)))
+    assert _approach_angle(one_pitch(vy0=vy0, vz0=vz0, ay=ay, az=az))[0] == pytest.approx(expected, rel=1e-9)
+    # A pitch dropping towards the plate comes in at a downward (negative) angle
+    assert expected < 0
+
+def trajectory_with_spin(transverse_spin: float, v0: tuple = (3.0, -130.0, -4.0), extension: float = 6.5,
+                         drag: float = -15.0, direction: tuple = (1.0, 0.0, 1.0)):
+    # Accelerations of a pitch with gravity, drag along its average velocity and the Magnus
+    # acceleration of the given transverse spin, by fixed-point iteration on that velocity
+    g = np.array([0, 0, -32.174])
+    vx0, vy0, vz0 = v0
+    a = g + np.array([0, 25.0, 0])
+    for _ in range(100):
+        y_release = 60.5 - extension
+        t_release = (-vy0 - np.sqrt(vy0 ** 2 - 2 * a[1] * (trajectory_y0 - y_release))) / a[1]
+        v_release = np.array(v0) + a * t_release
+        t_flight = (-v_release[1] - np.sqrt(v_release[1] ** 2 - 2 * a[1] * (y_release - plate_front_y))) / a[1]
+        v_bar = v_release + a * t_flight / 2
+        speed = np.linalg.norm(v_bar)
+        unit = v_bar / speed
+        spin_factor = transverse_spin / (78.92 * speed)
+        lift = spin_factor / (0.4 + 2.32 * spin_factor)
+        magnus_direction = np.array(direction) - np.dot(direction, unit) * unit
+        magnus = lift * 0.005383 * speed ** 2 * magnus_direction / np.linalg.norm(magnus_direction)
+        a = g + drag * unit + magnus
+    return dict(vx0=vx0, vy0=vy0, vz0=vz0, ax=a[0], ay=a[1], az=a[2], release_extension=extension)
+
+def test_spin_efficiency_recovers_the_transverse_spin():
+    df = one_pitch(release_spin_rate=2400, **trajectory_with_spin(1800))
+    assert _spin_efficiency(df)[0] == pytest.approx(0.75, rel=1e-6)
+
+def test_spin_efficiency_is_clipped_and_missing_stays_missing():
+    # Gravity and drag only: no movement from spin
+    df = one_pitch(release_spin_rate=2400, **trajectory_with_spin(0))
+    assert _spin_efficiency(df)[0] == pytest.approx(0, abs=1e-6)
+    # More movement than the measured spin can explain is capped at 1
+    df = one_pitch(release_spin_rate=1000, **trajectory_with_spin(1800))
+    assert _spin_efficiency(df)[0] == 1
+    df = one_pitch(release_spin_rate=np.nan, **trajectory_with_spin(1800))
+    assert np.isnan(_spin_efficiency(df)[0])
@@ -0,0 +1,88 @@
+# Header images: the in-memory asset cache and the stored image size
+import os
+import time
+
+import numpy as np
+from PIL import Image
+
+import pitcher_card.header as header
+
+def fake_download(calls: list, size: tuple = (64, 32)):
+    def download(url, session=None):
+        calls.append(url)
+        return Image.new('RGBA', size, (255, 0, 0, 255))
+    return download
+
+def use_tmp_cache(monkeypatch, tmp_path, calls: list, size: tuple = (64, 32)):
+    monkeypatch.setattr(header, 'asset_cache_dir', str(tmp_path))
+    monkeypatch.setattr(header, '_asset_memory', header.OrderedDict())
+    monkeypatch.setattr(header, '_download_image', fake_download(calls, size))
+
+def test_assets_keep_their_aspect_ratio(monkeypatch, tmp_path):
+    use_tmp_cache(monkeypatch, tmp_path, [], size=(64, 32))
+    assert header.get_image_asset('logo', 'NYY', 'url', 16).shape == (8, 16, 4)
+
+def test_memory_is_bounded(monkeypatch, tmp_path):
+    use_tmp_cache(monkeypatch, tmp_path, [])
+    monkeypatch.setattr(header, 'asset_memory_items', 2)
+    for key in ['a', 'b', 'c']:
+        header.get_image_asset('logo', key, 'url', 16)
+    assert list(header._asset_memory) == [('logo', 'b', 16), ('logo', 'c', 16)]
+
+def test_stale_headshots_are_fetched_again(monkeypatch, tmp_path):
+    calls = []
+    use_tmp_cache(monkeypatch, tmp_path, calls)
+    header.get_image_asset('headshot', '1', 'url', 16, max_age=60)
+    header.get_image_asset('headshot', '1', 'url', 16, max_age=60)
+    assert len(calls) == 1
+
+    # Age both the remembered array and the file on disk past max_age
+    old = time.time() - 120
+    header._asset_memory[('headshot', '1', 16)] = (old, header._asset_memory[('headshot', '1', 16)][1])
+    os.utime(header._asset_path('headshot', '1', 16), (old, old))
+    assert isinstance(header.get_image_asset('headshot', '1', 'url', 16, max_age=60), np.ndarray)
+    assert len(calls) == 2
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+class FakeSession:
+    # The people and team endpoints, with the pitcher's team and age set by the test
+    def __init__(self):
+        self.team_id, self.age = 147, 27
+
+    def get(self, url, timeout=None):
+        if 'people' in url:
+            return FakeResponse({'people': [{'fullName': 'A Pitcher', 'pitchHand': {'code': 'R'}, 'currentAge': self.age,
+                                             'height': "6' 2\"", 'weight': 210,
+                                             'currentTeam': {'id': self.team_id, 'link': f'/api/v1/teams/{self.team_id}'}}]})
+        return FakeResponse({'teams': [{'abbreviation': 'NYY'}]})
+
+def test_header_version_follows_the_header_data(monkeypatch, tmp_path):
+    calls = []
+    use_tmp_cache(monkeypatch, tmp_path, calls)
+    monkeypatch.setattr(header, '_people_cache', {})
+    monkeypatch.setattr(header, '_team_cache', {})
+    monkeypatch.setattr(header, 'people_ttl_seconds', 0)
+    session = FakeSession()
+    first = header.fetch_header_data(1, size=16, session=session)
+    assert not first['placeholder']
+    assert header.header_version(header.fetch_header_data(1, size=16, session=session)) == header.header_version(first)
+
+    session.age = 28
+    assert header.header_version(header.fetch_header_data(1, size=16, session=session)) != header.header_version(first)
+
+    # A headshot that fails to load is a placeholder, with its own version
+    monkeypatch.setattr(header, '_asset_memory', header.OrderedDict())
+    monkeypatch.setattr(header, 'asset_cache_dir', str(tmp_path / 'empty'))
+    def fail(url, session=None):
+        raise OSError('unavailable')
+    monkeypatch.setattr(header, '_download_image', fail)
+    session.age = 27
+    missing = header.fetch_header_data(1, size=16, session=session)
+    assert missing['placeholder']
+    assert header.header_version(missing) != header.header_version(first)
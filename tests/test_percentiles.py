@@ -0,0 +1,63 @@
+# Percentile ranks against a synthetic leaderboard
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import percentileofscore
+
+from pitcher_card.percentiles import PercentileRanker
+
+def leaderboard(n: int = 200, seed: int = 7):
+    # A raw leaderboard with a range index, ties, and missing values
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'xMLBAMID': np.arange(1000, 1000 + n, dtype=float),
+                       'K%': rng.integers(10, 40, n) / 100,
+                       'xERA': rng.normal(4, 1, n).round(2),
+                       'IP': rng.uniform(1, 200, n), 'G': 30, 'GS': rng.integers(0, 31, n)})
+    df.loc[[3, 50], 'K%'] = np.nan
+    return df
+
+def test_ranks_match_scipy():
+    df = leaderboard()
+    ranker = PercentileRanker(df, metrics=['K%', 'xERA'], reverse_metrics=['xERA'])
+    table = ranker.percentile_table()
+    population = df['K%'].dropna()
+    for pitcher_id, value in zip(df['xMLBAMID'].astype(int), df['K%']):
+        expected = np.nan if np.isnan(value) else percentileofscore(population, value, kind='strict')
+        assert table.loc[pitcher_id, 'K%'] == pytest.approx(expected, nan_ok=True)
+
+    # Lower is better for reversed metrics
+    for pitcher_id, value in zip(df['xMLBAMID'].astype(int), df['xERA']):
+        expected = 100 - percentileofscore(df['xERA'], value, kind='strict')
+        assert ranker.percentiles(pitcher_id)['xERA'] == pytest.approx(expected)
+
+def test_missing_values_are_left_out():
+    df = leaderboard()
+    ranker = PercentileRanker(df, metrics=['K%'])
+    assert np.isnan(ranker.percentiles(1003)['K%'])
+    # The lowest pitcher with a value ranks at 0, not above the pitchers without one
+    lowest = int(df.loc[df['K%'].idxmin(), 'xMLBAMID'])
+    assert ranker.percentiles(lowest)['K%'] == 0
+
+def test_populations_filter_the_leaderboard():
+    df = leaderboard()
+    ranker = PercentileRanker(df, metrics=['K%'])
+    starters = df[(df['GS'] >= df['G'] / 2) & (df['IP'] >= 50)]
+    pitcher_id = int(starters['xMLBAMID'].iloc[0])
+    expected = percentileofscore(starters['K%'].dropna(), starters['K%'].iloc[0], kind='strict')
+    assert ranker.percentiles(pitcher_id, min_ip=50, role='SP')['K%'] == pytest.approx(expected)
+
+def test_level_without_levels_is_an_error():
+    ranker = PercentileRanker(leaderboard(), metrics=['K%'])
+    with pytest.raises(ValueError, match='levels'):
+        ranker.percentiles(1000, level='MLB')
+
+def test_plot_finds_the_pitcher_by_mlbam_id():
+    from matplotlib.figure import Figure
+    from pitcher_card.percentiles import percentile_label_map, plot_percentile_rankings_by_pitcher
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({metric: rng.uniform(0.1, 0.9, 20) for metric in percentile_label_map})
+    df['xMLBAMID'] = np.arange(500, 520, dtype=float)
+    ax = Figure().subplots()
+    plot_percentile_rankings_by_pitcher(df, 505, ax=ax, ranker=PercentileRanker(df))
+    labels = {text.get_text() for text in ax.texts}
+    assert f"{df.loc[5, 'xERA']:.2f}" in labels
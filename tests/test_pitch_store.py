@@ -0,0 +1,42 @@
+# Pitch store updates retry the chunks that failed before
+import multiprocessing
+
+import pandas as pd
+
+import pitcher_card.store as store
+
+def test_failed_days_are_retried(monkeypatch, tmp_path, fake_download):
+    root = str(tmp_path / 'store')
+    calls = []
+    monkeypatch.setattr(store, 'download_statcast', fake_download({'2025-06-02'}, calls))
+    result = store.update_pitch_store('2025-06-01', '2025-06-03', root)
+    assert result['failed'] == [('2025-06-02', '2025-06-02')]
+    assert store.load_failed_chunks(root) == [('2025-06-02', '2025-06-02')]
+    assert sorted(store.load_pitch_store(1, root=root)['game_date'].dt.strftime('%Y-%m-%d')) == ['2025-06-01', '2025-06-03']
+
+    # The next update fetches its own range and the failed day
+    monkeypatch.setattr(store, 'download_statcast', fake_download(set(), calls))
+    result = store.update_pitch_store('2025-06-04', '2025-06-04', root)
+    assert calls[1:] == [('2025-06-04', '2025-06-04'), ('2025-06-02', '2025-06-02')]
+    assert result['failed'] == [] and store.load_failed_chunks(root) == []
+    assert len(store.load_pitch_store(1, root=root)) == 4
+
+def write_pitcher(root: str, pitcher_id: int):
+    # Runs in a separate writer process
+    store.write_pitch_store(pd.DataFrame([{'game_date': '2025-06-01', 'game_pk': pitcher_id, 'at_bat_number': 1,
+                                           'pitch_number': 1, 'game_type': 'R', 'pitcher': pitcher_id}]), root)
+
+def test_readers_see_partitions_written_by_other_processes(tmp_path):
+    root = str(tmp_path / 'store')
+    write_pitcher(root, 1)
+    assert len(store.load_pitch_store(1, root=root)) == 1
+
+    # Two writers add pitchers in new buckets of the month this reader already listed
+    context = multiprocessing.get_context('spawn')
+    for pitcher_id in [2, 3]:
+        writer = context.Process(target=write_pitcher, args=(root, pitcher_id))
+        writer.start()
+        writer.join()
+        assert writer.exitcode == 0
+        assert len(store.load_pitch_store(pitcher_id, root=root)) == 1
+    assert sorted(store.load_pitch_store(root=root, columns=['pitcher'])['pitcher']) == [1, 2, 3]
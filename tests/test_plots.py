@@ -0,0 +1,32 @@
+# Velocity panel: the pitcher's mean line spans each row over the league overlay
+import matplotlib.gridspec as gridspec
+import pandas as pd
+from matplotlib.figure import Figure
+
+from pitcher_card.baseline import LeagueBaseline
+from pitcher_card.plots import velocity_kdes
+from test_grouping import pitches
+
+def test_mean_lines_reach_the_top_of_each_row():
+    df = pitches(n=400, pitchers=[1])
+    df = df[df['pitch_type'].notna() & df['release_speed'].notna()]
+    # A narrow league histogram, so the league densities are taller than the pitcher's
+    df_velocity_hist = pd.DataFrame({'pitch_type': ['FF', 'SL', 'CH', 'CU'], 'p_throws': 'R',
+                                     'release_speed': 90.0, 'count': 1000.0})
+    group = pd.DataFrame({'pitch_type': ['FF', 'SL', 'CH', 'CU'], 'release_speed': 90.0})
+    movement = pd.DataFrame({'pitch_type': ['FF'], 'p_throws': ['R'], 'pfx_x': [0.0], 'pfx_z': [0.0]})
+    baseline = LeagueBaseline(group, movement, df_velocity_hist)
+
+    fig = Figure(figsize=(8, 8))
+    gs = gridspec.GridSpec(4, 4, figure=fig)
+    ax = fig.add_subplot(gs[0, 0])
+    velocity_kdes(df, ax=ax, gs=gs, gs_x=[1, 4], gs_y=[0, 4], fig=fig, baseline=baseline)
+
+    rows = [row for row in fig.axes if row is not ax]
+    assert len(rows) == 4
+    for row in rows:
+        top = row.transAxes.transform((0, 1))[1]
+        mean_lines = [line for line in row.get_lines() if line.get_linestyle() == '--']
+        assert len(mean_lines) == 1
+        line_top = mean_lines[0].get_transform().transform(mean_lines[0].get_xydata())[:, 1].max()
+        assert line_top >= top - 1e-6
@@ -0,0 +1,46 @@
+# Pre-render runs keep days that failed to download for the next run and only the latest lock
+import os
+from datetime import date
+
+import pitcher_card.prerender as prerender
+from pitcher_card.statcast import add_statcast_pitches, cached_statcast_pitcher
+
+def use_tmp_dirs(monkeypatch, tmp_path):
+    monkeypatch.setattr(prerender, 'pitch_store_dir', str(tmp_path / 'store'))
+    monkeypatch.setattr(prerender, 'prerender_dir', str(tmp_path / 'prerender'))
+    monkeypatch.setattr(prerender, 'add_statcast_pitches',
+                        lambda *args: add_statcast_pitches(*args, cache_dir=str(tmp_path / 'statcast')))
+    monkeypatch.setattr(prerender, 'refresh_pitcher_roster', lambda stale_ids: None)
+
+def test_downloaded_pitches_fill_the_pitcher_cache(monkeypatch, tmp_path, fake_download):
+    use_tmp_dirs(monkeypatch, tmp_path)
+    monkeypatch.setattr(prerender, 'download_statcast', fake_download({'2025-06-03'}, pitcher=7))
+    pitchers, failed = prerender.pitchers_with_new_pitches('2025-06-01', '2025-06-04')
+    assert pitchers == [7]
+    assert failed == [('2025-06-03', '2025-06-03')]
+
+    # The days before the failed one are covered and read without a Savant query
+    def no_savant(*args):
+        raise AssertionError('Savant was queried')
+    monkeypatch.setattr('pitcher_card.statcast.pyb.statcast_pitcher', no_savant)
+    df = cached_statcast_pitcher('2025-06-01', '2025-06-02', 7, cache_dir=str(tmp_path / 'statcast'))
+    assert sorted(df['game_date'].dt.strftime('%Y-%m-%d')) == ['2025-06-01', '2025-06-02']
+
+def test_state_stops_before_the_first_failed_day(monkeypatch, tmp_path, fake_download):
+    use_tmp_dirs(monkeypatch, tmp_path)
+    # Spring games only, so there are no cards to render
+    monkeypatch.setattr(prerender, 'download_statcast', fake_download({'2025-06-03'}, pitcher=7, game_type='S'))
+    prerender.claim_prerender_day(date(2025, 6, 1))
+    with open(prerender._state_path(), 'w') as f:
+        f.write('{"end": "2025-05-31"}')
+    report = prerender.run_prerender(date(2025, 6, 4), stats=[])
+    assert report['failed_days'] == [('2025-06-03', '2025-06-03')]
+    assert prerender.load_prerender_state()['end'] == '2025-06-02'
+
+def test_claims_keep_only_the_latest_lock(monkeypatch, tmp_path):
+    use_tmp_dirs(monkeypatch, tmp_path)
+    assert prerender.claim_prerender_day(date(2025, 6, 1))
+    assert not prerender.claim_prerender_day(date(2025, 6, 1))
+    assert prerender.claim_prerender_day(date(2025, 6, 2))
+    assert prerender.claim_prerender_day(date(2025, 6, 3))
+    assert [name for name in os.listdir(prerender.prerender_dir) if name.endswith('.lock')] == ['2025-06-03.lock']
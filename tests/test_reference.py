@@ -0,0 +1,35 @@
+# Shared reference tables: the publish lock and the periodic FanGraphs republish
+import os
+import time
+
+import pitcher_card.reference as reference
+
+def test_held_publish_lock_is_not_broken_as_stale(tmp_path):
+    root = str(tmp_path)
+    assert reference.acquire_publish_lock(root)
+    stop = reference.keep_publish_lock(root, interval=0.05)
+    try:
+        # Age the lock past the cutoff; the holder touches it again before anyone looks
+        old = time.time() - 10
+        os.utime(os.path.join(root, 'publish.lock'), (old, old))
+        time.sleep(0.2)
+        assert not reference.acquire_publish_lock(root, stale_seconds=5)
+    finally:
+        stop.set()
+        reference.release_publish_lock(root)
+    assert reference.acquire_publish_lock(root)
+
+def test_only_a_stale_leaderboard_is_republished(monkeypatch, tmp_path):
+    published = {'metadata': {'fangraphs_fetched_at': time.time()}}
+    refreshed = []
+    monkeypatch.setattr(reference, 'attach_reference_tables', lambda: published)
+    monkeypatch.setattr(reference, 'acquire_publish_lock', lambda: True)
+    monkeypatch.setattr(reference, 'release_publish_lock', lambda: None)
+    monkeypatch.setattr(reference, 'keep_publish_lock', lambda: reference.threading.Event())
+    monkeypatch.setattr(reference, 'refresh_fangraphs_leaderboard', refreshed.append)
+    monkeypatch.setattr(reference, 'publish_current_reference_tables', lambda: 2)
+
+    assert reference.refresh_shared_tables(ttl=60) is None
+    published['metadata']['fangraphs_fetched_at'] -= 120
+    assert reference.refresh_shared_tables(ttl=60) == 2
+    assert refreshed == [2025]
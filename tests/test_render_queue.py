@@ -0,0 +1,110 @@
+# Card renders in the background process pool: shared jobs, the depth limit, cancelling
+# and the card cache counters of the workers
+import os
+import time
+
+import pytest
+
+import pitcher_card.card_cache as card_cache
+from pitcher_card.render_queue import RenderQueue
+
+def cached_render(pitcher_id, stats, profile):
+    # Runs in a worker: the card from the worker's card cache, drawn on a miss
+    from pitcher_card.card_cache import card_cache
+    name = card_cache.get(f'card{pitcher_id}', 'v')
+    if name is None:
+        name = card_cache.put(f'card{pitcher_id}', 'v', f'card {pitcher_id}'.encode(), 'image/png')
+    return name
+
+def held_render(pitcher_id, stats, profile):
+    # Runs in a worker: waits until the file named by the first stat exists
+    while not os.path.exists(stats[0]):
+        time.sleep(0.01)
+    return f'card{pitcher_id}'
+
+def wait(queue: RenderQueue, job_id: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while queue.status(job_id)[0] == 'pending' and time.time() < deadline:
+        time.sleep(0.05)
+    return queue.status(job_id)
+
+@pytest.fixture
+def release(tmp_path):
+    # Path that lets held renders finish once it exists
+    path = str(tmp_path / 'release')
+    yield path
+    open(path, 'w').close()
+
+def test_identical_submits_share_one_job(release):
+    queue = RenderQueue(workers=1, render=held_render)
+    try:
+        job_ids = {queue.submit(1, [release]) for _ in range(10)}
+        assert len(job_ids) == 1
+        assert queue.counters()['in_flight'] == 1
+        job_id = job_ids.pop()
+        assert queue._jobs[job_id].clients == 10
+        open(release, 'w').close()
+        assert wait(queue, job_id) == ('done', 'card1')
+    finally:
+        queue._pool().shutdown()
+
+def test_submits_beyond_the_depth_are_refused(release):
+    queue = RenderQueue(workers=1, max_depth=2, render=held_render)
+    try:
+        assert queue.submit(1, [release]) is not None
+        assert queue.submit(2, [release]) is not None
+        assert queue.submit(3, [release]) is None
+        # Joining a card already in flight needs no room
+        assert queue.submit(1, [release]) is not None
+    finally:
+        open(release, 'w').close()
+        queue._pool().shutdown()
+
+def test_switching_pitchers_cancels_the_queued_job(release):
+    queue = RenderQueue(workers=1, render=held_render)
+    try:
+        # One job runs and one waits in the pool's call queue, the third is still queued
+        running = queue.submit(1, [release])
+        queue.submit(2, [release])
+        queued = queue.submit(3, [release])
+        time.sleep(0.5)
+
+        # Another client still waits for the card, so the first cancel keeps the job
+        shared = queue.submit(3, [release])
+        assert shared == queued
+        assert not queue.cancel(queued)
+        assert queue.status(queued) == ('pending', None)
+        assert queue.cancel(queued)
+        assert queue.status(queued) == ('cancelled', None)
+
+        # A running job finishes, and the pitcher can be selected again
+        assert not queue.cancel(running)
+        assert queue.submit(3, [release]) != queued
+        open(release, 'w').close()
+        assert wait(queue, running) == ('done', 'card1')
+    finally:
+        queue._pool().shutdown()
+
+def test_worker_lookups_reach_the_server_counters(monkeypatch, tmp_path):
+    # The spawned workers read the cache directories from the environment
+    monkeypatch.setenv('CARD_CACHE_DIR', str(tmp_path / 'index'))
+    monkeypatch.setenv('CARD_IMAGE_DIR', str(tmp_path / 'images'))
+    monkeypatch.setattr(card_cache, 'card_cache', card_cache.CardCache(root=str(tmp_path / 'index'),
+                                                                       image_root=str(tmp_path / 'images')))
+    monkeypatch.setattr('pitcher_card.render_queue.card_cache', card_cache.card_cache)
+    queue = RenderQueue(workers=1, render=cached_render)
+    try:
+        state, name = wait(queue, queue.submit(1, []))
+        assert state == 'done'
+        assert wait(queue, queue.submit(1, [])) == ('done', name)
+    finally:
+        queue._pool().shutdown()
+
+    counters = card_cache.card_cache.counters()
+    assert (counters['memory_hits'], counters['disk_hits'], counters['misses']) == (1, 0, 1)
+    assert counters['hit_rate'] == 0.5
+
+    # The server keeps the served card in memory instead of reading it per request
+    assert card_cache.card_cache.image(name) == (b'card 1', 'image/png')
+    os.remove(os.path.join(str(tmp_path / 'images'), name))
+    assert card_cache.card_cache.image(name) == (b'card 1', 'image/png')
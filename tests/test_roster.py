@@ -0,0 +1,59 @@
+# Roster builds only query the players that are new or stale since the stored enrichment
+import pandas as pd
+
+import pitcher_card.roster as roster
+
+def register(ids: list):
+    return pd.DataFrame({'key_mlbam': ids, 'name_first': 'First', 'name_last': [f'Last {i}' for i in ids],
+                         'mlb_played_last': 2025, 'full_name': [f'First Last {i}' for i in ids]})
+
+def fake_statsapi(monkeypatch, teams: dict, queried: list, failing: set = frozenset()):
+    # People on the given teams, all pitchers; the ids in `failing` fail their batch
+    def fetch_people(session, batch_ids, retries, backoff):
+        queried.extend(batch_ids)
+        if failing & set(batch_ids):
+            raise ConnectionError('statsapi unavailable')
+        return [{'key_mlbam': i, 'team': teams[i], 'team_id': 1, 'position': 'Pitcher'} for i in batch_ids]
+    monkeypatch.setattr(roster, '_fetch_people_batch', fetch_people)
+    monkeypatch.setattr(roster, '_fetch_team_level', lambda *args: 'Major League Baseball')
+
+def test_builds_query_new_and_stale_players_only(monkeypatch, tmp_path):
+    monkeypatch.setattr(roster, 'chadwick_cache_dir', str(tmp_path))
+    snapshot = {'ids': [1, 2, 3]}
+    monkeypatch.setattr(roster, 'chadwick_snapshot', lambda season, refresh=False: register(snapshot['ids']))
+    teams = {1: 'Mets', 2: 'Cubs', 3: 'Reds', 4: 'Rays'}
+
+    queried = []
+    fake_statsapi(monkeypatch, teams, queried)
+    df = roster.build_pitcher_roster()
+    assert sorted(queried) == [1, 2, 3]
+    assert set(df['team_level']) == {'MLB'}
+
+    # Nothing changed, so nothing is queried
+    queried.clear()
+    roster.build_pitcher_roster()
+    assert queried == []
+
+    # A new player and one who pitched and was traded
+    snapshot['ids'] = [1, 2, 3, 4]
+    teams[2] = 'Mets'
+    teams[3] = 'Cubs'
+    df = roster.build_pitcher_roster(refresh=True, stale_ids=[2])
+    assert sorted(queried) == [2, 4]
+    assert df.set_index('key_mlbam')['team'].to_dict() == {1: 'Mets', 2: 'Mets', 3: 'Reds', 4: 'Rays'}
+
+def test_failed_lookups_are_queried_again(monkeypatch, tmp_path):
+    monkeypatch.setattr(roster, 'chadwick_cache_dir', str(tmp_path))
+    monkeypatch.setattr(roster, 'chadwick_snapshot', lambda season, refresh=False: register([1, 2]))
+    teams = {1: 'Mets', 2: 'Cubs'}
+
+    queried = []
+    fake_statsapi(monkeypatch, teams, queried, failing={2})
+    assert roster.build_pitcher_roster().empty
+    assert sorted(queried) == [1, 2]
+
+    queried.clear()
+    fake_statsapi(monkeypatch, teams, queried)
+    df = roster.build_pitcher_roster()
+    assert sorted(queried) == [1, 2]
+    assert sorted(df['key_mlbam']) == [1, 2]
@@ -0,0 +1,10 @@
+# The incremental per-pitcher Statcast cache
+import pitcher_card.statcast as statcast
+
+def test_future_range_without_a_cache_is_empty(monkeypatch, tmp_path):
+    def no_savant(*args):
+        raise AssertionError('Savant was queried')
+    monkeypatch.setattr(statcast.pyb, 'statcast_pitcher', no_savant)
+    df = statcast.cached_statcast_pitcher('2099-04-01', '2099-04-30', 1, cache_dir=str(tmp_path))
+    assert df.empty
+    assert list(df.columns) == list(statcast.empty_statcast_frame().columns)
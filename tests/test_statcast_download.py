@@ -0,0 +1,76 @@
+# Chunked Statcast download against a local stand-in for the Savant CSV endpoint
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+import requests
+
+from pitcher_card.statcast import download_statcast
+
+class StandInSavant(BaseHTTPRequestHandler):
+    # Two pitches per day, an error for the days in failing_days and nothing on empty_days
+    failing_days = set()
+    empty_days = set()
+
+    def do_GET(self):
+        day = parse_qs(urlparse(self.path).query)['game_date_gt'][0]
+        if day in self.failing_days:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = '' if day in self.empty_days else (
+            'game_date,pitcher,game_pk,at_bat_number,pitch_number\n'
+            f'{day},1,{day[-2:]},1,1\n{day},2,{day[-2:]},1,2\n')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def savant():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInSavant)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/statcast_search/csv'
+    server.shutdown()
+    StandInSavant.failing_days = set()
+    StandInSavant.empty_days = set()
+
+def test_download_writes_every_day(savant, tmp_path):
+    StandInSavant.empty_days = {'2025-06-03'}
+    out_path = str(tmp_path / 'pitches.csv')
+    result = download_statcast('2025-06-01', '2025-06-04', out_path, base_url=savant, retries=0)
+
+    assert result == {'rows': 6, 'chunks': 4, 'failed': [], 'path': out_path}
+    df = pd.read_csv(out_path)
+    assert sorted(df['game_date'].unique()) == ['2025-06-01', '2025-06-02', '2025-06-04']
+
+def test_failed_chunks_keep_the_output_path_free(savant, tmp_path):
+    StandInSavant.failing_days = {'2025-06-02'}
+    out_path = str(tmp_path / 'pitches.csv')
+    result = download_statcast('2025-06-01', '2025-06-03', out_path, base_url=savant, retries=0)
+
+    assert not os.path.exists(out_path)
+    assert result['path'] == out_path + '.partial'
+    assert [(start.isoformat(), end.isoformat()) for start, end in result['failed']] == [('2025-06-02', '2025-06-02')]
+    assert result['rows'] == 4
+    assert sorted(pd.read_csv(result['path'])['game_date'].unique()) == ['2025-06-01', '2025-06-03']
+
+def test_chunks_share_the_given_session(savant, tmp_path):
+    class CountingSession(requests.Session):
+        calls = 0
+
+        def get(self, *args, **kwargs):
+            CountingSession.calls += 1
+            return super().get(*args, **kwargs)
+
+    result = download_statcast('2025-06-01', '2025-06-03', str(tmp_path / 'pitches.csv'), base_url=savant,
+                               retries=0, session=CountingSession())
+
+    assert result['rows'] == 6
+    assert CountingSession.calls == 3
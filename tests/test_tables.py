@@ -0,0 +1,50 @@
+# Pitch table cell colours against the notebook's original per-cell colouring
+import os
+
+import matplotlib.colors as mcolors
+import numpy as np
+import pandas as pd
+
+from pitcher_card.baseline import LeagueBaseline
+from pitcher_card.processing import df_grouping, df_processing
+from pitcher_card.tables import cmap_sum, cmap_sum_r, color_stats, get_cell_colouts, table_columns
+from test_grouping import pitches
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def baseline_cell_colours(df_group: pd.DataFrame, df_statcast_group: pd.DataFrame):
+    # The notebook's original colouring, one Normalize and one colormap call per cell
+    def get_color(value, normalize, cmap):
+        return mcolors.to_hex(cmap(normalize(value)))
+
+    color_list_df = []
+    for pt in df_group.pitch_type.unique():
+        inner = []
+        select_df = df_statcast_group[df_statcast_group['pitch_type'] == pt]
+        df_group_select = df_group[df_group['pitch_type'] == pt]
+        for tb in table_columns:
+            if tb in color_stats and type(df_group_select[tb].values[0]) == np.float64:
+                league = pd.to_numeric(select_df[tb], errors='coerce').mean()
+                value = pd.to_numeric(df_group_select[tb], errors='coerce').mean()
+                if pd.isna(df_group_select[tb].values[0]):
+                    inner.append('#ffffff')
+                elif tb == 'release_speed':
+                    inner.append(get_color(value, mcolors.Normalize(league * 0.95, league * 1.05), cmap_sum))
+                elif tb == 'delta_run_exp_per_100':
+                    inner.append(get_color(value, mcolors.Normalize(-1.5, 1.5), cmap_sum))
+                elif tb == 'xwobacon':
+                    inner.append(get_color(value, mcolors.Normalize(league * 0.7, league * 1.3), cmap_sum_r))
+                else:
+                    inner.append(get_color(value, mcolors.Normalize(league * 0.7, league * 1.3), cmap_sum))
+            else:
+                inner.append('#ffffff')
+        color_list_df.append(inner)
+    return color_list_df
+
+def test_cell_colours_match_the_baseline():
+    df_statcast_group = pd.read_csv(os.path.join(repo_root, 'statcast_2025_grouped.csv'))
+    df_pitch_movement = pd.read_csv(os.path.join(repo_root, 'statcast_2025_pitch_movement.csv'))
+    baseline = LeagueBaseline(df_statcast_group, df_pitch_movement)
+    df_group, _ = df_grouping(df_processing(pitches(pitchers=[1])))
+    assert (get_cell_colouts(df_group, baseline, color_stats, cmap_sum, cmap_sum_r)
+            == baseline_cell_colours(df_group, df_statcast_group))